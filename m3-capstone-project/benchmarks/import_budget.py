@@ -0,0 +1,97 @@
+"""Import-time budget: cold-import cost of entry modules, and what they pull in.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+without OpenAI / Qdrant credentials. Examples:
+
+    PYTHONPATH=src python benchmarks/import_budget.py              # exit 1 if over budget
+    PYTHONPATH=src python benchmarks/import_budget.py --top 15 --out imports.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# cold-import budget per module (ms). Generous: they catch a heavy SDK creeping
+# back onto an import path, not small drifts.
+BUDGETS_MS: Dict[str, float] = {
+    "agent_humancapital.orchestration.router": 600,
+    "agent_humancapital.tools.governance_tools": 400,
+    "agent_humancapital.tools.ranking_tools": 400,
+    "agent_humancapital.tools.skill_tools": 400,
+    "agent_humancapital.tools.interview_tools": 100,
+    "agent_humancapital.agents.supervisor": 1200,
+}
+# SDKs that only the backends that use them may import
+HEAVY = ("langchain_core", "langchain_openai", "langchain_qdrant", "langsmith", "qdrant_client", "openai", "tiktoken")
+CREDENTIALS = ("OPENAI_API_KEY", "QDRANT_URL", "QDRANT_API_KEY")
+
+
+def measure(module: str, top: int = 10) -> Dict[str, Any]:
+    """Cumulative import time of `module`, its most expensive dependencies and any heavy SDKs loaded."""
+    env = {k: v for k, v in os.environ.items() if k not in CREDENTIALS}
+    code = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    # "import time: self [us] | cumulative | imported package"; nesting is shown by
+    # indentation and a package is printed after its dependencies
+    rows = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cum, name = line[len("import time:"):].split("|")
+            rows.append((name[1:], int(cum) / 1000))
+    end = next(i for i, (name, _) in enumerate(rows) if name == module)
+    start = end
+    while start > 0 and rows[start - 1][0].startswith(" "):
+        start -= 1
+    deps = sorted(((name.strip(), ms) for name, ms in rows[start:end]), key=lambda x: -x[1])
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "module": module,
+        "total_ms": round(rows[end][1], 2),
+        "top": [(n, round(ms, 2)) for n, ms in deps[:top]],
+        "heavy": sorted({m.split(".")[0] for m in loaded} & set(HEAVY)),
+    }
+
+
+def check(report: Dict[str, Any], budget_ms: float) -> List[str]:
+    problems = []
+    if report["total_ms"] > budget_ms:
+        problems.append(f"{report['module']}: {report['total_ms']} ms > budget {budget_ms} ms")
+    if report["heavy"]:
+        problems.append(f"{report['module']}: imports {', '.join(report['heavy'])}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check cold-import time per module")
+    parser.add_argument("modules", nargs="*", help="modules to measure (default: the budgeted ones)")
+    parser.add_argument("--top", type=int, default=8, help="dependencies to list per module")
+    parser.add_argument("--out", help="write the report JSON here")
+    args = parser.parse_args(argv)
+
+    reports, problems = [], []
+    for module in args.modules or BUDGETS_MS:
+        report = measure(module, args.top)
+        reports.append(report)
+        if module in BUDGETS_MS:
+            problems.extend(check(report, BUDGETS_MS[module]))
+        print(f"{module}: {report['total_ms']} ms" + (f" (heavy: {', '.join(report['heavy'])})" if report["heavy"] else ""))
+        for name, ms in report["top"]:
+            print(f"    {ms:>9.2f} ms  {name}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"reports": reports, "problems": problems}, f, indent=2)
+    for p in problems:
+        print(f"OVER BUDGET: {p}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Offline benchmark suite: synthetic corpus, hash embeddings, local vector store.
+
+No OpenAI or Qdrant credentials are needed. Examples:
+
+    PYTHONPATH=src python benchmarks/run.py --docs 10000 --out bench.json
+    PYTHONPATH=src python benchmarks/run.py --docs 10000 --baseline bench.json   # exit 1 on regression
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+if not __package__:
+    # run as a script (python benchmarks/run.py): import siblings through the package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import synthetic
+
+BENCHMARKS = ["ingest", "semantic_search", "ranking_candidates", "extract_skills", "governance", "supervisor_run"]
+
+
+def configure(workdir: str, dim: int) -> None:
+    # SETTINGS is resolved on first use, so this must run before anything reads it
+    os.environ.update({
+        "EMBEDDING_PROVIDER": "hash",
+        "EMBEDDING_DIM": str(dim),
+        "EMBEDDING_CACHE_PATH": "",
+        "VECTOR_BACKEND": "local",
+        "LOCAL_INDEX_DIR": os.path.join(workdir, "local_index"),
+        "INDEX_DIR": os.path.join(workdir, "index"),
+        "RESPONSE_CACHE_SIZE": "0",  # measure the real work, not cache hits
+        "ROUTER_SEMANTIC": os.environ.get("ROUTER_SEMANTIC", "true"),
+    })
+
+
+def measure(fn: Callable[[Any], Any], items: List[Any], warmup: int = 1) -> Dict[str, float]:
+    if not items:
+        return {"ops": 0, "seconds": 0.0, "ops_per_s": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    for item in items[:warmup]:
+        fn(item)
+    latencies = np.empty(len(items))
+    started = time.perf_counter()
+    for i, item in enumerate(items):
+        t = time.perf_counter()
+        fn(item)
+        latencies[i] = time.perf_counter() - t
+    total = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "ops": len(items),
+        "seconds": round(total, 4),
+        "ops_per_s": round(len(items) / total, 2) if total else 0.0,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+def run(args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    configure(workdir, args.dim)
+
+    from agent_humancapital.agents.supervisor import supervisor_run
+    from agent_humancapital.ingestion.pipeline import IngestManifest, IngestionPipeline, IngestRecord
+    from agent_humancapital.ingestion.redaction import redact_record
+    from agent_humancapital.ingestion.sinks import BM25Sink, DocStoreSink, PIISpanSink, SkillIndexSink
+    from agent_humancapital.orchestration.schemas import SupervisorInput, UserContext
+    from agent_humancapital.resources import get_registry
+    from agent_humancapital.tools.governance_tools import get_scanner, governance_scan, pii_redactor
+    from agent_humancapital.tools.ranking_tools import ranking_candidates
+    from agent_humancapital.tools.retrieval_tools import semantic_search
+    from agent_humancapital.tools.skill_tools import extract_skills
+
+    only = set(args.only or BENCHMARKS)
+    results: Dict[str, Dict[str, float]] = {}
+    queries = (synthetic.QUERIES * (args.queries // len(synthetic.QUERIES) + 1))[:args.queries]
+    registry = get_registry()
+    store = registry.vectorstore
+
+    # ingestion always runs: every other benchmark needs the corpus
+    scanner = get_scanner()
+    index_dir = registry.settings.INDEX_DIR
+    pipeline = IngestionPipeline(
+        store,
+        IngestManifest(os.path.join(workdir, "manifest.sqlite")),
+        batch_size=args.batch_size,
+        workers=args.workers,
+        sinks=[BM25Sink(index_dir), SkillIndexSink(index_dir), DocStoreSink(index_dir), PIISpanSink(index_dir)],
+        redactor=lambda rec: redact_record(rec, scanner),
+    )
+    records = (
+        IngestRecord(row["row_index"], row["text"], row["category"], "synthetic")
+        for row in synthetic.generate(args.docs, args.seed)
+    )
+    started = time.perf_counter()
+    stats = pipeline.run(records)
+    if len(store) >= registry.settings.LOCAL_ANN_MIN_DOCS:
+        store.build_ivf()
+    seconds = time.perf_counter() - started
+    if "ingest" in only:
+        results["ingest"] = {"ops": stats.upserted, "seconds": round(seconds, 4), "ops_per_s": round(stats.upserted / seconds, 2)}
+
+    if "semantic_search" in only:
+        results["semantic_search"] = measure(lambda q: semantic_search(q, k=args.k), queries)
+
+    if "ranking_candidates" in only:
+        pools = {q: semantic_search(q, k=50)["results"] for q in set(queries)}
+        results["ranking_candidates"] = measure(lambda q: ranking_candidates(pools[q], q), queries)
+
+    texts = [row["text"] for row in synthetic.generate(min(args.docs, 2000), args.seed + 1)]
+    if "extract_skills" in only:
+        results["extract_skills"] = measure(extract_skills, texts)
+
+    if "governance" in only:
+        answers = [" ".join(texts[i:i + 5]) for i in range(0, len(texts), 5)]
+        results["governance_scan"] = measure(governance_scan, answers)
+        results["pii_redactor"] = measure(pii_redactor, answers)
+
+    if "supervisor_run" in only:
+        payloads = [SupervisorInput(query=q, user=UserContext(role="hr"), top_k=args.k) for q in queries]
+        results["supervisor_run"] = measure(supervisor_run, payloads)
+
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Regressions vs. a stored baseline: slower p95 or lower throughput beyond tolerance."""
+    problems = []
+    for name, base in baseline.get("results", {}).items():
+        cur = results.get(name)
+        if cur is None:
+            continue
+        if base.get("ops_per_s") and cur["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+            problems.append(f"{name}: throughput {cur['ops_per_s']} ops/s < baseline {base['ops_per_s']} ops/s")
+        if "p95_ms" in base and "p95_ms" in cur:
+            # tiny absolute differences are timer noise, not regressions
+            if cur["p95_ms"] > base["p95_ms"] * (1 + tolerance) and cur["p95_ms"] - base["p95_ms"] > min_delta_ms:
+                problems.append(f"{name}: p95 {cur['p95_ms']} ms > baseline {base['p95_ms']} ms")
+    return problems
+
+
+def metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "docs": args.docs,
+        "queries": args.queries,
+        "k": args.k,
+        "dim": args.dim,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks")
+    parser.add_argument("--docs", type=int, default=1000, help="synthetic corpus size (1k - 1M)")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=256, help="hash embedding dimension")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--only", nargs="*", choices=BENCHMARKS)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore smaller absolute p95 changes")
+    parser.add_argument("--workdir", help="keep indexes here instead of a temp dir")
+    args = parser.parse_args(argv)
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        results = run(args, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="hc-bench-") as workdir:
+            results = run(args, workdir)
+
+    report: Dict[str, Any] = {"meta": metadata(args), "results": results}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
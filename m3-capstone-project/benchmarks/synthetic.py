@@ -0,0 +1,64 @@
+"""Deterministic synthetic resume corpus for benchmarks (no real data, no network)."""
+from __future__ import annotations
+import json
+import random
+from typing import Dict, Iterator, List
+
+CATEGORIES = [
+    "INFORMATION-TECHNOLOGY", "DATA-SCIENCE", "HR", "FINANCE", "ENGINEERING",
+    "HEALTHCARE", "SALES", "DESIGNER", "TEACHER", "ACCOUNTANT",
+]
+
+SKILLS: Dict[str, List[str]] = {
+    "INFORMATION-TECHNOLOGY": ["python", "java", "kubernetes", "docker", "aws", "linux", "terraform", "sql"],
+    "DATA-SCIENCE": ["python", "machine learning", "sql", "tableau", "pandas", "spark", "statistics", "tensorflow"],
+    "HR": ["recruitment", "onboarding", "payroll", "employee relations", "excel", "talent acquisition"],
+    "FINANCE": ["excel", "financial analysis", "sap", "budgeting", "accounting", "power bi"],
+    "ENGINEERING": ["autocad", "matlab", "project management", "six sigma", "solidworks"],
+    "HEALTHCARE": ["patient care", "emr", "cpr", "nursing", "scheduling"],
+    "SALES": ["salesforce", "crm", "negotiation", "lead generation", "excel"],
+    "DESIGNER": ["photoshop", "illustrator", "figma", "ui design", "adobe xd"],
+    "TEACHER": ["curriculum development", "classroom management", "microsoft office"],
+    "ACCOUNTANT": ["accounting", "quickbooks", "excel", "tax preparation", "auditing"],
+}
+
+TITLES = ["Senior", "Junior", "Lead", "Principal", "Associate", "Staff"]
+FILLER = (
+    "Responsible for delivering projects on time, collaborating with cross functional teams, "
+    "mentoring colleagues and improving processes across the organization."
+).split()
+
+
+def resume(i: int, rng: random.Random) -> Dict[str, object]:
+    category = CATEGORIES[i % len(CATEGORIES)]
+    skills = rng.sample(SKILLS[category], k=min(4, len(SKILLS[category])))
+    title = f"{rng.choice(TITLES)} {category.replace('-', ' ').title()} professional"
+    body = " ".join(rng.choice(FILLER) for _ in range(rng.randint(40, 120)))
+    # contact details exercise PII redaction at ingest and in governance
+    contact = f"Contact: candidate{i}@example.com, +62 812-{i % 10000:04d}-{(i * 7) % 10000:04d}."
+    text = f"{title}. Skills: {', '.join(skills)}. {body} {contact}"
+    return {"row_index": i, "text": text, "category": category}
+
+
+def generate(n: int, seed: int = 7) -> Iterator[Dict[str, object]]:
+    rng = random.Random(seed)
+    for i in range(n):
+        yield resume(i, rng)
+
+
+def write_jsonl(path: str, n: int, seed: int = 7) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for row in generate(n, seed):
+            f.write(json.dumps({"Resume_str": row["text"], "Category": row["category"]}) + "\n")
+
+
+QUERIES = [
+    "find data analyst candidates with sql and tableau",
+    "rank candidates for python aws docker",
+    "skill gaps for kubernetes engineers skills: kubernetes, terraform, aws",
+    "interview questions for a backend engineer",
+    "find payroll specialist with onboarding experience",
+    "who knows salesforce and crm",
+    "compare candidates for financial analysis and power bi",
+    "search nursing resumes with patient care",
+]
@@ -1,82 +1,94 @@
 from __future__ import annotations
+import argparse
+import functools
 import os
 import logging
-import pandas as pd
-from uuid import uuid4
-from dotenv import load_dotenv
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from agent_humancapital.config import SETTINGS
+from agent_humancapital.resources import get_registry
+from agent_humancapital.local_index import LocalVectorStore
+from agent_humancapital.ingestion.pipeline import (
+    IngestManifest,
+    IngestionPipeline,
+    bump_index_version,
+    default_manifest_path,
+    delete_legacy_points,
+    ensure_payload_indexes,
+    ensure_qdrant_collection,
+)
+from agent_humancapital.ingestion.sources import iter_records
+from agent_humancapital.ingestion.redaction import redact_record
+from agent_humancapital.ingestion.sinks import BM25Sink, DocStoreSink, PIISpanSink, SkillIndexSink
+from agent_humancapital.tools.governance_tools import get_scanner
 
-from langchain_core.documents import Document
-from langchain_qdrant import QdrantVectorStore
-from langchain_openai import OpenAIEmbeddings
-
-load_dotenv()
 logging.basicConfig(level=logging.INFO)
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
-
-QDRANT_URL = os.getenv("QDRANT_URL")
-QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-COLLECTION = os.getenv("QDRANT_COLLECTION_NAME", "resumes_collection")
-
-if not OPENAI_API_KEY:
-    raise ValueError("Missing OPENAI_API_KEY")
-if not QDRANT_URL or not QDRANT_API_KEY:
-    raise ValueError("Missing QDRANT_URL / QDRANT_API_KEY")
+# Adjust these if your columns differ
+TEXT_COL = "Resume_str"
+CAT_COL = "Category"
 
 def main():
-    excel_path = "dataset/dataset.xlsx"
-    df = pd.read_excel(excel_path)
+    parser = argparse.ArgumentParser(description="Ingest resumes into the configured vector store")
+    parser.add_argument("--source", default="dataset/dataset.xlsx", help="xlsx, csv, jsonl or parquet")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("INGEST_BATCH_SIZE", "64")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("INGEST_WORKERS", "4")))
+    parser.add_argument("--full", action="store_true",
+                        help="re-embed every row, ignoring the checkpoint (a Qdrant collection is recreated)")
+    parser.add_argument("--no-redact", action="store_true", help="store raw text (PII included) in the vector store")
+    parser.add_argument("--slim-payload", action="store_true",
+                        help="keep only a preview in vector payloads; full texts are read from the doc store")
+    args = parser.parse_args()
 
-    # Adjust these if your columns differ
-    text_col = "Resume_str"
-    cat_col = "Category"
-
-    docs = []
-    for idx, row in df.iterrows():
-        content = str(row.get(text_col, "") or "")
-        if not content.strip():
-            continue
-        docs.append(
-            Document(
-                page_content=content,
-                metadata={
-                    "row_index": int(idx),
-                    "category": str(row.get(cat_col, "Unknown")),
-                    "source": os.path.basename(excel_path),
-                },
-            )
+    registry = get_registry()
+    if SETTINGS.VECTOR_BACKEND == "qdrant":
+        # Common dimension for text-embedding-3-small is 1536; set EMBEDDING_DIM if needed
+        ensure_qdrant_collection(
+            registry.client, SETTINGS.QDRANT_COLLECTION_NAME, SETTINGS.EMBEDDING_DIM, recreate=args.full
         )
+        # category / years filters are evaluated server-side; index them
+        ensure_payload_indexes(registry.client, SETTINGS.QDRANT_COLLECTION_NAME)
 
-    logging.info(f"Loaded {len(docs)} documents from Excel")
-
-    client = QdrantClient(
-    url=os.getenv("QDRANT_URL"),
-    api_key=os.getenv("QDRANT_API_KEY"),
-    prefer_grpc=True,
-    timeout=120,
-    )  
+    manifest = IngestManifest(
+        default_manifest_path(f"{SETTINGS.VECTOR_BACKEND}-{SETTINGS.QDRANT_COLLECTION_NAME}")
+    )
+    # PII is redacted once here; the removed values go to a separate span index
+    sinks = [
+        BM25Sink(SETTINGS.INDEX_DIR, rebuild=args.full),
+        SkillIndexSink(SETTINGS.INDEX_DIR, rebuild=args.full),
+        DocStoreSink(SETTINGS.INDEX_DIR, rebuild=args.full),
+    ]
+    redactor = None
+    if not args.no_redact:
+        redactor = functools.partial(redact_record, scanner=get_scanner())
+        sinks.append(PIISpanSink(SETTINGS.INDEX_DIR))
 
-    embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=OPENAI_API_KEY)
+    pipeline = IngestionPipeline(
+        registry.vectorstore,
+        manifest,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        incremental=not args.full,
+        sinks=sinks,
+        redactor=redactor,
+        payload_text=not args.slim_payload,
+    )
+    # Excel is converted once to a cached Parquet file, then streamed in column batches
+    stats = pipeline.run(iter_records(args.source, text_col=TEXT_COL, cat_col=CAT_COL))
+    manifest.close()
+    if SETTINGS.VECTOR_BACKEND == "qdrant" and not stats.failed_batches:
+        # one-off migration: points from before content-hash ids were re-added
+        # above under their new ids; drop the old copies
+        stats.deleted += delete_legacy_points(registry.client, SETTINGS.QDRANT_COLLECTION_NAME)
+    if stats.upserted or stats.deleted:
+        # invalidates cached supervisor responses built on the old collection
+        bump_index_version(SETTINGS.INDEX_DIR)
 
-    # Create collection if needed
-    existing = [c.name for c in client.get_collections().collections]
-    if COLLECTION not in existing:
-        # Common dimension for text-embedding-3-small is often 1536; adjust if needed
-        dim = 1536
-        logging.info(f"Creating collection={COLLECTION} dim={dim}")
-        client.create_collection(
-            collection_name=COLLECTION,
-            vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
-        )
+    store = registry.vectorstore
+    if isinstance(store, LocalVectorStore) and stats.upserted and len(store) >= SETTINGS.LOCAL_ANN_MIN_DOCS:
+        logging.info(f"Rebuilding IVF index over {len(store)} vectors")
+        store.build_ivf()
 
-    vs = QdrantVectorStore(client=client, collection_name=COLLECTION, embedding=embeddings)
-    ids = [str(uuid4()) for _ in range(len(docs))]
-    vs.add_documents(documents=docs, ids=ids)
-    logging.info("Ingestion complete")
+    logging.info(f"Ingestion complete: {stats}; embedding cache {getattr(registry.embeddings, 'stats', dict)()}")
 
 if __name__ == "__main__":
     main()
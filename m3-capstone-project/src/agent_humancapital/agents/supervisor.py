@@ -1,9 +1,18 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from agent_humancapital.candidates import Candidate, CandidateStream, candidate_ids
 from agent_humancapital.orchestration.router import route
-from agent_humancapital.orchestration.schemas import SupervisorInput, WorkerResult
+from agent_humancapital.orchestration.schemas import RoutedPlan, SupervisorInput, WorkerResult
+from agent_humancapital.orchestration.executor import DagExecutor, NodeOutcome, WorkerNode
 from agent_humancapital.config import SETTINGS
-from agent_humancapital.tools.governance_tools import rbac_enforcer, pii_redactor, bias_checker, risk_detector
+from agent_humancapital.ingestion.pipeline import read_index_version
+from agent_humancapital.response_cache import get_response_cache
+from agent_humancapital.metrics import SamplingProfiler, should_profile, span
+from agent_humancapital.tokens import count_tokens
+from agent_humancapital.tools.governance_tools import rbac_enforcer, governance_scan
+from agent_humancapital.tools.retrieval_tools import query_filters, semantic_search_batch
 from agent_humancapital.agents.workers import (
     run_retrieval_worker,
     run_ranking_worker,
@@ -12,72 +21,324 @@ from agent_humancapital.agents.workers import (
 )
 
 def supervisor_run(payload: SupervisorInput) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    if should_profile():
+        # sampled requests record where their time went (all threads)
+        with SamplingProfiler() as prof:
+            for event in supervisor_stream(payload, chunks=False):
+                out = event["result"]
+        out["tool_traces"].append({"tool": "profiler", "output": prof.top()})
+        return out
+    for event in supervisor_stream(payload, chunks=False):
+        out = event["result"]
+    return out
+
+def supervisor_stream(payload: SupervisorInput, chunks: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield governed partial results as workers finish, then the full result.
+
+    Events are {"type": "chunk", "worker": name, "content": markdown} for each
+    finished step (PII-redacted before it is yielded), and last
+    {"type": "result", "result": ...} with the same shape as supervisor_run.
+    """
+    with span("hc_supervisor_seconds", step="total"):
+        yield from _stream(payload, chunks)
+
+def _stream(payload: SupervisorInput, chunks: bool) -> Iterator[Dict[str, Any]]:
+    cache = get_response_cache()
+    if cache is None:
+        for event in _plan_events(payload, _route(payload.query), stream=chunks):
+            if event["type"] == "result":
+                _add_usage(payload, event["result"])
+            yield event
+        return
+
+    # keyed by query, role, top_k and index version; ingestion bumps the version
+    key = cache.key(payload.query, payload.user.role, payload.top_k, read_index_version(SETTINGS.INDEX_DIR))
+    out, status = cache.get(key)
+    if out is None:
+        for event in _plan_events(payload, _route(payload.query), stream=chunks):
+            if event["type"] == "result":
+                out = event["result"]
+                break
+            yield event
+        if _cacheable(out):
+            cache.put(key, out)
+    elif chunks:
+        yield _chunk("cache", out["answer"])
+    out["tool_traces"].append({"tool": "response_cache", "output": status})
+    _add_usage(payload, out)
+    yield {"type": "result", "result": out}
+
+def _route(query: str) -> RoutedPlan:
+    with span("hc_supervisor_seconds", step="route"):
+        return route(query)
+
+def _add_usage(payload: SupervisorInput, out: Dict[str, Any]) -> None:
+    # token estimate for cost reporting; history is counted by the caller when it can
+    model = SETTINGS.LLM_MODEL
+    history = payload.history_tokens if payload.history_tokens is not None else count_tokens(payload.history, model)
+    input_tokens = history + count_tokens(payload.query, model)
+    output_tokens = count_tokens(out.get("answer", ""), model)
+    out["usage"] = {
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+    out["tool_traces"].append({"tool": "token_usage", "output": out["usage"]})
+
+def _cacheable(out: Dict[str, Any]) -> bool:
+    # don't pin a degraded answer (failed or timed-out worker) for the whole TTL
+    return all(t.get("status", "ok") == "ok" for t in out.get("tool_traces", []) if "worker" in t)
+
+def supervisor_run_batch(payloads: List[SupervisorInput]) -> List[Dict[str, Any]]:
+    """Run many queries at once.
+
+    Identical (normalized) queries are routed and searched once, all semantic
+    searches share one batched embedding call and one batched vector search,
+    and the remaining worker graphs run in parallel. Each payload still gets
+    its own RBAC check and governed result.
+    """
+    norms = [_normalize_query(p.query) for p in payloads]
+    plans: Dict[str, RoutedPlan] = {}
+    texts: Dict[str, str] = {}
+    for norm, p in zip(norms, payloads):
+        if norm not in plans:
+            plans[norm] = route(p.query)
+            texts[norm] = p.query
+
+    # Only search for queries that at least one caller is allowed to run, one
+    # batched search per distinct top_k; queries with filters search on their
+    # own (filters are pushed down per query) and a large top_k streams instead
+    to_search: Dict[int, List[str]] = {}
+    for norm, p in zip(norms, payloads):
+        plan = plans[norm]
+        allowed, _ = rbac_enforcer(p.user.role or "guest", _action_from_workers(plan.workers))
+        group = to_search.setdefault(p.top_k, [])
+        if (
+            "retrieval" in plan.workers and allowed and norm not in group
+            and p.top_k <= SETTINGS.RETRIEVAL_PAGE_SIZE and not query_filters(texts[norm])
+        ):
+            group.append(norm)
+    semantic: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    for k, group in to_search.items():
+        if group:
+            searched = semantic_search_batch([texts[n] for n in group], k=k)
+            semantic.update({(n, k): res for n, res in zip(group, searched)})
+
+    jobs: Dict[Tuple[str, str, int], SupervisorInput] = {}
+    for norm, p in zip(norms, payloads):
+        jobs.setdefault((norm, p.user.role or "guest", p.top_k), p)
+    with ThreadPoolExecutor(max_workers=SETTINGS.WORKER_MAX_CONCURRENCY, thread_name_prefix="batch") as pool:
+        futures = {
+            key: pool.submit(_run_plan, p, plans[key[0]], semantic.get((key[0], key[2])))
+            for key, p in jobs.items()
+        }
+        done = {key: fut.result() for key, fut in futures.items()}
+
+    results = []
+    for norm, p in zip(norms, payloads):
+        # callers get independent copies even when the work was shared
+        out = copy.deepcopy(done[(norm, p.user.role or "guest", p.top_k)])
+        out["tool_traces"].append({"tool": "supervisor_run_batch", "batch_size": len(payloads), "distinct_runs": len(jobs)})
+        # same shape as supervisor_run; usage is per payload (history differs)
+        _add_usage(p, out)
+        results.append(out)
+    return results
+
+def _run_plan(payload: SupervisorInput, plan: RoutedPlan, semantic: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for event in _plan_events(payload, plan, semantic):
+        out = event["result"]
+    return out
+
+def _plan_events(
+    payload: SupervisorInput,
+    plan: RoutedPlan,
+    semantic: Optional[Dict[str, Any]] = None,
+    stream: bool = False,
+) -> Iterator[Dict[str, Any]]:
     query = payload.query
     role = payload.user.role or "guest"
 
-    plan = route(query)
-    tool_traces: List[Dict[str, Any]] = []
+    tool_traces: List[Dict[str, Any]] = [{"tool": "router", "output": {"intents": plan.intents or [plan.intent], "notes": plan.notes}}]
     worker_results: List[WorkerResult] = []
 
     # If no workers, answer directly (MVP)
     if not plan.workers:
         answer = f"I can help with resume search, ranking, skill analysis, interview prep, and governance checks. Your query: {query}"
-        safe = _govern_and_finalize(answer, role, tool_traces)
-        return safe
+        yield {"type": "result", "result": _govern_and_finalize(answer, role, tool_traces)}
+        return
 
     # RBAC gating based on intent/workers
     required_action = _action_from_workers(plan.workers)
     ok, msg = rbac_enforcer(role, required_action)
     tool_traces.append({"tool": "rbac_enforcer", "input": {"role": role, "action": required_action}, "output": {"ok": ok, "msg": msg}})
     if not ok:
-        return _govern_and_finalize(msg, role, tool_traces)
-
-    # 1) Retrieval is foundational for most flows
-    candidates: List[Dict[str, Any]] = []
-    if "retrieval" in plan.workers:
-        retr = run_retrieval_worker(query=query, k=SETTINGS.TOP_K_DEFAULT)
-        tool_traces.append({"worker": "retrieval", "output": retr.get("debug", {})})
-        candidates = retr["candidates"]
-        worker_results.append(WorkerResult(worker="retrieval", content=_format_candidates(candidates), raw=retr))
-
-    # 2) Ranking
-    if "ranking" in plan.workers:
-        jd_text = _extract_jd_text(query)
-        ranked = run_ranking_worker(candidates=candidates, jd_text=jd_text)
-        tool_traces.append({"worker": "ranking", "output": {"explanations": ranked.get("explanations", [])}})
-        worker_results.append(WorkerResult(worker="ranking", content=_format_ranked(ranked["ranked"]), raw=ranked))
-        candidates = ranked["ranked"]  # update downstream ordering
-
-    # 3) Skill analysis
-    if "skill" in plan.workers:
-        jd_skills = _extract_jd_skills(query)
-        skills = run_skill_worker(candidates=candidates, jd_skills=jd_skills)
-        tool_traces.append({"worker": "skill", "output": {"trend": skills.get("trend", {})}})
-        worker_results.append(WorkerResult(worker="skill", content=_format_skills(skills), raw=skills))
-
-    # 4) Interview prep
-    if "interview" in plan.workers:
-        jd_text = _extract_jd_text(query)
-        target = candidates[0] if candidates else {"id": None, "preview": ""}
-        interview = run_interview_worker(jd_text=jd_text, candidate=target)
-        tool_traces.append({"worker": "interview", "output": {"rubric": interview["questions"].get("rubric", [])}})
-        worker_results.append(WorkerResult(worker="interview", content=_format_interview(interview), raw=interview))
+        yield {"type": "result", "result": _govern_and_finalize(msg, role, tool_traces)}
+        return
+
+    intents = ", ".join(plan.intents or [plan.intent])
+    if stream:
+        yield _chunk("intent", f"**Intent:** {intents}")
+
+    # Workers run as a dependency graph: independent steps run concurrently;
+    # outcomes arrive in completion order (retrieval first).
+    nodes = _worker_nodes(plan.workers, query, k=payload.top_k, semantic=semantic)
+    executor = DagExecutor(
+        max_workers=SETTINGS.WORKER_MAX_CONCURRENCY,
+        default_timeout=SETTINGS.WORKER_TIMEOUT_S,
+    )
+    outcomes: Dict[str, NodeOutcome] = {}
+    for name, outcome in executor.iter_run(nodes):
+        outcomes[name] = outcome
+        if stream:
+            partial = _worker_result(name, outcome, _ranked_ids(outcomes), trace={})
+            yield _chunk(name, f"\n### {name.upper()} RESULT\n{partial.content}")
+    worker_results.extend(_collect_results(outcomes, tool_traces))
 
     # Merge results
-    answer = _merge(worker_results, plan.intent)
-    return _govern_and_finalize(answer, role, tool_traces)
+    answer = _merge(worker_results, intents)
+    yield {"type": "result", "result": _govern_and_finalize(answer, role, tool_traces)}
+
+def _chunk(worker: str, content: str) -> Dict[str, Any]:
+    # partial output is shown before the final governance pass, so redact it now
+    return {"type": "chunk", "worker": worker, "content": governance_scan(content).text}
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+WORKER_ORDER = ["retrieval", "ranking", "skill", "interview"]
+MAX_LISTED = 20  # candidates spelled out in the retrieval section of the answer
+
+def _worker_nodes(workers: List[str], query: str, k: int, semantic: Optional[Dict[str, Any]] = None) -> List[WorkerNode]:
+    """Declare worker dependencies: ranking and skill only need retrieval,
+    interview needs the top candidate (after ranking when it runs).
+
+    When retrieval streams (large k), ranking and skill read the same
+    candidate stream page by page, concurrently; with neither in the plan
+    retrieval pages through all k candidates itself.
+    """
+    jd_text = _extract_jd_text(query)
+    jd_skills = _extract_jd_skills(query)
+    timeout = SETTINGS.WORKER_TIMEOUT_S
+    upstream = ["retrieval"] if "retrieval" in workers else []
+    consumers = sum(w in workers for w in ("ranking", "skill"))
+    nodes: List[WorkerNode] = []
+
+    if "retrieval" in workers:
+        def retrieval(deps: Dict[str, Any], cancel: Any) -> Dict[str, Any]:
+            # without a consumer a stream would only ever show its first page
+            out = run_retrieval_worker(query=query, k=k, semantic=semantic, stream=consumers > 0)
+            if "stream" in out:
+                out["stream"].consumers = consumers
+            return out
+        nodes.append(WorkerNode("retrieval", retrieval, timeout=timeout))
+    if "ranking" in workers:
+        nodes.append(WorkerNode(
+            "ranking",
+            lambda deps, cancel: run_ranking_worker(candidates=_candidates(deps, stream=True), jd_text=jd_text),
+            deps=upstream, timeout=timeout,
+        ))
+    if "skill" in workers:
+        nodes.append(WorkerNode(
+            "skill",
+            lambda deps, cancel: run_skill_worker(candidates=_candidates(deps, stream=True), jd_skills=jd_skills, query=query),
+            deps=upstream, timeout=timeout,
+        ))
+    if "interview" in workers:
+        def interview(deps: Dict[str, Any], cancel: Any) -> Dict[str, Any]:
+            cands = _candidates(deps)
+            target = cands[0] if cands else {"id": None, "preview": ""}
+            return run_interview_worker(jd_text=jd_text, candidate=target)
+        nodes.append(WorkerNode(
+            "interview", interview,
+            deps=["ranking"] if "ranking" in workers else upstream, timeout=timeout,
+        ))
+    return nodes
+
+def _candidates(deps: Dict[str, Any], stream: bool = False) -> Union[List[Candidate], CandidateStream]:
+    if "ranking" in deps:
+        return deps["ranking"]["ranked"]
+    if "retrieval" in deps:
+        if stream and "stream" in deps["retrieval"]:
+            return deps["retrieval"]["stream"]
+        return deps["retrieval"]["candidates"]
+    return []
+
+def _collect_results(outcomes: Dict[str, NodeOutcome], tool_traces: List[Dict[str, Any]]) -> List[WorkerResult]:
+    results: List[WorkerResult] = []
+    ranked_ids = _ranked_ids(outcomes)
+    for name in WORKER_ORDER:
+        outcome = outcomes.get(name)
+        if outcome is None:
+            continue
+        trace = outcome.trace()
+        tool_traces.append(trace)
+        results.append(_worker_result(name, outcome, ranked_ids, trace))
+    return results
+
+def _ranked_ids(outcomes: Dict[str, NodeOutcome]) -> Optional[List[Any]]:
+    if "ranking" in outcomes and outcomes["ranking"].status == "ok":
+        return candidate_ids(outcomes["ranking"].result["ranked"])
+    return None
+
+def _worker_result(name: str, outcome: NodeOutcome, ranked_ids: Optional[List[Any]], trace: Dict[str, Any]) -> WorkerResult:
+    if outcome.status != "ok":
+        return WorkerResult(worker=name, content=f"{name} worker did not complete ({outcome.status}).", raw=outcome.trace())
+
+    out = outcome.result
+    if name == "retrieval":
+        _trace_output(trace, out.get("debug", {}))
+        # debug already went to the trace (per TRACE_VERBOSITY); don't keep a second copy
+        content = _format_candidates(out["candidates"])
+        if "stream" in out:
+            content += f"\n(first page shown; up to {out['debug']['k']} candidates streamed to ranking and skills)"
+        return WorkerResult(worker=name, content=content, raw={"candidates": out["candidates"]})
+    if name == "ranking":
+        summary: Dict[str, Any] = {"ranked_ids": candidate_ids(out["ranked"])}
+        if "considered" in out:
+            summary["considered"] = out["considered"]
+        _trace_output(
+            trace, summary,
+            full=lambda: {"explanations": out.get("explanations", []), "ranked": [c.to_dict() for c in out["ranked"]]},
+        )
+        return WorkerResult(worker=name, content=_format_ranked(out["ranked"]), raw=out)
+    if name == "skill":
+        if ranked_ids is not None:
+            # skills ran in parallel with ranking; present them in ranked order
+            out = {**out, "candidates": _reorder(out["candidates"], ranked_ids), "gaps": _reorder(out.get("gaps", []), ranked_ids)}
+        _trace_output(
+            trace, {"trend": out.get("trend", {})},
+            full=lambda: {"trend": out.get("trend", {}), "candidates": [c.to_dict() for c in out["candidates"]], "gaps": out.get("gaps", [])},
+        )
+        return WorkerResult(worker=name, content=_format_skills(out), raw=out)
+    _trace_output(trace, {"rubric": out["questions"].get("rubric", [])})
+    return WorkerResult(worker=name, content=_format_interview(out), raw=out)
+
+def _trace_output(trace: Dict[str, Any], summary: Dict[str, Any], full: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+    # TRACE_VERBOSITY: off = status/timing only, summary = ids, full = whole records
+    level = SETTINGS.TRACE_VERBOSITY
+    if level == "off":
+        return
+    trace["output"] = full() if level == "full" and full is not None else summary
+
+def _reorder(items: List[Dict[str, Any]], ids: List[Any]) -> List[Dict[str, Any]]:
+    pos = {cid: i for i, cid in enumerate(ids)}
+    return sorted(items, key=lambda x: pos.get(x.get("id"), len(pos)))
 
 def _govern_and_finalize(text: str, role: str, tool_traces: List[Dict[str, Any]]) -> Dict[str, Any]:
-    redacted = pii_redactor(text)
-    bias = bias_checker(redacted)
-    risk = risk_detector(redacted)
+    # one scan: PII redaction plus bias/risk findings
+    with span("hc_supervisor_seconds", step="governance") as gov_t:
+        scan = governance_scan(text)
+    bias, risk = scan.bias, scan.risk
 
-    tool_traces.append({"tool": "pii_redactor", "output": "applied"})
+    tool_traces.append({"tool": "pii_redactor", "output": "applied", "duration_ms": gov_t.ms})
     tool_traces.append({"tool": "bias_checker", "output": bias})
     tool_traces.append({"tool": "risk_detector", "output": risk})
 
     return {
-        "answer": redacted,
+        "answer": scan.text,
         "governance": {"bias": bias, "risk": risk, "role": role},
         "tool_traces": tool_traces,
     }
@@ -106,11 +367,13 @@ def _format_candidates(cands: List[Dict[str, Any]]) -> str:
     if not cands:
         return "No candidates found."
     lines = []
-    for i, c in enumerate(cands, 1):
+    for i, c in enumerate(cands[:MAX_LISTED], 1):
         lines.append(
             f"{i}. ID={c.get('id')} | category={c.get('category')} | score={c.get('score'):.3f}\n"
             f"   preview: {c.get('preview','')[:250]}..."
         )
+    if len(cands) > MAX_LISTED:
+        lines.append(f"... and {len(cands) - MAX_LISTED} more")
     return "\n".join(lines)
 
 def _format_ranked(ranked: List[Dict[str, Any]]) -> str:
@@ -128,6 +391,8 @@ def _format_skills(sk: Dict[str, Any]) -> str:
     cands = sk.get("candidates", [])
     trend = sk.get("trend", {}).get("top_skills", [])
     gaps = sk.get("gaps", [])
+    corpus_trend = sk.get("corpus_trend", {})
+    corpus_gap = sk.get("corpus_gap", {})
 
     out = []
     if cands:
@@ -141,6 +406,17 @@ def _format_skills(sk: Dict[str, Any]) -> str:
         out.append("\nSkill gaps vs JD skills (top 5 candidates):")
         for g in gaps[:5]:
             out.append(f"- ID={g.get('id')}: missing={g.get('missing', [])}, matched={g.get('matched', [])}")
+    if corpus_trend.get("top_skills"):
+        scope = corpus_trend.get("category") or "all categories"
+        out.append(f"\nCorpus skill trends ({scope}, {corpus_trend.get('candidates', 0)} resumes):")
+        out.extend([f"- {s}: {n}" for s, n in corpus_trend["top_skills"][:10]])
+    if corpus_gap.get("top_candidates"):
+        out.append(
+            f"\nCorpus coverage of JD skills: {corpus_gap.get('full_match', 0)} of "
+            f"{corpus_gap.get('candidates_considered', 0)} resumes have all of {corpus_gap.get('required', [])}"
+        )
+        for c in corpus_gap["top_candidates"][:5]:
+            out.append(f"- ID={c.get('id')} ({c.get('category')}): coverage={c.get('coverage'):.2f}, missing={c.get('missing', [])}")
     return "\n".join(out) if out else "No skill analysis output."
 
 def _format_interview(inter: Dict[str, Any]) -> str:
@@ -1,48 +1,177 @@
 from __future__ import annotations
-from typing import Any, Dict, List
-from agent_humancapital.tools.retrieval_tools import semantic_search, keyword_search, metadata_filter
-from agent_humancapital.tools.ranking_tools import ranking_candidates, explain_score
-from agent_humancapital.tools.skill_tools import extract_skills, skill_gap_analysis, skill_trend_aggregator
+import itertools
+import os
+from typing import Any, Dict, List, Union
+from agent_humancapital.candidates import Candidate, CandidateStream, as_record, candidate_ids
+from agent_humancapital.config import SETTINGS
+from agent_humancapital.lexical_index import load_bm25_index
+from agent_humancapital.metrics import span, timed
+from agent_humancapital.docstore import split_sections
+from agent_humancapital.filters import SearchFilter, canonical_category
+from agent_humancapital.tools.retrieval_tools import (
+    candidate_texts,
+    iter_semantic_search,
+    keyword_search,
+    known_categories,
+    query_filters,
+    reciprocal_rank_fusion,
+    semantic_search,
+)
+from agent_humancapital.tools.ranking_tools import ranking_candidates, ranking_candidates_stream, explain_score
+from agent_humancapital.tools.skill_tools import (
+    corpus_skill_gap,
+    corpus_skill_trends,
+    extract_skills_batch,
+    get_skill_index,
+    skill_gap_analysis,
+    skill_trend_aggregator,
+)
 from agent_humancapital.tools.interview_tools import generate_questions, competency_mapper
 
-def run_retrieval_worker(query: str, k: int, category: str | None = None) -> Dict[str, Any]:
-    base = semantic_search(query, k=k)
-    results = base["results"]
-
+@timed("hc_worker_seconds", worker="retrieval")
+def run_retrieval_worker(
+    query: str,
+    k: int,
+    category: str | None = None,
+    semantic: Dict[str, Any] | None = None,
+    filters: SearchFilter | None = None,
+    stream: bool = True,
+) -> Dict[str, Any]:
+    # `semantic` lets batch callers pass a precomputed semantic_search result
+    # (searched with the same filters). Filters default to the ones stated in
+    # the query ("category: HR", "5+ years") and are pushed down into both
+    # searches, so a narrow filter still yields k candidates. `stream=False`
+    # means nothing downstream reads a candidate stream: a large k is then
+    # paged through here and all k candidates are returned.
+    if filters is None:
+        filters = query_filters(query)
     if category:
-        results = metadata_filter(results, category=category)["results"]
+        # matching ignores case; resolve to the stored spelling when it is known
+        filters = filters.with_(category=canonical_category(category, known_categories()) or category)
+    paged = semantic is None and k > SETTINGS.RETRIEVAL_PAGE_SIZE
+    if paged and stream:
+        return _stream_retrieval(query, k, filters)
+    with span("hc_step_seconds", step="semantic") as sem_t:
+        if semantic is not None:
+            base = semantic
+        elif paged:
+            pages = iter_semantic_search(query, k, filters=filters)
+            base = {"query": query, "k": k, "filters": filters.to_dict(), "results": list(itertools.chain.from_iterable(pages))}
+        else:
+            base = semantic_search(query, k=k, filters=filters)
+    # lexical pass over the full corpus (BM25), fused with the semantic ranking
+    with span("hc_step_seconds", step="keyword") as kw_t:
+        kw = keyword_search(query, base["results"], k=k, filters=filters)
+    if kw["mode"] == "bm25":
+        results = reciprocal_rank_fusion([base["results"], kw["results"]])["results"]
+    else:
+        # fallback: without a BM25 index keep semantic order, preferring preview matches
+        results = kw["results"] or base["results"]
 
-    # optional additional pass: keyword filter for tight constraints
-    kw = keyword_search(query, results, k=k)
-    # fallback: if keyword filter returns nothing, keep semantic
-    final = kw["results"] if kw["results"] else results[:k]
+    final = results[:k]
+    debug: Dict[str, Any] = {"filters": filters.to_dict(), "timings_ms": {"semantic": sem_t.ms, "keyword": kw_t.ms}}
+    if SETTINGS.TRACE_VERBOSITY == "full":
+        debug["semantic"] = {**base, "results": [as_record(c).to_dict() for c in base["results"]]}
+        debug["keyword"] = {**kw, "results": [as_record(c).to_dict() for c in kw["results"]]}
+    elif SETTINGS.TRACE_VERBOSITY == "summary":
+        # reference candidates by id instead of copying them into the trace
+        debug["semantic_ids"] = candidate_ids(base["results"])
+        debug["keyword_ids"] = candidate_ids(kw["results"])
+        debug["keyword_mode"] = kw["mode"]
+    return {"candidates": final, "debug": debug}
 
-    return {"candidates": final, "debug": {"semantic": base, "keyword": kw, "category": category}}
+def _stream_retrieval(query: str, k: int, filters: SearchFilter) -> Dict[str, Any]:
+    # Large k: semantic pages straight from the vector store (no BM25 fusion
+    # over thousands of hits). The first page is fetched now so results show
+    # early; ranking and skills consume the rest from the shared stream.
+    pages = iter_semantic_search(query, k, filters=filters)
+    with span("hc_step_seconds", step="semantic") as sem_t:
+        first = next(pages, [])
+    stream = CandidateStream(itertools.chain([first], pages) if first else [])
+    debug: Dict[str, Any] = {
+        "filters": filters.to_dict(),
+        "mode": "stream",
+        "k": k,
+        "page_size": SETTINGS.RETRIEVAL_PAGE_SIZE,
+        "timings_ms": {"semantic_first_page": sem_t.ms},
+    }
+    return {"candidates": first, "stream": stream, "debug": debug}
 
-def run_ranking_worker(candidates: List[Dict[str, Any]], jd_text: str) -> Dict[str, Any]:
-    ranked = ranking_candidates(candidates, jd_text)["ranked"]
+@timed("hc_worker_seconds", worker="ranking")
+def run_ranking_worker(candidates: Union[List[Candidate], CandidateStream], jd_text: str, top_n: int | None = None) -> Dict[str, Any]:
+    # weight JD terms by corpus idf when the BM25 index is available
+    index = load_bm25_index(os.path.join(SETTINGS.INDEX_DIR, "bm25"))
+    options: Dict[str, Any] = {"term_weights": index.idf if index is not None else None, "metric": SETTINGS.VECTOR_DISTANCE}
+    out: Dict[str, Any] = {}
+    if isinstance(candidates, CandidateStream):
+        # page by page into a bounded heap of the best top_n
+        streamed = ranking_candidates_stream(
+            candidates.subscribe(), jd_text, top_n=top_n or SETTINGS.SHORTLIST_SIZE, texts=_full_texts, **options
+        )
+        ranked = streamed["ranked"]
+        out["considered"] = streamed["considered"]
+    else:
+        ranked = ranking_candidates(candidates, jd_text, top_n=top_n, texts=_full_texts(candidates), **options)["ranked"]
     explanations = [explain_score(c) for c in ranked[:10]]
-    return {"ranked": ranked, "explanations": explanations}
+    return {"ranked": ranked, "explanations": explanations, **out}
 
-def run_skill_worker(candidates: List[Dict[str, Any]], jd_skills: List[str] | None = None) -> Dict[str, Any]:
-    enriched = []
-    for c in candidates:
-        skills = extract_skills(c.get("preview", ""))["skills"]
-        enriched.append({**c, "skills": skills})
+@timed("hc_worker_seconds", worker="skill")
+def run_skill_worker(
+    candidates: Union[List[Candidate], CandidateStream],
+    jd_skills: List[str] | None = None,
+    query: str = "",
+    top_n: int | None = None,
+) -> Dict[str, Any]:
+    # a stream is consumed page by page: trends count every candidate,
+    # per-candidate skills and gaps are kept for the first top_n only
+    streamed = isinstance(candidates, CandidateStream)
+    pages = candidates.subscribe() if streamed else [candidates]
+    keep = (top_n or SETTINGS.SHORTLIST_SIZE) if streamed else top_n
+    counts: Dict[str, int] = {}
+    enriched: List[Any] = []
+    trend: Dict[str, Any] = {"top_skills": []}
+    considered = 0
+    for page in pages:
+        extracted = extract_skills_batch(_full_texts(page))
+        records = [as_record(c).with_(skills=e["skills"]) for c, e in zip(page, extracted)]
+        trend = skill_trend_aggregator(records, counts)
+        considered += len(records)
+        enriched.extend(records if keep is None else records[:max(0, keep - len(enriched))])
 
-    trend = skill_trend_aggregator(enriched)
     out: Dict[str, Any] = {"candidates": enriched, "trend": trend}
+    if streamed:
+        out["considered"] = considered
 
     if jd_skills:
+        # per-candidate gaps for the top 10 only; corpus_gap below covers everyone
         gaps = []
         for c in enriched[:10]:
             gap = skill_gap_analysis(jd_skills, c.get("skills", []))
             gaps.append({"id": c.get("id"), **gap})
         out["gaps"] = gaps
 
+    # corpus-wide view from the precomputed skill index (built at ingest)
+    index = get_skill_index()
+    if index is not None:
+        category = index.category_in(query)
+        out["corpus_trend"] = corpus_skill_trends(category=category)
+        if jd_skills:
+            out["corpus_gap"] = corpus_skill_gap(jd_skills, category=category)
+
     return out
 
-def run_interview_worker(jd_text: str, candidate: Dict[str, Any]) -> Dict[str, Any]:
-    qs = generate_questions(jd_text, candidate_summary=candidate.get("preview", ""))
+@timed("hc_worker_seconds", worker="interview")
+def run_interview_worker(jd_text: str, candidate: Candidate) -> Dict[str, Any]:
+    qs = generate_questions(jd_text, candidate_summary=_summary(candidate))
     mapping = competency_mapper(qs)
     return {"questions": qs, "competency_map": mapping}
+
+def _full_texts(candidates: List[Candidate]) -> List[str]:
+    # whole resumes from the doc store; the preview when a text isn't available
+    texts = candidate_texts(candidates)
+    return [texts.get(c.get("id"), c.get("preview", "")) for c in candidates]
+
+def _summary(candidate: Candidate) -> str:
+    text = _full_texts([candidate])[0]
+    sections = split_sections(text)
+    return sections.get("summary") or sections.get("professional summary") or text[:1000]
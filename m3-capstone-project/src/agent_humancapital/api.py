@@ -0,0 +1,370 @@
+"""Headless HTTP API: a plain ASGI application, served by any ASGI server.
+
+    uvicorn agent_humancapital.api:app --host 0.0.0.0 --port 8000 --workers 4
+    python -m agent_humancapital.api --workers 4     # same, defaults from API_HOST / API_PORT
+
+Endpoints:
+    POST /v1/query   SupervisorInput JSON -> supervisor_run result;
+                     with "stream": true, NDJSON supervisor_stream events
+    POST /v1/batch   {"requests": [SupervisorInput, ...]} -> {"results": [...]}
+    GET  /health     vector store health and load (503 when down or draining)
+    GET  /metrics    Prometheus latency histograms (?format=json for a snapshot)
+
+The caller's role (and so what RBAC lets it do) comes from its API key
+("Authorization: Bearer <key>", mapped to roles by API_KEYS), never from the
+request body; requests without a key get API_ANONYMOUS_ROLE, unknown keys 401.
+
+Each server process warms one ResourceRegistry (clients, indexes, caches) at
+startup and shares it across requests; supervisor work runs on a thread pool
+of API_MAX_CONCURRENCY. More requests wait in a bounded queue, beyond that
+they get 503 with Retry-After. On shutdown new requests are refused and
+in-flight ones get API_SHUTDOWN_TIMEOUT_S to finish.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import hmac
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from pydantic import ValidationError
+
+from agent_humancapital.agents.supervisor import supervisor_run, supervisor_run_batch, supervisor_stream
+from agent_humancapital.config import SETTINGS, Settings
+from agent_humancapital.metrics import METRICS, span
+from agent_humancapital.orchestration.schemas import SupervisorInput
+from agent_humancapital.resources import ResourceRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+Headers = List[Tuple[bytes, bytes]]
+
+_RETRY = [(b"retry-after", b"1")]
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, detail: Any, headers: Optional[Headers] = None):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.headers = headers or []
+
+
+class ApiApp:
+    """The ASGI app; all state lives on the instance, so tests can build their own."""
+
+    def __init__(self, settings: Settings = SETTINGS, registry: Optional[ResourceRegistry] = None):
+        self.settings = settings
+        self._registry = registry
+        self._keys: Optional[List[Tuple[str, str]]] = None  # parsed on first use, like the settings
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+        self.ready = False
+        self.draining = False
+        self.inflight = 0
+        self.queued = 0
+        self.routes: Dict[Tuple[str, str], Callable[[Scope, Receive, Send], Awaitable[None]]] = {
+            ("POST", "/v1/query"): self.query,
+            ("POST", "/v1/batch"): self.batch,
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+        }
+
+    @property
+    def registry(self) -> ResourceRegistry:
+        return self._registry if self._registry is not None else get_registry()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    # ---- lifecycle -------------------------------------------------------
+    async def startup(self) -> None:
+        self._start()
+        self._api_keys()  # a malformed API_KEYS fails the startup, not the first request
+        # connect and load the vector store before taking traffic
+        health = await asyncio.get_running_loop().run_in_executor(self._pool, self.registry.warmup)
+        logger.info("API ready: vector store %s (%s ms)", health["status"], health["latency_ms"])
+        self.ready = True
+
+    async def shutdown(self) -> None:
+        self.draining = True
+        if self._idle is not None:
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.settings.API_SHUTDOWN_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                logger.warning("Shutting down with %d requests still in flight", self.inflight)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        await asyncio.to_thread(self.registry.close)
+
+    def _start(self) -> None:
+        # also reached without lifespan events (servers that don't send them)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.settings.API_MAX_CONCURRENCY, thread_name_prefix="api")
+            self._slots = asyncio.Semaphore(self.settings.API_MAX_CONCURRENCY)
+            self._idle = asyncio.Event()
+            self._idle.set()
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    logger.exception("API startup failed")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # ---- admission -------------------------------------------------------
+    async def _admit(self) -> None:
+        """Take a worker slot, waiting in the bounded queue; 503 when it is full or the wait is too long."""
+        if self.draining:
+            raise HttpError(503, "shutting down", _RETRY)
+        if self._slots.locked() and self.queued >= self.settings.API_MAX_QUEUE:
+            raise HttpError(503, "overloaded", _RETRY)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.settings.API_QUEUE_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            raise HttpError(503, "overloaded", _RETRY) from None
+        finally:
+            self.queued -= 1
+        self.inflight += 1
+        self._idle.clear()
+
+    def _release(self) -> None:
+        self.inflight -= 1
+        self._slots.release()
+        if self.inflight == 0:
+            self._idle.set()
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        await self._admit()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        finally:
+            self._release()
+
+    # ---- routing ---------------------------------------------------------
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._start()
+        started = False
+
+        async def tracked(message: Dict[str, Any]) -> None:
+            nonlocal started
+            started = True
+            await send(message)
+
+        path = scope["path"]
+        handler = self.routes.get((scope["method"], path))
+        try:
+            if handler is None:
+                known = any(p == path for _, p in self.routes)
+                raise HttpError(405 if known else 404, "method not allowed" if known else "not found")
+            with span("hc_api_seconds", route=path):
+                await handler(scope, receive, tracked)
+        except HttpError as e:
+            if not started:
+                await _send_json(send, e.status, {"error": e.detail}, e.headers)
+        except Exception:
+            logger.exception("Unhandled error on %s %s", scope["method"], path)
+            if not started:
+                await _send_json(send, 500, {"error": "internal error"})
+
+    def _api_keys(self) -> List[Tuple[str, str]]:
+        if self._keys is None:
+            self._keys = _parse_keys(self.settings.API_KEYS)
+        return self._keys
+
+    def _role(self, scope: Scope) -> str:
+        """The caller's role, from its API key; 401 for a key that isn't configured."""
+        auth = dict(scope.get("headers") or []).get(b"authorization", b"").decode("latin-1").strip()
+        if not auth:
+            return self.settings.API_ANONYMOUS_ROLE
+        scheme, _, token = auth.partition(" ")
+        if scheme.lower() == "bearer":
+            token = token.strip().encode("utf-8")
+            for key, role in self._api_keys():
+                if hmac.compare_digest(key.encode("utf-8"), token):
+                    return role
+        raise HttpError(401, "invalid API key", [(b"www-authenticate", b"Bearer")])
+
+    # ---- endpoints -------------------------------------------------------
+    async def query(self, scope: Scope, receive: Receive, send: Send) -> None:
+        role = self._role(scope)
+        body = await self._json(receive)
+        stream = bool(body.pop("stream", False))
+        payload = _payload(body, role)
+        if stream:
+            await self._stream(payload, send)
+            return
+        await _send_json(send, 200, await self._run(supervisor_run, payload))
+
+    async def batch(self, scope: Scope, receive: Receive, send: Send) -> None:
+        role = self._role(scope)
+        body = await self._json(receive)
+        items = body.get("requests")
+        if not isinstance(items, list) or not items:
+            raise HttpError(422, "'requests' must be a non-empty list")
+        if len(items) > self.settings.API_MAX_BATCH:
+            raise HttpError(413, f"at most {self.settings.API_MAX_BATCH} requests per batch")
+        payloads = [_payload(item, role) for item in items]
+        await _send_json(send, 200, {"results": await self._run(supervisor_run_batch, payloads)})
+
+    async def health(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # not queued behind queries: health must answer while the pool is busy
+        out = await asyncio.to_thread(self.registry.health)
+        out.update(
+            ready=self.ready,
+            draining=self.draining,
+            inflight=self.inflight,
+            queued=self.queued,
+            max_concurrency=self.settings.API_MAX_CONCURRENCY,
+        )
+        ok = out["status"] == "ok" and not self.draining
+        await _send_json(send, 200 if ok else 503, out)
+
+    async def metrics(self, scope: Scope, receive: Receive, send: Send) -> None:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if query.get("format") == ["json"]:
+            await _send_json(send, 200, METRICS.snapshot())
+            return
+        await _send(send, 200, METRICS.prometheus().encode("utf-8"), b"text/plain; version=0.0.4")
+
+    async def _stream(self, payload: SupervisorInput, send: Send) -> None:
+        await self._admit()
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def produce() -> None:
+            try:
+                for event in supervisor_stream(payload):
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+            except Exception as e:
+                logger.exception("Streaming query failed")
+                loop.call_soon_threadsafe(events.put_nowait, {"type": "error", "error": str(e)})
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, None)
+
+        future = loop.run_in_executor(self._pool, produce)
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/x-ndjson")]})
+            while (event := await events.get()) is not None:
+                await send({"type": "http.response.body", "body": _dumps(event) + b"\n", "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            # the slot is held until the worker thread is done, even if the client went away
+            await future
+            self._release()
+
+    async def _json(self, receive: Receive) -> Dict[str, Any]:
+        chunks: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise HttpError(400, "client disconnected")
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.settings.API_MAX_BODY_BYTES:
+                raise HttpError(413, f"body larger than {self.settings.API_MAX_BODY_BYTES} bytes")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        try:
+            body = json.loads(b"".join(chunks) or b"{}")
+        except ValueError as e:
+            raise HttpError(400, f"invalid JSON: {e}") from None
+        if not isinstance(body, dict):
+            raise HttpError(400, "expected a JSON object")
+        return body
+
+
+def _parse_keys(spec: str) -> List[Tuple[str, str]]:
+    # "key1:hr,key2:admin" -> [(key, role), ...]
+    keys = []
+    for item in filter(None, (i.strip() for i in spec.split(","))):
+        key, _, role = item.rpartition(":")
+        if not key or not role.strip():
+            raise ValueError("API_KEYS entries must look like <key>:<role>")
+        keys.append((key, role.strip().lower()))
+    return keys
+
+
+def _payload(body: Any, role: str) -> SupervisorInput:
+    # the role in the body (if any) is replaced by the one the API key grants
+    if isinstance(body, dict) and isinstance(body.get("user", {}), dict):
+        body = {**body, "user": {**body.get("user", {}), "role": role}}
+    try:
+        return SupervisorInput.model_validate(body)
+    except ValidationError as e:
+        raise HttpError(422, json.loads(e.json(include_url=False))) from None
+
+
+def _default(obj: Any) -> Any:
+    # CandidateRecord / SearchFilter, numpy scalars, anything else as text
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=_default, ensure_ascii=False).encode("utf-8")
+
+
+async def _send_json(send: Send, status: int, obj: Any, headers: Optional[Headers] = None) -> None:
+    await _send(send, status, _dumps(obj), b"application/json", headers)
+
+
+async def _send(send: Send, status: int, body: bytes, content_type: bytes, headers: Optional[Headers] = None) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode()), *(headers or [])],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+app = ApiApp()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the HR assistant HTTP API")
+    parser.add_argument("--host", default=SETTINGS.API_HOST)
+    parser.add_argument("--port", type=int, default=SETTINGS.API_PORT)
+    parser.add_argument("--workers", type=int, default=1, help="server processes, each with its own warm resources")
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Serving the API needs an ASGI server, e.g. `pip install uvicorn`") from None
+    uvicorn.run(
+        "agent_humancapital.api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        lifespan="on",
+        timeout_graceful_shutdown=int(SETTINGS.API_SHUTDOWN_TIMEOUT_S),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,15 @@
 import streamlit as st
-from agent_humancapital.orchestration.schemas import SupervisorInput, UserContext
-from agent_humancapital.agents.supervisor import supervisor_run
+from agent_humancapital.client import ApiClient, ApiError
 from agent_humancapital.config import SETTINGS
+from agent_humancapital.tokens import TokenLedger
 
-# ----------------------------
-# Token counting helper
-# ----------------------------
-def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
-    """
-    Best effort token counter:
-    - Uses tiktoken if installed
-    - Falls back to rough approximation if not
-    """
-    if not text:
-        return 0
+# Thin client: the supervisor, vector store and caches live in the API server
+# (python -m agent_humancapital.api); reruns only talk HTTP.
+@st.cache_resource
+def _client() -> ApiClient:
+    return ApiClient(SETTINGS.API_URL)
 
-    try:
-        import tiktoken  # pip install tiktoken
-        try:
-            enc = tiktoken.encoding_for_model(model)
-        except KeyError:
-            enc = tiktoken.get_encoding("cl100k_base")
-        return len(enc.encode(text))
-    except Exception:
-        # fallback: ~4 chars/token heuristic (rough)
-        return max(1, len(text) // 4)
+client = _client()
 
 st.set_page_config(page_title="Multi-Agent HR Chatbot", layout="wide")
 st.markdown("""
@@ -35,12 +20,27 @@ st.markdown("""
 
 with st.sidebar:
     st.header("User Context")
-    role = st.selectbox("Role", ["guest", "manager", "hr", "recruiter", "admin"], index=0)
     user_id = st.text_input("User ID", value="tyson")
-    st.caption("RBAC affects which tools/actions can be used.")
+    st.caption("RBAC affects which tools/actions can be used; the role comes from this app's API_KEY.")
+    top_k = st.number_input("Top-k results", min_value=1, max_value=5000, value=SETTINGS.TOP_K_DEFAULT)
+    health = client.health()
+    st.caption(f"API {SETTINGS.API_URL}: {health['status']} ({health.get('latency_ms')} ms)")
+    with st.expander("Latency (p50/p95/p99, ms)"):
+        try:
+            st.json(client.metrics())
+        except (ApiError, OSError) as e:
+            st.caption(f"unavailable: {e}")
 
 if "messages" not in st.session_state:
     st.session_state.messages = []
+if "ledger" not in st.session_state:
+    # token counts are computed once per message and kept for the session
+    st.session_state.ledger = TokenLedger(
+        model=SETTINGS.LLM_MODEL,
+        budget=SETTINGS.HISTORY_TOKEN_BUDGET,
+        max_messages=SETTINGS.MAX_HISTORY_MESSAGES,
+    )
+ledger = st.session_state.ledger
 
 # Render chat history
 for m in st.session_state.messages:
@@ -53,28 +53,41 @@ if prompt:
         st.markdown(prompt)
     st.session_state.messages.append({"role": "user", "content": prompt})
 
-    # prepare history (string)
-    recent = st.session_state.messages[-SETTINGS.MAX_HISTORY_MESSAGES:]
-    history_str = "\n".join([f"{x['role']}: {x['content']}" for x in recent])
-
-    # --- Token usage estimation (input) ---
-    input_text = f"{history_str}\nuser: {prompt}"
-    input_tokens = count_tokens(input_text, model=getattr(SETTINGS, "LLM_MODEL", "gpt-4o-mini"))
-
-    payload = SupervisorInput(
-        query=prompt,
-        history=history_str,
-        user=UserContext(user_id=user_id, role=role),
-    )
+    # history window trimmed by token budget; only the new message is encoded
+    ledger.add("user", prompt)
+    payload = {
+        "query": prompt,
+        "history": ledger.history(),
+        "history_tokens": ledger.history_tokens,
+        "user": {"user_id": user_id},  # the server assigns the role from the API key
+        "top_k": int(top_k),
+    }
 
     with st.chat_message("assistant"):
-        result = supervisor_run(payload)
+        # Show each worker's (already redacted) section as soon as it finishes,
+        # then replace the partial view with the final governed answer.
+        placeholder = st.empty()
+        partial, result = [], {}
+        try:
+            for event in client.stream(payload):
+                if event["type"] == "chunk":
+                    partial.append(event["content"])
+                    placeholder.markdown("\n".join(partial) + "\n\n_Working…_")
+                elif event["type"] == "result":
+                    result = event["result"]
+                else:
+                    raise ApiError(500, event.get("error"))
+        except (ApiError, OSError) as e:
+            # busy (503) or unreachable server: say so instead of a traceback
+            st.error(f"The assistant is unavailable right now ({e}). Please try again.")
+            st.stop()
         answer = result["answer"]
-        st.markdown(answer)
+        placeholder.markdown(answer)
         st.session_state.messages.append({"role": "assistant", "content": answer})
 
-        # --- Token usage estimation (output) ---
-        output_tokens = count_tokens(answer, model=getattr(SETTINGS, "LLM_MODEL", "gpt-4o-mini"))
+        usage = result.get("usage", {})
+        ledger.add("assistant", answer, tokens=usage.get("output_tokens"))
+        ledger.record(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
 
         with st.expander("Tool Traces"):
             st.json(result.get("tool_traces", []))
@@ -84,9 +97,12 @@ if prompt:
 
         # ✅ NEW: Usage details
         with st.expander("Usage Details (Token Estimate)"):
+            session = ledger.usage()
             st.code(
-                f"model: {getattr(SETTINGS, 'LLM_MODEL', 'gpt-4o-mini')}\n"
-                f"input_tokens:  {input_tokens}\n"
-                f"output_tokens: {output_tokens}\n"
-                f"total_tokens:  {input_tokens + output_tokens}\n"
+                f"model: {usage.get('model', SETTINGS.LLM_MODEL)}\n"
+                f"input_tokens:  {usage.get('input_tokens', 0)}\n"
+                f"output_tokens: {usage.get('output_tokens', 0)}\n"
+                f"total_tokens:  {usage.get('total_tokens', 0)}\n"
+                f"session_total: {session['total_tokens']} "
+                f"(history window: {session['history_messages']} msgs / {session['history_tokens']} tokens)\n"
             )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+import threading
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+
+@dataclass(slots=True)
+class CandidateRecord:
+    """Compact candidate passed between workers.
+
+    Holds the id, scores and a short preview only; the payload metadata is not
+    carried along and the full resume text is fetched on demand (`text()`).
+    Unset fields are None. `get`/`[]`/`in`/`dict(c)` behave like the candidate
+    dicts the tools were written against, so both forms are accepted.
+    """
+
+    id: Any
+    category: Optional[str] = None
+    score: float = 0.0
+    preview: str = ""
+    point_id: Optional[str] = None  # vector store id, for text()
+    bm25_score: Optional[float] = None
+    rrf_score: Optional[float] = None
+    jd_match_score: Optional[float] = None
+    combined_score: Optional[float] = None
+    matched_terms: Optional[List[str]] = None
+    skills: Optional[List[str]] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key) if key in _FIELD_SET else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self) -> List[str]:
+        return [name for name in FIELDS if getattr(self, name) is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def with_(self, **changes: Any) -> "CandidateRecord":
+        return replace(self, **changes)
+
+    def text(self, limit: Optional[int] = None) -> str:
+        """Full (redacted) resume text from the doc store or vector store; the preview if unavailable."""
+        from agent_humancapital.tools.retrieval_tools import candidate_texts
+
+        return candidate_texts([self], limit).get(self.id, self.preview)
+
+
+FIELDS = tuple(f.name for f in fields(CandidateRecord))
+_FIELD_SET = frozenset(FIELDS)
+
+Candidate = Union[CandidateRecord, Mapping[str, Any]]
+
+
+def as_record(candidate: Candidate) -> CandidateRecord:
+    """Accept a CandidateRecord or a candidate dict; unknown dict keys (e.g. metadata) are dropped."""
+    if isinstance(candidate, CandidateRecord):
+        return candidate
+    known = {k: v for k, v in candidate.items() if k in _FIELD_SET}
+    known.setdefault("id", None)
+    if known.get("score") is None:
+        known["score"] = 0.0
+    return CandidateRecord(**known)
+
+
+def candidate_ids(candidates: List[Candidate]) -> List[Any]:
+    return [c.get("id") for c in candidates]
+
+
+class CandidateStream:
+    """Pages of candidates from a generator, shared by several consumers.
+
+    Every `subscribe()` iterator sees all pages in order. A page is pulled
+    from the source when the first consumer needs it and released once
+    `consumers` subscribers have read it, so only the pages between the
+    fastest and the slowest reader are held. Safe to consume from worker
+    threads; an error raised by the source is re-raised to every consumer.
+    """
+
+    def __init__(self, pages: Iterable[List[CandidateRecord]], consumers: int = 1):
+        self.consumers = consumers
+        self.pulled = 0  # candidates read from the source so far
+        self._source = iter(pages)
+        self._lock = threading.Lock()
+        self._pages: Dict[int, List[CandidateRecord]] = {}
+        self._reads: Dict[int, int] = {}
+        self._count = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+
+    def subscribe(self) -> Iterator[List[CandidateRecord]]:
+        i = 0
+        while True:
+            page = self._page(i)
+            if page is None:
+                return
+            yield page
+            i += 1
+
+    def _page(self, i: int) -> Optional[List[CandidateRecord]]:
+        with self._lock:
+            while self._count <= i and not self._done:
+                try:
+                    page = next(self._source, None)
+                except Exception as exc:
+                    self._error, page = exc, None
+                if page is None:
+                    self._done = True
+                    break
+                self._pages[self._count], self._reads[self._count] = page, 0
+                self._count += 1
+                self.pulled += len(page)
+            if i >= self._count:
+                if self._error is not None:
+                    raise self._error
+                return None
+            if i not in self._pages:
+                raise RuntimeError(f"page {i} already released; more subscribers than consumers={self.consumers}")
+            page = self._pages[i]
+            self._reads[i] += 1
+            if self._reads[i] >= self.consumers:
+                del self._pages[i], self._reads[i]
+            return page
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class ApiError(RuntimeError):
+    def __init__(self, status: int, detail: Any):
+        super().__init__(f"API error {status}: {detail}")
+        self.status = status
+        self.detail = detail
+
+
+class ApiClient:
+    """Client for the HTTP API (api.py); stdlib only, so frontends stay thin.
+
+    Payloads are SupervisorInput models or plain dicts with the same fields;
+    the server ignores their role and uses the one its API_KEYS grant
+    `api_key`. Doesn't import the settings: callers (e.g. an ATS integration)
+    need no server credentials, only API_URL and their API_KEY.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 120.0, api_key: Optional[str] = None):
+        self.base_url = (base_url or os.getenv("API_URL", "http://127.0.0.1:8000")).rstrip("/")
+        self.timeout = timeout
+        self.api_key = api_key if api_key is not None else os.getenv("API_KEY", "")
+
+    def query(self, payload: Any) -> Dict[str, Any]:
+        return self._request("POST", "/v1/query", _body(payload))
+
+    def stream(self, payload: Any) -> Iterator[Dict[str, Any]]:
+        """supervisor_stream events as the server produces them ({"type": "chunk" | "result" | "error", ...})."""
+        with self._open("POST", "/v1/query", {**_body(payload), "stream": True}) as resp:
+            for line in resp:
+                if line.strip():
+                    yield json.loads(line)
+
+    def batch(self, payloads: List[Any]) -> List[Dict[str, Any]]:
+        return self._request("POST", "/v1/batch", {"requests": [_body(p) for p in payloads]})["results"]
+
+    def health(self) -> Dict[str, Any]:
+        # an unhealthy server answers 503 with the same body; report it rather than raise
+        try:
+            return self._request("GET", "/health")
+        except ApiError as e:
+            if isinstance(e.detail, dict):
+                return e.detail
+            raise
+        except OSError as e:
+            return {"status": "unreachable", "error": str(e), "latency_ms": None}
+
+    def metrics(self) -> Dict[str, Any]:
+        return self._request("GET", "/metrics?format=json")
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        with self._open(method, path, body) as resp:
+            return json.loads(resp.read())
+
+    def _open(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        try:
+            return urllib.request.urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            raw = e.read()
+            try:
+                detail = json.loads(raw)
+            except ValueError:
+                detail = raw.decode("utf-8", errors="replace")
+            if isinstance(detail, dict) and set(detail) == {"error"}:
+                detail = detail["error"]
+            raise ApiError(e.code, detail) from None
+
+
+def _body(payload: Any) -> Dict[str, Any]:
+    return payload.model_dump() if hasattr(payload, "model_dump") else dict(payload)
@@ -1,27 +1,147 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
 import os
+import threading
+from typing import Any, Callable, Optional
 
-load_dotenv()
+def _is_true(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
 
-def _env(name: str, default: str | None = None) -> str:
-    v = os.getenv(name, default)
-    if v is None or v == "":
-        raise ValueError(f"Missing required env var: {name}")
-    return v
+def _setting(name: str, default: str, parse: Callable[[str], Any] = str) -> Any:
+    # read from the environment when Settings() is built, not when this module is imported
+    return field(default_factory=lambda: parse(os.getenv(name, default)))
 
 @dataclass(frozen=True)
 class Settings:
-    OPENAI_API_KEY: str = _env("OPENAI_API_KEY")
-    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o-mini")
-    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    """Configuration from the environment (and .env).
 
-    QDRANT_URL: str = _env("QDRANT_URL")
-    QDRANT_API_KEY: str = _env("QDRANT_API_KEY")
-    QDRANT_COLLECTION_NAME: str = os.getenv("QDRANT_COLLECTION_NAME", "resumes_collection")
+    Credentials are not checked up front: the code that builds a service
+    calls `require(...)` for the settings it needs, so tools that never talk
+    to OpenAI or Qdrant work without them.
+    """
 
-    TOP_K_DEFAULT: int = int(os.getenv("TOP_K_DEFAULT", "5"))
-    MAX_HISTORY_MESSAGES: int = int(os.getenv("MAX_HISTORY_MESSAGES", "20"))
+    OPENAI_API_KEY: str = _setting("OPENAI_API_KEY", "")
+    LLM_MODEL: str = _setting("LLM_MODEL", "gpt-4o-mini")
+    EMBEDDING_PROVIDER: str = _setting("EMBEDDING_PROVIDER", "openai")  # openai | hash (offline)
+    EMBEDDING_MODEL: str = _setting("EMBEDDING_MODEL", "text-embedding-3-small")
+    EMBEDDING_DIM: int = _setting("EMBEDDING_DIM", "1536", int)
+    EMBEDDING_CACHE_PATH: str = _setting("EMBEDDING_CACHE_PATH", ".agent_data/cache/embeddings.sqlite")
+    EMBEDDING_CACHE_SIZE: int = _setting("EMBEDDING_CACHE_SIZE", "4096", int)
+    EMBEDDING_CACHE_MAX_DISK_ROWS: int = _setting("EMBEDDING_CACHE_MAX_DISK_ROWS", "500000", int)
 
-SETTINGS = Settings()
+    VECTOR_BACKEND: str = _setting("VECTOR_BACKEND", "qdrant")  # qdrant | local
+    VECTOR_DISTANCE: str = _setting("VECTOR_DISTANCE", "cosine")  # how backend scores should be read
+    LOCAL_INDEX_DIR: str = _setting("LOCAL_INDEX_DIR", ".agent_data/local_index")
+    LOCAL_ANN_MIN_DOCS: int = _setting("LOCAL_ANN_MIN_DOCS", "50000", int)
+    LOCAL_ANN_NPROBE: int = _setting("LOCAL_ANN_NPROBE", "8", int)
+
+    QDRANT_URL: str = _setting("QDRANT_URL", "")
+    QDRANT_API_KEY: str = _setting("QDRANT_API_KEY", "")
+    QDRANT_COLLECTION_NAME: str = _setting("QDRANT_COLLECTION_NAME", "resumes_collection")
+    QDRANT_PREFER_GRPC: bool = _setting("QDRANT_PREFER_GRPC", "true", _is_true)
+    QDRANT_TIMEOUT: int = _setting("QDRANT_TIMEOUT", "60", int)
+
+    # Side indexes built at ingest time (BM25, ...)
+    INDEX_DIR: str = _setting("INDEX_DIR", ".agent_data/index")
+    RRF_K: int = _setting("RRF_K", "60", int)
+
+    SKILL_TAXONOMY_PATH: str = _setting("SKILL_TAXONOMY_PATH", "")  # empty = bundled data/skills.json
+    GOVERNANCE_RULES_PATH: str = _setting("GOVERNANCE_RULES_PATH", "")  # empty = bundled data/governance_rules.json
+
+    # Router: keyword fast path, then nearest intent centroid over cached embeddings
+    ROUTER_SEMANTIC: bool = _setting("ROUTER_SEMANTIC", "true", _is_true)
+    ROUTER_MIN_SIMILARITY: float = _setting("ROUTER_MIN_SIMILARITY", "0.3", float)
+
+    # Cache of full supervisor results; 0 entries disables it. A similarity
+    # above 0 (e.g. 0.97) also serves near-duplicate queries.
+    RESPONSE_CACHE_SIZE: int = _setting("RESPONSE_CACHE_SIZE", "256", int)
+    RESPONSE_CACHE_TTL_S: float = _setting("RESPONSE_CACHE_TTL_S", "600", float)
+    RESPONSE_CACHE_SIMILARITY: float = _setting("RESPONSE_CACHE_SIMILARITY", "0", float)
+
+    WORKER_TIMEOUT_S: float = _setting("WORKER_TIMEOUT_S", "30", float)
+    WORKER_MAX_CONCURRENCY: int = _setting("WORKER_MAX_CONCURRENCY", "4", int)
+
+    # In-process latency histograms (metrics.py); profile a fraction of requests
+    METRICS_ENABLED: bool = _setting("METRICS_ENABLED", "true", _is_true)
+    METRICS_PROFILE_RATE: float = _setting("METRICS_PROFILE_RATE", "0", float)
+    # tool_traces detail: off | summary (candidate ids only) | full (whole records)
+    TRACE_VERBOSITY: str = _setting("TRACE_VERBOSITY", "summary", str.lower)
+
+    TOP_K_DEFAULT: int = _setting("TOP_K_DEFAULT", "5", int)
+    # top_k above the page size streams retrieval in pages; ranking/skills keep the best SHORTLIST_SIZE
+    RETRIEVAL_PAGE_SIZE: int = _setting("RETRIEVAL_PAGE_SIZE", "100", int)
+    SHORTLIST_SIZE: int = _setting("SHORTLIST_SIZE", "50", int)
+    MAX_HISTORY_MESSAGES: int = _setting("MAX_HISTORY_MESSAGES", "20", int)
+    HISTORY_TOKEN_BUDGET: int = _setting("HISTORY_TOKEN_BUDGET", "2000", int)
+
+    # HTTP API (api.py): requests beyond API_MAX_CONCURRENCY wait in a bounded
+    # queue; a full queue or a long wait is answered with 503 + Retry-After
+    API_HOST: str = _setting("API_HOST", "127.0.0.1")
+    API_PORT: int = _setting("API_PORT", "8000", int)
+    API_MAX_CONCURRENCY: int = _setting("API_MAX_CONCURRENCY", "8", int)
+    API_MAX_QUEUE: int = _setting("API_MAX_QUEUE", "32", int)
+    API_QUEUE_TIMEOUT_S: float = _setting("API_QUEUE_TIMEOUT_S", "10", float)
+    API_MAX_BATCH: int = _setting("API_MAX_BATCH", "64", int)
+    API_MAX_BODY_BYTES: int = _setting("API_MAX_BODY_BYTES", "1000000", int)
+    API_SHUTDOWN_TIMEOUT_S: float = _setting("API_SHUTDOWN_TIMEOUT_S", "30", float)
+    # callers authenticate with "Authorization: Bearer <key>" and the key decides
+    # their role ("key1:hr,key2:admin"); requests without a key act as API_ANONYMOUS_ROLE
+    API_KEYS: str = _setting("API_KEYS", "")
+    API_ANONYMOUS_ROLE: str = _setting("API_ANONYMOUS_ROLE", "guest")
+    # where the Streamlit app (app.py) reaches the API
+    API_URL: str = _setting("API_URL", "http://127.0.0.1:8000")
+
+    def require(self, *names: str) -> None:
+        """Raise if any of these settings is empty (called where the service they configure is built)."""
+        for name in names:
+            if not getattr(self, name):
+                raise ValueError(f"Missing required env var: {name}")
+
+
+_SETTINGS: Optional[Settings] = None
+_SETTINGS_LOCK = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """The process-wide Settings, built (and .env loaded) on first use."""
+    global _SETTINGS
+    if _SETTINGS is None:
+        with _SETTINGS_LOCK:
+            if _SETTINGS is None:
+                from dotenv import load_dotenv
+
+                load_dotenv()
+                _SETTINGS = Settings()
+    return _SETTINGS
+
+
+def reset_settings() -> None:
+    """Forget the resolved settings; the next access re-reads the environment."""
+    global _SETTINGS
+    with _SETTINGS_LOCK:
+        _SETTINGS = None
+
+
+class _LazySettings:
+    """`SETTINGS.X` reads get_settings().X, so importing a module that uses SETTINGS costs nothing.
+
+    It passes for a Settings instance (isinstance, dataclasses.fields/replace),
+    so `replace(SETTINGS, ...)` keeps working.
+    """
+
+    __slots__ = ()
+    __dataclass_fields__ = Settings.__dataclass_fields__
+    __dataclass_params__ = Settings.__dataclass_params__
+
+    @property
+    def __class__(self) -> type:  # type: ignore[override]
+        return Settings
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {get_settings()!r}>" if _SETTINGS is not None else "<lazy Settings (unresolved)>"
+
+
+SETTINGS: Settings = _LazySettings()  # type: ignore[assignment]
@@ -0,0 +1,247 @@
+from __future__ import annotations
+import logging
+import os
+import re
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SECTION_HEADINGS = [
+    "professional summary", "summary", "objective", "highlights", "skills", "technical skills",
+    "experience", "work history", "professional experience", "education", "education and training",
+    "certifications", "accomplishments", "projects", "languages", "interests",
+]
+# headings stand on their own: preceded by a line break or a run of spaces
+_SECTION = re.compile(
+    r"(?:^|\n|\s{2,})(" + "|".join(re.escape(h) for h in sorted(SECTION_HEADINGS, key=len, reverse=True)) + r")(?=\s*\n|\s{2,}|\s*$)",
+    re.IGNORECASE,
+)
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """{heading: body} for the usual resume headings; text before the first one is "header"."""
+    out: Dict[str, str] = {}
+    name, start = "header", 0
+    for m in _SECTION.finditer(text):
+        _put_section(out, name, text[start:m.start()])
+        name, start = m.group(1).lower(), m.end()
+    _put_section(out, name, text[start:])
+    return out
+
+
+def _put_section(out: Dict[str, str], name: str, body: str) -> None:
+    body = body.strip()
+    if body:
+        out[name] = f"{out[name]}\n{body}" if name in out else body
+
+
+class DocStore:
+    """Full resume texts in one memory-mapped blob, keyed by doc_id (the candidate id).
+
+    The blob holds UTF-8 texts back to back; docs.npz holds the columns
+    (doc_ids, byte offset, byte length, category code), the category names
+    and the blob file name. A lookup is a dict probe plus a slice of the
+    memory map, so nothing is read from disk until a text is asked for.
+    Updates append to the blob; replaced texts stay as dead bytes until the
+    next save compacts them (into a new blob file, so open readers keep a
+    consistent view; the previous blob is deleted one compaction later).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.categories: List[str] = []
+        self._category_code: Dict[str, int] = {}
+        self._n = 0
+        self._doc_ids = np.zeros(0, dtype=np.int64)
+        self._offsets = np.zeros(0, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.int64)
+        self._cats = np.zeros(0, dtype=np.int32)
+        self._pos: Dict[int, int] = {}
+        self.blob_name = f"text.{uuid.uuid4().hex[:8]}.bin"
+        self._blob_size = 0
+        self._blob: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, row_index: int) -> bool:
+        return int(row_index) in self._pos
+
+    # ---- reads -----------------------------------------------------------
+    def text(self, row_index: int, limit: Optional[int] = None) -> Optional[str]:
+        """Full text (or its first `limit` characters) of a document; None if unknown."""
+        pos = self._pos.get(int(row_index))
+        if pos is None:
+            return None
+        start, length = int(self._offsets[pos]), int(self._lengths[pos])
+        if limit is not None:
+            length = min(length, limit * 4)  # utf-8: at most 4 bytes per character
+        raw = self._map()[start:start + length].tobytes()
+        text = raw.decode("utf-8", errors="ignore")
+        return text[:limit] if limit is not None else text
+
+    def texts(self, row_indexes: Iterable[int]) -> Dict[int, str]:
+        out: Dict[int, str] = {}
+        for r in row_indexes:
+            text = self.text(r)
+            if text is not None:
+                out[int(r)] = text
+        return out
+
+    def section(self, row_index: int, name: str) -> str:
+        text = self.text(row_index)
+        return split_sections(text).get(name.lower(), "") if text else ""
+
+    def category(self, row_index: int) -> Optional[str]:
+        pos = self._pos.get(int(row_index))
+        return None if pos is None else self.categories[int(self._cats[pos])]
+
+    def _map(self) -> np.ndarray:
+        if self._blob is None or self._blob.shape[0] < self._blob_size:
+            if self._blob_size == 0:
+                return np.zeros(0, dtype=np.uint8)
+            self._blob = np.memmap(self._file(self.blob_name), dtype=np.uint8, mode="r", shape=(self._blob_size,))
+        return self._blob
+
+    # ---- updates ---------------------------------------------------------
+    def put(self, docs: Iterable[Tuple[int, str, str]]) -> None:
+        """Add or replace (row_index, text, category) documents."""
+        encoded = [(int(r), t.encode("utf-8"), c) for r, t, c in docs]
+        if not encoded:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._file(self.blob_name), "ab") as f:
+            f.seek(self._blob_size)
+            f.truncate()  # drop bytes a crashed writer appended after the last save
+            for row_index, data, category in encoded:
+                pos = self._pos.get(row_index)
+                if pos is None:
+                    pos = self._append(row_index)
+                self._offsets[pos] = self._blob_size
+                self._lengths[pos] = len(data)
+                self._cats[pos] = self._code(category)
+                f.write(data)
+                self._blob_size += len(data)
+
+    def remove(self, row_index: int) -> None:
+        pos = self._pos.pop(int(row_index), None)
+        if pos is not None:
+            self._doc_ids[pos] = -1
+
+    def _append(self, row_index: int) -> int:
+        if self._n == self._doc_ids.shape[0]:
+            cap = max(16, 2 * self._n)
+            self._doc_ids = _grow(self._doc_ids, cap)
+            self._offsets = _grow(self._offsets, cap)
+            self._lengths = _grow(self._lengths, cap)
+            self._cats = _grow(self._cats, cap)
+        pos = self._n
+        self._doc_ids[pos] = row_index
+        self._pos[row_index] = pos
+        self._n += 1
+        return pos
+
+    def _code(self, category: str) -> int:
+        code = self._category_code.get(category)
+        if code is None:
+            code = self._category_code[category] = len(self.categories)
+            self.categories.append(category)
+        return code
+
+    def dead_bytes(self) -> int:
+        live = np.flatnonzero(self._doc_ids[:self._n] >= 0)
+        return self._blob_size - int(self._lengths[live].sum())
+
+    # ---- persistence -----------------------------------------------------
+    def save(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if self.dead_bytes() > self._blob_size // 2:
+            self._compact()
+        live = np.flatnonzero(self._doc_ids[:self._n] >= 0)
+        tmp = self._file("docs.tmp.npz")
+        np.savez(
+            tmp,
+            doc_ids=self._doc_ids[live],
+            offsets=self._offsets[live],
+            lengths=self._lengths[live],
+            cats=self._cats[live],
+            categories=np.array(self.categories, dtype=str),
+            blob=np.array([self.blob_name, str(self._blob_size)]),
+        )
+        # one atomic replace publishes columns and blob name together
+        os.replace(tmp, self._file("docs.npz"))
+
+    def _compact(self) -> None:
+        live = np.flatnonzero(self._doc_ids[:self._n] >= 0)
+        old_map, old_name = self._map(), self.blob_name
+        self.blob_name = f"text.{uuid.uuid4().hex[:8]}.bin"
+        offset = 0
+        with open(self._file(self.blob_name), "wb") as f:
+            for pos in live:
+                start, length = int(self._offsets[pos]), int(self._lengths[pos])
+                f.write(old_map[start:start + length].tobytes())
+                self._offsets[pos] = offset
+                offset += length
+        logger.info("Compacted doc store %s: %d -> %d bytes", self.path, self._blob_size, offset)
+        self._blob_size, self._blob = offset, None
+        # The retired blob is kept for one generation: a reader that loaded the
+        # previous docs.npz maps its blob lazily, on the first text() call.
+        # Anything older is no longer named by a published docs.npz.
+        for name in os.listdir(self.path):
+            if name.startswith("text.") and name.endswith(".bin") and name not in (old_name, self.blob_name):
+                try:
+                    os.remove(self._file(name))
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls, path: str) -> "DocStore":
+        store = cls(path)
+        with np.load(os.path.join(path, "docs.npz")) as data:
+            store._doc_ids = data["doc_ids"]
+            store._offsets = data["offsets"]
+            store._lengths = data["lengths"]
+            store._cats = data["cats"]
+            store.categories = [str(c) for c in data["categories"]]
+            store.blob_name, size = (str(v) for v in data["blob"])
+        store._blob_size = int(size)
+        store._category_code = {c: i for i, c in enumerate(store.categories)}
+        store._n = int(store._doc_ids.shape[0])
+        store._pos = {int(d): i for i, d in enumerate(store._doc_ids)}
+        return store
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+
+def _grow(arr: np.ndarray, cap: int) -> np.ndarray:
+    out = np.zeros(cap, dtype=arr.dtype)
+    out[:arr.shape[0]] = arr
+    return out
+
+
+_LOADED: Dict[str, Tuple[float, DocStore]] = {}
+_LOAD_LOCK = threading.Lock()
+
+
+def load_doc_store(path: str) -> Optional[DocStore]:
+    """Load (once) the store at `path`; reloads when ingestion rewrote it."""
+    npz = os.path.join(path, "docs.npz")
+    if not os.path.exists(npz):
+        return None
+    mtime = os.path.getmtime(npz)
+    cached = _LOADED.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with _LOAD_LOCK:
+        cached = _LOADED.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        store = DocStore.load(path)
+        _LOADED[path] = (mtime, store)
+        logger.info("Loaded doc store from %s (%d docs)", path, len(store))
+        return store
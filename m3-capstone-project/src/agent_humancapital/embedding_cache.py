@@ -0,0 +1,204 @@
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+from agent_humancapital.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    # Collapse whitespace so "data  analyst\n" and "data analyst" share an entry.
+    return " ".join((text or "").split())
+
+
+def cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """SQLite table of float32 vectors keyed by cache_key.
+
+    Rows are tagged with the embedding model; opening the cache with a different
+    model purges everything written by the old one. Reads stamp `last_used`,
+    and eviction drops the least recently used rows first.
+    """
+
+    def __init__(self, path: str, model: str, max_rows: int):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, model TEXT NOT NULL, vec BLOB NOT NULL, created REAL NOT NULL, last_used REAL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+        if "last_used" not in columns:
+            # caches written before last_used existed: start from the write time
+            with self._conn:
+                self._conn.execute("ALTER TABLE embeddings ADD COLUMN last_used REAL")
+                self._conn.execute("UPDATE embeddings SET last_used = created")
+        self._conn.execute("DROP INDEX IF EXISTS embeddings_created")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+        self.invalidate_other_models(model)
+
+    def invalidate_other_models(self, model: str) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM embeddings WHERE model != ?", (model,))
+        if cur.rowcount:
+            logger.info("Embedding cache: dropped %d rows from other models", cur.rowcount)
+        return cur.rowcount
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        now = time.time()
+        with self._lock, self._conn:
+            for i in range(0, len(keys), 500):
+                chunk = list(keys[i:i + 500])
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", chunk)
+                hits = []
+                for key, blob in rows:
+                    vec = array("f")
+                    vec.frombytes(blob)
+                    found[key] = vec.tolist()
+                    hits.append(key)
+                if hits:
+                    marks = ",".join("?" * len(hits))
+                    self._conn.execute(f"UPDATE embeddings SET last_used = ? WHERE key IN ({marks})", [now, *hits])
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> int:
+        now = time.time()
+        rows = [(k, model, array("f", v).tobytes(), now, now) for k, v in items.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vec, created, last_used) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            return self._evict()
+
+    def _evict(self) -> int:
+        # Least recently used first once the table grows past max_rows.
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_rows
+        if overflow <= 0:
+            return 0
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (overflow,),
+        )
+        return overflow
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM embeddings")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Two-tier (memory LRU + SQLite) cache in front of any LangChain Embeddings.
+
+    Keys are (model, whitespace-normalized text). Queries and documents share the
+    cache because OpenAI embeddings are symmetric.
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        model: str,
+        memory_size: int = 4096,
+        disk_path: Optional[str] = None,
+        max_disk_rows: int = 500_000,
+    ):
+        self.inner = inner
+        self.model = model
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(disk_path, model, max_disk_rows) if disk_path else None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        keys = [cache_key(self.model, t) for t in texts]
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            for k in keys:
+                if k in self._memory:
+                    self._memory.move_to_end(k)
+                    found[k] = self._memory[k]
+            self._stats["memory_hits"] += sum(1 for k in keys if k in found)
+
+        pending = [k for k in dict.fromkeys(keys) if k not in found]
+        if pending and self._disk is not None:
+            from_disk = self._disk.get_many(pending)
+            found.update(from_disk)
+            self._stats["disk_hits"] += sum(1 for k in keys if k in from_disk)
+            self._remember(from_disk)
+
+        # Embed each distinct missing text once, in a single batched call.
+        missing: Dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in found and k not in missing:
+                missing[k] = normalize_text(t)
+        if missing:
+            self._stats["misses"] += len(missing)
+            with span("hc_embedding_seconds", op="embed_documents"):
+                vectors = self.inner.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            found.update(fresh)
+            self._remember(fresh)
+            if self._disk is not None:
+                self._stats["evictions"] += self._disk.put_many(self.model, fresh)
+
+        return [found[k] for k in keys]
+
+    def _remember(self, items: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for k, v in items.items():
+                self._memory[k] = v
+                self._memory.move_to_end(k)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        out = dict(self._stats)
+        out["memory_size"] = len(self._memory)
+        if self._disk is not None:
+            out["disk_size"] = len(self._disk)
+        return out
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
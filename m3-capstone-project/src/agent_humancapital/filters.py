@@ -0,0 +1,159 @@
+from __future__ import annotations
+import re
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+# Payload fields that can be filtered on, and their Qdrant payload index schema.
+# They live under the LangChain metadata key ("metadata.category", ...).
+FILTER_FIELDS: Dict[str, str] = {
+    "category": "keyword",
+    "years_experience": "integer",
+}
+
+_YEARS = re.compile(r"(\d{1,2})\s*\+?\s*(?:years|yrs|tahun)\b", re.IGNORECASE)
+_MIN_YEARS = re.compile(
+    r"(?:(?P<op>at least|minimum|min\.?|minimal|more than|over)\s*(?P<n>\d{1,2})\s*\+?\s*(?:years|yrs|tahun)"
+    r"|(?P<n2>\d{1,2})\s*(?:\+|or more)\s*(?:years|yrs|tahun))",
+    re.IGNORECASE,
+)
+_MAX_YEARS = re.compile(r"(?:less than|under|at most|maximum|max\.?)\s*(\d{1,2})\s*(?:years|yrs|tahun)", re.IGNORECASE)
+_CATEGORY = re.compile(r"(?:category|kategori)\s*[:=]\s*(.*)", re.IGNORECASE | re.DOTALL)
+
+
+def years_experience(text: str) -> Optional[int]:
+    """Largest "N years" mentioned in a resume (capped at 50); None if there is none."""
+    found = [int(m.group(1)) for m in _YEARS.finditer(text or "")]
+    found = [y for y in found if y <= 50]
+    return max(found) if found else None
+
+
+def filter_fields(text: str, category: str) -> Dict[str, Any]:
+    """Filterable payload fields for one ingested document."""
+    fields: Dict[str, Any] = {"category": category}
+    years = years_experience(text)
+    if years is not None:
+        fields["years_experience"] = years
+    return fields
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """Structured constraints pushed down into the vector / keyword search.
+
+    Empty filters are falsy, so `if filters:` means "something to push down".
+    """
+
+    category: Optional[str] = None
+    min_years: Optional[int] = None
+    max_years: Optional[int] = None
+
+    def __bool__(self) -> bool:
+        return any(v is not None for v in asdict(self).values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+    def with_(self, **changes: Any) -> "SearchFilter":
+        return replace(self, **changes)
+
+    def matches(self, metadata: Mapping[str, Any]) -> bool:
+        if self.category is not None and category_key(metadata.get("category") or "") != category_key(self.category):
+            return False
+        years = metadata.get("years_experience")
+        if self.min_years is not None and (years is None or years < self.min_years):
+            return False
+        if self.max_years is not None and (years is None or years > self.max_years):
+            return False
+        return True
+
+    def mask(self, column: Callable[[str], np.ndarray]) -> np.ndarray:
+        """Boolean row mask from column arrays (category: str, years_experience: float, NaN = unknown)."""
+        out: Optional[np.ndarray] = None
+        if self.category is not None:
+            # compare normalized names, once per distinct value
+            values, inverse = np.unique(column("category").astype(str), return_inverse=True)
+            want = category_key(self.category)
+            out = np.array([category_key(v) == want for v in values], dtype=bool)[inverse.reshape(-1)]
+        if self.min_years is not None or self.max_years is not None:
+            years = column("years_experience")
+            with np.errstate(invalid="ignore"):
+                ok = np.isfinite(years)
+                if self.min_years is not None:
+                    ok &= years >= self.min_years
+                if self.max_years is not None:
+                    ok &= years <= self.max_years
+            out = ok if out is None else out & ok
+        return out
+
+    def to_qdrant(self, prefix: str = "metadata."):
+        from qdrant_client import models
+
+        must: List[Any] = []
+        if self.category is not None:
+            # keyword indexes are case-sensitive: match the usual spellings of the name
+            must.append(models.FieldCondition(
+                key=f"{prefix}category", match=models.MatchAny(any=category_spellings(self.category)),
+            ))
+        if self.min_years is not None or self.max_years is not None:
+            must.append(models.FieldCondition(
+                key=f"{prefix}years_experience",
+                range=models.Range(gte=self.min_years, lte=self.max_years),
+            ))
+        return models.Filter(must=must)
+
+
+def category_key(name: str) -> str:
+    """Comparison key for category names: "Information-Technology" -> "information technology"."""
+    return _norm(str(name))
+
+
+def category_spellings(name: str) -> List[str]:
+    """Case / separator variants of a category name, for exact-match backends."""
+    base = {name, name.upper(), name.lower(), name.title()}
+    return sorted(base | {v.replace("-", " ") for v in base} | {v.replace(" ", "-") for v in base})
+
+
+def canonical_category(name: str, categories: Iterable[str]) -> Optional[str]:
+    """The known category `name` refers to (case / separators ignored); None if unknown."""
+    want = category_key(name)
+    return next((c for c in categories if category_key(c) == want), None)
+
+
+def parse_filters(query: str, categories: Iterable[str] = ()) -> SearchFilter:
+    """Pull structured constraints out of a free-text query.
+
+    Like the "skills:" convention in the supervisor, only an explicit
+    "category: HR" marker becomes a category filter; it is resolved against
+    the known categories and dropped when it names none of them (a category
+    merely mentioned in the query, "data scientists with banking experience",
+    is not a constraint). Phrases like "5+ years" / "at least 5 years" /
+    "under 3 years" become year bounds.
+    """
+    category: Optional[str] = None
+    m = _CATEGORY.search(query)
+    if m:
+        category = _leading_category(m.group(1), categories)
+
+    min_years = max_years = None
+    m = _MIN_YEARS.search(query)
+    if m:
+        strict = (m.group("op") or "").lower() in ("more than", "over")
+        min_years = int(m.group("n") or m.group("n2")) + strict
+    m = _MAX_YEARS.search(query)
+    if m:
+        max_years = int(m.group(1))
+    return SearchFilter(category=category, min_years=min_years, max_years=max_years)
+
+
+def _leading_category(text: str, categories: Iterable[str]) -> Optional[str]:
+    # the longest known category the text starts with, on a word boundary:
+    # "information technology with 5+ years" -> "INFORMATION-TECHNOLOGY"
+    head = category_key(text)
+    found = [c for c in categories if category_key(c) and (head + " ").startswith(category_key(c) + " ")]
+    return max(found, key=lambda c: len(category_key(c)), default=None)
+
+
+def _norm(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9&]+", " ", text.lower()).split())
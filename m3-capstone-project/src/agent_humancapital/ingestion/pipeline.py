@@ -0,0 +1,380 @@
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from agent_humancapital.filters import FILTER_FIELDS, filter_fields
+
+if TYPE_CHECKING:
+    from langchain_core.vectorstores import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Fixed namespace so the same content always maps to the same point id.
+_POINT_NAMESPACE = uuid.UUID("5b0c2f3e-8d8a-4f6a-9a4e-2f1d6c9b7e10")
+# doc ids: the source's code above the row index's 32 bits
+_ROW_BITS = 32
+
+
+@dataclass
+class IngestRecord:
+    row_index: int
+    text: str
+    category: str
+    source: str
+    pii: List[Any] = field(default_factory=list)  # spans removed by redaction, if any
+    # candidate id, unique across sources (IngestManifest.doc_id); the sinks key on it
+    doc_id: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.doc_id is None:
+            self.doc_id = self.row_index
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.row_index}"
+
+
+@dataclass
+class IngestStats:
+    seen: int = 0
+    skipped_empty: int = 0
+    unchanged: int = 0
+    upserted: int = 0
+    deleted: int = 0
+    failed_batches: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+def content_hash(text: str, category: str, variant: str = "") -> str:
+    # variant marks how the text is stored (e.g. redacted), so switching it re-ingests
+    key = f"{category}\x00{text}" + (f"\x00{variant}" if variant else "")
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def point_id(digest: str) -> str:
+    # Qdrant only accepts unsigned ints or UUIDs as point ids.
+    return str(uuid.uuid5(_POINT_NAMESPACE, digest))
+
+
+class IngestManifest:
+    """SQLite checkpoint of what has already been written to the vector store.
+
+    One row per source record (source:row_index) with the content hash and point
+    id it was stored under. Batches are recorded only after their upsert
+    succeeds, so an interrupted run resumes from the last completed batch.
+    It also numbers the sources, which makes doc ids unique across them.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS records "
+            "(key TEXT PRIMARY KEY, content_hash TEXT NOT NULL, point_id TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS records_point ON records(point_id)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, code INTEGER NOT NULL UNIQUE)")
+        self._source_codes: Dict[str, int] = {}
+
+    def doc_id(self, source: str, row_index: int) -> int:
+        """Candidate id of a source row: (source code << 32) | row_index.
+
+        Sources are numbered in the order they are first ingested, so the
+        first source's ids are its row indexes.
+        """
+        code = self._source_codes.get(source)
+        if code is None:
+            with self._lock, self._conn:
+                row = self._conn.execute("SELECT code FROM sources WHERE name = ?", (source,)).fetchone()
+                if row is None:
+                    row = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()
+                    self._conn.execute("INSERT INTO sources VALUES (?, ?)", (source, row[0]))
+            code = self._source_codes[source] = int(row[0])
+        return (code << _ROW_BITS) | int(row_index)
+
+    def lookup(self, keys: List[str]) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for key, digest in self._conn.execute(
+                    f"SELECT key, content_hash FROM records WHERE key IN ({marks})", chunk
+                ):
+                    out[key] = digest
+        return out
+
+    def commit(self, rows: List[tuple]) -> List[str]:
+        """Record (key, content_hash, point_id) rows; return point ids that are no longer referenced."""
+        now = time.time()
+        with self._lock, self._conn:
+            marks = ",".join("?" * len(rows))
+            previous = [
+                r[0] for r in self._conn.execute(
+                    f"SELECT point_id FROM records WHERE key IN ({marks})", [r[0] for r in rows]
+                )
+            ]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)", [(*r, now) for r in rows]
+            )
+            orphans = []
+            for pid in set(previous) - {r[2] for r in rows}:
+                (refs,) = self._conn.execute("SELECT COUNT(*) FROM records WHERE point_id = ?", (pid,)).fetchone()
+                if refs == 0:
+                    orphans.append(pid)
+        return orphans
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class IngestSink:
+    """Side index fed by the pipeline (BM25, skill index, ...).
+
+    add() receives rows that were (re)written to the vector store, keep() rows
+    that were skipped as unchanged, so a sink that is missing them (first run
+    or lost state) can catch up without re-embedding. Calls are serialized by
+    the pipeline; close() runs once at the end to persist.
+    """
+
+    def add(self, records: List[IngestRecord]) -> None:
+        pass
+
+    def keep(self, records: List[IngestRecord]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class IngestionPipeline:
+    """Streams records into a vector store in parallel, idempotent batches.
+
+    - point ids are derived from the content hash, so re-running never duplicates
+    - batches are embedded + upserted by a bounded worker pool
+    - with incremental=True, records whose content hash is unchanged are skipped
+    - with a redactor, PII is removed once here, before the text reaches the
+      vector store or any sink
+    - with payload_text=False the full text is still embedded, but the vector
+      payload only keeps a preview (the text lives in the DocStore sink)
+    """
+
+    def __init__(
+        self,
+        vectorstore: VectorStore,
+        manifest: IngestManifest,
+        batch_size: int = 64,
+        workers: int = 4,
+        incremental: bool = True,
+        sinks: Optional[List[IngestSink]] = None,
+        redactor: Optional[Callable[[IngestRecord], IngestRecord]] = None,
+        payload_text: bool = True,
+    ):
+        self.vectorstore = vectorstore
+        self.manifest = manifest
+        self.batch_size = batch_size
+        self.workers = workers
+        self.incremental = incremental
+        self.sinks = sinks or []
+        self.redactor = redactor
+        self.payload_text = payload_text
+        self._sink_lock = threading.Lock()
+
+    def run(self, records: Iterable[IngestRecord]) -> IngestStats:
+        stats = IngestStats()
+        started = time.perf_counter()
+        in_flight: Set[Future] = set()
+        # Bound the number of queued batches so memory stays flat on big sources.
+        max_in_flight = self.workers * 2
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ingest") as pool:
+                for batch in self._pending_batches(records, stats):
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        self._collect(done, stats)
+                    in_flight.add(pool.submit(self._write_batch, batch))
+                done, _ = wait(in_flight)
+                self._collect(done, stats)
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+        stats.seconds = round(time.perf_counter() - started, 3)
+        logger.info("Ingestion finished: %s", stats)
+        return stats
+
+    def _pending_batches(self, records: Iterable[IngestRecord], stats: IngestStats) -> Iterator[List[Dict[str, Any]]]:
+        batch: List[Dict[str, Any]] = []
+        window: List[Dict[str, Any]] = []
+
+        def flush_window() -> Iterator[List[Dict[str, Any]]]:
+            nonlocal batch
+            known = self.manifest.lookup([w["key"] for w in window]) if self.incremental else {}
+            kept = [item["record"] for item in window if known.get(item["key"]) == item["hash"]]
+            if kept:
+                stats.unchanged += len(kept)
+                self._notify("keep", kept)
+            for item in window:
+                if known.get(item["key"]) == item["hash"]:
+                    continue
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+            window.clear()
+
+        for rec in records:
+            stats.seen += 1
+            if not rec.text.strip():
+                stats.skipped_empty += 1
+                continue
+            # hash the source text, so a changed PII value still re-ingests the row
+            digest = content_hash(rec.text, rec.category, "redacted" if self.redactor else "")
+            rec = replace(rec, doc_id=self.manifest.doc_id(rec.source, rec.row_index))
+            if self.redactor is not None:
+                rec = self.redactor(rec)
+            window.append({"key": rec.key, "hash": digest, "id": point_id(digest), "record": rec})
+            if len(window) >= self.batch_size:
+                yield from flush_window()
+        yield from flush_window()
+        if batch:
+            yield batch
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> Dict[str, int]:
+        texts, metadatas, ids = [], [], []
+        for item in batch:
+            rec: IngestRecord = item["record"]
+            texts.append(rec.text)
+            metadatas.append({
+                "doc_id": rec.doc_id,
+                "row_index": rec.row_index,
+                **filter_fields(rec.text, rec.category),
+                "source": rec.source,
+                "content_hash": item["hash"],
+                "pii_redacted": self.redactor is not None,
+                "preview": rec.text[:400],
+            })
+            ids.append(item["id"])
+
+        if self.payload_text:
+            self.vectorstore.add_texts(texts, metadatas, ids=ids)
+        else:
+            from agent_humancapital.vectorstore import upsert_vectors
+
+            vectors = self.vectorstore.embeddings.embed_documents(texts)
+            upsert_vectors(self.vectorstore, vectors, [m.pop("preview") for m in metadatas], metadatas, ids)
+        orphans = self.manifest.commit([(item["key"], item["hash"], item["id"]) for item in batch])
+        if orphans:
+            self.vectorstore.delete(ids=orphans)
+        self._notify("add", [item["record"] for item in batch])
+        return {"upserted": len(batch), "deleted": len(orphans)}
+
+    def _notify(self, method: str, records: List[IngestRecord]) -> None:
+        if not self.sinks:
+            return
+        with self._sink_lock:
+            for sink in self.sinks:
+                getattr(sink, method)(records)
+
+    def _collect(self, done: Iterable[Future], stats: IngestStats) -> None:
+        for fut in done:
+            try:
+                out = fut.result()
+            except Exception as e:
+                # Not checkpointed, so the next run picks these rows up again.
+                stats.failed_batches += 1
+                stats.errors.append(str(e))
+                logger.exception("Ingestion batch failed")
+                continue
+            stats.upserted += out["upserted"]
+            stats.deleted += out["deleted"]
+
+
+def ensure_qdrant_collection(client: Any, name: str, dim: int, recreate: bool = False) -> bool:
+    """Create the Qdrant collection if missing (or drop and recreate it); returns True when created."""
+    from qdrant_client.models import Distance, VectorParams
+
+    if client.collection_exists(name):
+        if not recreate:
+            return False
+        logger.info("Dropping collection=%s", name)
+        client.delete_collection(collection_name=name)
+    logger.info("Creating collection=%s dim=%s", name, dim)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
+    )
+    return True
+
+
+def ensure_payload_indexes(client: Any, name: str, prefix: str = "metadata.") -> List[str]:
+    """Create Qdrant payload indexes for the filterable fields; returns the ones created."""
+    from qdrant_client.models import PayloadSchemaType
+
+    existing = set((client.get_collection(name).payload_schema or {}).keys())
+    created = []
+    for field_name, schema in FILTER_FIELDS.items():
+        key = f"{prefix}{field_name}"
+        if key in existing:
+            continue
+        client.create_payload_index(collection_name=name, field_name=key, field_schema=PayloadSchemaType(schema))
+        created.append(key)
+    if created:
+        logger.info("Created payload indexes on %s: %s", name, created)
+    return created
+
+
+def delete_legacy_points(client: Any, name: str, prefix: str = "metadata.") -> int:
+    """Delete points written before ids were derived from the content hash; returns how many.
+
+    Those points (random uuid4 ids) carry no content_hash in their payload and
+    are never replaced by a re-ingest, so each resume would be stored twice.
+    """
+    from qdrant_client import models
+
+    legacy = models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key=f"{prefix}content_hash"))])
+    count = client.count(collection_name=name, count_filter=legacy, exact=True).count
+    if count:
+        logger.info("Deleting %d legacy points from %s", count, name)
+        client.delete(collection_name=name, points_selector=models.FilterSelector(filter=legacy))
+    return count
+
+
+def bump_index_version(index_dir: str) -> str:
+    """Mark the collection as changed; response caches keyed on the version go stale."""
+    os.makedirs(index_dir, exist_ok=True)
+    version = uuid.uuid4().hex
+    tmp = os.path.join(index_dir, "VERSION.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(index_dir, "VERSION"))
+    return version
+
+
+def read_index_version(index_dir: str) -> str:
+    try:
+        with open(os.path.join(index_dir, "VERSION"), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def default_manifest_path(collection: str, root: Optional[str] = None) -> str:
+    return os.path.join(root or ".agent_data/ingest", f"{collection}.manifest.sqlite")
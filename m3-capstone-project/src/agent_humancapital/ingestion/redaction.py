@@ -0,0 +1,88 @@
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agent_humancapital.ingestion.pipeline import IngestRecord
+
+# A PII span in redacted-text coordinates: (rule, start, end, original value).
+# text[start:end] of the redacted text is the placeholder that replaced it.
+PIISpan = Tuple[str, int, int, str]
+
+
+def redact_record(rec: IngestRecord, scanner: Any) -> IngestRecord:
+    """Return a copy of `rec` with PII replaced and the original values kept in `pii`."""
+    result = scanner.scan(rec.text)
+    replacements = {r.name: r.replacement or "[REDACTED]" for r in scanner.rules.values()}
+    spans: List[PIISpan] = []
+    shift = 0
+    for f in result.of_kind("pii"):
+        placeholder = replacements[f.rule]
+        start = f.start + shift
+        spans.append((f.rule, start, start + len(placeholder), f.text))
+        shift += len(placeholder) - (f.end - f.start)
+    return replace(rec, text=result.text, pii=spans)
+
+
+def restore_pii(text: str, spans: Iterable[PIISpan], limit: Optional[int] = None) -> str:
+    """Put the original values back into (a prefix of) a redacted text."""
+    limit = len(text) if limit is None else limit
+    out, last = [], 0
+    for _, start, end, value in sorted(spans, key=lambda s: s[1]):
+        if end > limit:
+            break
+        out.append(text[last:start])
+        out.append(value)
+        last = end
+    out.append(text[last:limit])
+    return "".join(out)
+
+
+class PIISpanIndex:
+    """SQLite map doc_id -> PII spans, for roles allowed to see raw values."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS spans (row_index INTEGER PRIMARY KEY, spans TEXT NOT NULL)")
+
+    def put(self, rows: List[Tuple[int, List[PIISpan]]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO spans VALUES (?, ?)",
+                [(int(r), json.dumps(s)) for r, s in rows],
+            )
+
+    def get(self, row_index: int) -> List[PIISpan]:
+        with self._lock:
+            row = self._conn.execute("SELECT spans FROM spans WHERE row_index = ?", (int(row_index),)).fetchone()
+        return [tuple(s) for s in json.loads(row[0])] if row else []
+
+    def __contains__(self, row_index: int) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM spans WHERE row_index = ?", (int(row_index),)).fetchone() is not None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def pii_index_path(index_dir: str) -> str:
+    return os.path.join(index_dir, "pii", "spans.sqlite")
+
+
+_OPEN: Dict[str, PIISpanIndex] = {}
+
+
+def open_pii_index(index_dir: str) -> Optional[PIISpanIndex]:
+    path = pii_index_path(index_dir)
+    if path not in _OPEN:
+        if not os.path.exists(path):
+            return None
+        _OPEN[path] = PIISpanIndex(path)
+    return _OPEN[path]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+import logging
+import os
+from typing import Container, Dict, List
+
+import numpy as np
+
+from agent_humancapital.docstore import DocStore
+from agent_humancapital.filters import years_experience
+from agent_humancapital.ingestion.pipeline import IngestRecord, IngestSink, content_hash
+from agent_humancapital.ingestion.redaction import PIISpanIndex, pii_index_path
+from agent_humancapital.lexical_index import BM25Builder, BM25Index
+from agent_humancapital.skill_index import SkillIndex
+from agent_humancapital.tools.skill_tools import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+class _ContentHashes:
+    """doc_id -> content hash of what a sink indexed, saved as hashes.npz in its directory.
+
+    `stale` picks the kept rows a sink must re-index: rows it never saw and
+    rows whose text changed without the sink being saved (a run that stopped
+    after the vector store and manifest were committed).
+    """
+
+    def __init__(self, path: str, load: bool = True):
+        self.path = path
+        self._hashes: Dict[int, str] = {}
+        file = os.path.join(path, "hashes.npz")
+        if load and os.path.exists(file):
+            with np.load(file) as data:
+                self._hashes = {int(d): h.decode("ascii") for d, h in zip(data["doc_ids"], data["hashes"])}
+
+    def stale(self, records: List[IngestRecord], indexed: Container[int]) -> List[IngestRecord]:
+        return [
+            r for r in records
+            if r.doc_id not in indexed or self._hashes.get(r.doc_id) != content_hash(r.text, r.category)
+        ]
+
+    def update(self, records: List[IngestRecord]) -> None:
+        for r in records:
+            self._hashes[r.doc_id] = content_hash(r.text, r.category)
+
+    def save(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        tmp = os.path.join(self.path, "hashes.tmp.npz")
+        np.savez(
+            tmp,
+            doc_ids=np.array(list(self._hashes), dtype=np.int64),
+            hashes=np.array(list(self._hashes.values()), dtype="S64"),
+        )
+        os.replace(tmp, os.path.join(self.path, "hashes.npz"))
+
+
+class BM25Sink(IngestSink):
+    """Keeps the BM25 index in INDEX_DIR/bm25 in step with the vector store."""
+
+    def __init__(self, index_dir: str, rebuild: bool = False):
+        self.path = os.path.join(index_dir, "bm25")
+        load = not rebuild and os.path.exists(os.path.join(self.path, "bm25.npz"))
+        self.builder = BM25Index.load(self.path).to_builder() if load else BM25Builder()
+        self.hashes = _ContentHashes(self.path, load=load)
+        self._dirty = False
+
+    def add(self, records: List[IngestRecord]) -> None:
+        for rec in records:
+            self.builder.add(rec.doc_id, rec.text, rec.category, years=years_experience(rec.text))
+        self.hashes.update(records)
+        self._dirty = True
+
+    def keep(self, records: List[IngestRecord]) -> None:
+        stale = self.hashes.stale(records, self.builder)
+        if stale:
+            self.add(stale)
+
+    def close(self) -> None:
+        if not self._dirty:
+            return
+        # index first: hashes saved without it would hide a stale row
+        self.builder.build().save(self.path)
+        self.hashes.save()
+        logger.info("BM25 index saved to %s (%d docs)", self.path, len(self.builder))
+
+
+class SkillIndexSink(IngestSink):
+    """Extracts skills at ingest time into the bitset index in INDEX_DIR/skills.
+
+    If the taxonomy changed since the index was written, the index starts
+    empty and unchanged rows are back-filled through `keep`, which also
+    re-extracts rows whose text changed since the index was saved.
+    """
+
+    def __init__(self, index_dir: str, rebuild: bool = False, taxonomy=None):
+        self.path = os.path.join(index_dir, "skills")
+        self.taxonomy = taxonomy or get_taxonomy()
+        index = None
+        if not rebuild and os.path.exists(os.path.join(self.path, "skills.npz")):
+            index = SkillIndex.load(self.path)
+            if index.skills != self.taxonomy.skills:
+                logger.info("Skill taxonomy changed; rebuilding %s", self.path)
+                index = None
+        self.hashes = _ContentHashes(self.path, load=index is not None)
+        self.index = index or SkillIndex(self.taxonomy.skills)
+        self._dirty = False
+
+    def add(self, records: List[IngestRecord]) -> None:
+        skills = self.taxonomy.extract_batch([r.text for r in records])
+        for rec, found in zip(records, skills):
+            self.index.upsert(rec.doc_id, rec.category, found)
+        self.hashes.update(records)
+        self._dirty = True
+
+    def keep(self, records: List[IngestRecord]) -> None:
+        stale = self.hashes.stale(records, self.index)
+        if stale:
+            self.add(stale)
+
+    def close(self) -> None:
+        if not self._dirty:
+            return
+        self.index.save(self.path)
+        self.hashes.save()
+        logger.info("Skill index saved to %s (%d candidates)", self.path, len(self.index))
+
+
+class DocStoreSink(IngestSink):
+    """Writes the (redacted) full texts to the memory-mapped store in INDEX_DIR/docs."""
+
+    def __init__(self, index_dir: str, rebuild: bool = False):
+        self.path = os.path.join(index_dir, "docs")
+        exists = os.path.exists(os.path.join(self.path, "docs.npz"))
+        self.store = DocStore.load(self.path) if exists and not rebuild else DocStore(self.path)
+        self._dirty = False
+
+    def add(self, records: List[IngestRecord]) -> None:
+        self.store.put((r.doc_id, r.text, r.category) for r in records)
+        self._dirty = True
+
+    def keep(self, records: List[IngestRecord]) -> None:
+        # also rewrites rows whose stored text is stale (e.g. a run that stopped
+        # after the vector store was updated but before the store was saved)
+        stale = [r for r in records if self.store.text(r.doc_id) != r.text]
+        if stale:
+            self.add(stale)
+
+    def close(self) -> None:
+        if not self._dirty:
+            return
+        self.store.save()
+        logger.info("Doc store saved to %s (%d docs)", self.path, len(self.store))
+
+
+class PIISpanSink(IngestSink):
+    """Stores the PII removed by the pipeline's redactor, keyed by doc_id.
+
+    Only roles allowed to view PII read it back (see governance_tools.reveal_pii).
+    """
+
+    def __init__(self, index_dir: str):
+        self.index = PIISpanIndex(pii_index_path(index_dir))
+
+    def add(self, records: List[IngestRecord]) -> None:
+        # empty span lists are stored too, so an edited row drops stale values
+        self.index.put([(r.doc_id, r.pii) for r in records])
+
+    def keep(self, records: List[IngestRecord]) -> None:
+        missing = [r for r in records if r.doc_id not in self.index]
+        if missing:
+            self.add(missing)
+
+    def close(self) -> None:
+        self.index.close()
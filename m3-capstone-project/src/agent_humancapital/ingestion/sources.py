@@ -0,0 +1,174 @@
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import math
+import os
+from typing import Any, Dict, Iterator, List, Sequence
+
+import pandas as pd
+
+from agent_humancapital.ingestion.pipeline import IngestRecord
+
+logger = logging.getLogger(__name__)
+
+ROW_INDEX_COL = "__row_index"
+DEFAULT_CACHE_DIR = ".agent_data/cache/sources"
+
+# column name -> values for one record batch
+Batch = Dict[str, List[Any]]
+
+
+def iter_records(
+    path: str,
+    text_col: str = "Resume_str",
+    cat_col: str = "Category",
+    batch_size: int = 1024,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+) -> Iterator[IngestRecord]:
+    source = os.path.basename(path)
+    for batch in iter_column_batches(path, [text_col, cat_col], batch_size=batch_size, cache_dir=cache_dir):
+        for row_index, text, category in zip(batch[ROW_INDEX_COL], batch[text_col], batch[cat_col]):
+            yield IngestRecord(
+                row_index=int(row_index),
+                text=_as_str(text),
+                category=_as_str(category) or "Unknown",
+                source=source,
+            )
+
+
+def iter_column_batches(
+    path: str,
+    columns: Sequence[str],
+    batch_size: int = 1024,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+) -> Iterator[Batch]:
+    """Stream only `columns` (plus the source row index) from xlsx/csv/jsonl/parquet."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xls"):
+        path = excel_to_columnar(path, cache_dir)
+        ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".parquet":
+        yield from _parquet_batches(path, columns, batch_size)
+    elif ext == ".csv":
+        yield from _csv_batches(path, columns, batch_size)
+    elif ext in (".jsonl", ".ndjson"):
+        yield from _jsonl_batches(path, columns, batch_size)
+    else:
+        raise ValueError(f"Unsupported dataset format: {path}")
+
+
+def excel_to_columnar(path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Convert an Excel workbook once and return the cached Parquet (or CSV) path.
+
+    The cache is reused while the source mtime/size match; if only the mtime
+    changed (e.g. a fresh copy of the same file) the content hash is compared
+    before converting again.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    fmt = "parquet" if _has_pyarrow() else "csv"
+    target = os.path.join(cache_dir, f"{stem}.{fmt}")
+    sidecar = target + ".json"
+
+    st = os.stat(path)
+    stamp = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    cached: Dict[str, Any] = {}
+    if os.path.exists(sidecar) and os.path.exists(target):
+        with open(sidecar, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if all(cached.get(k) == v for k, v in stamp.items()):
+            return target
+
+    digest = _file_sha256(path)
+    if cached.get("sha256") == digest:
+        _write_json(sidecar, {**stamp, "sha256": digest})
+        return target
+
+    logger.info("Converting %s -> %s", path, target)
+    df = pd.read_excel(path)
+    df.insert(0, ROW_INDEX_COL, range(len(df)))
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].map(_as_str)
+    tmp = target + ".tmp"
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, target)
+    _write_json(sidecar, {**stamp, "sha256": digest})
+    return target
+
+
+def _parquet_batches(path: str, columns: Sequence[str], batch_size: int) -> Iterator[Batch]:
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    has_index = ROW_INDEX_COL in pf.schema_arrow.names
+    wanted = ([ROW_INDEX_COL] if has_index else []) + list(columns)
+    start = 0
+    for rb in pf.iter_batches(batch_size=batch_size, columns=wanted):
+        batch = rb.to_pydict()
+        if not has_index:
+            batch[ROW_INDEX_COL] = list(range(start, start + rb.num_rows))
+        start += rb.num_rows
+        yield batch
+
+
+def _csv_batches(path: str, columns: Sequence[str], batch_size: int) -> Iterator[Batch]:
+    header = pd.read_csv(path, nrows=0).columns
+    has_index = ROW_INDEX_COL in header
+    usecols = ([ROW_INDEX_COL] if has_index else []) + list(columns)
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=batch_size, dtype=str, keep_default_na=False):
+        batch = {c: chunk[c].tolist() for c in columns}
+        batch[ROW_INDEX_COL] = chunk[ROW_INDEX_COL].tolist() if has_index else chunk.index.tolist()
+        yield batch
+
+
+def _jsonl_batches(path: str, columns: Sequence[str], batch_size: int) -> Iterator[Batch]:
+    def empty() -> Batch:
+        return {c: [] for c in [ROW_INDEX_COL, *columns]}
+
+    batch = empty()
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f):
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            batch[ROW_INDEX_COL].append(obj.get(ROW_INDEX_COL, n))
+            for c in columns:
+                batch[c].append(obj.get(c))
+            if len(batch[ROW_INDEX_COL]) >= batch_size:
+                yield batch
+                batch = empty()
+    if batch[ROW_INDEX_COL]:
+        yield batch
+
+
+def _as_str(v: Any) -> str:
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return ""
+    return str(v)
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _file_sha256(path: str, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_json(path: str, obj: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was were will with".split()
+)
+PREVIEW_CHARS = 400
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over array-backed postings.
+
+    Postings for term t are docs[offsets[t]:offsets[t+1]] / tfs[...], where docs
+    are positions into doc_ids (the ingest doc_id). Category and a short
+    preview are stored per document so keyword hits can be shown without a
+    vector store round-trip; category and years of experience also serve as
+    filter columns (see `column` and `search(mask=...)`).
+    """
+
+    def __init__(
+        self,
+        vocab: Dict[str, int],
+        offsets: np.ndarray,
+        docs: np.ndarray,
+        tfs: np.ndarray,
+        doc_ids: np.ndarray,
+        doc_len: np.ndarray,
+        categories: List[str],
+        previews: List[str],
+        k1: float = 1.5,
+        b: float = 0.75,
+        doc_years: Optional[np.ndarray] = None,
+    ):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.docs = docs
+        self.tfs = tfs
+        self.doc_ids = doc_ids
+        self.doc_len = doc_len
+        self.categories = categories
+        self.previews = previews
+        # NaN = unknown
+        self.doc_years = doc_years if doc_years is not None else np.full(len(doc_ids), np.nan, dtype=np.float32)
+        self.k1 = k1
+        self.b = b
+        self.avgdl = float(doc_len.mean()) if len(doc_len) else 0.0
+
+    def __len__(self) -> int:
+        return int(self.doc_ids.shape[0])
+
+    def idf(self, term: str) -> float:
+        tid = self.vocab.get(term)
+        if tid is None:
+            return 0.0
+        df = int(self.offsets[tid + 1] - self.offsets[tid])
+        return math.log(1.0 + (len(self) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10, mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Return [(row_index, score)] for the top-k documents (only rows where `mask` is True)."""
+        if not len(self):
+            return []
+        scores = np.zeros(len(self), dtype=np.float32)
+        norm = self.k1 * (1.0 - self.b + self.b * self.doc_len / max(self.avgdl, 1e-9))
+        for term in set(tokenize(query)):
+            tid = self.vocab.get(term)
+            if tid is None:
+                continue
+            lo, hi = self.offsets[tid], self.offsets[tid + 1]
+            docs, tf = self.docs[lo:hi], self.tfs[lo:hi].astype(np.float32)
+            scores[docs] += self.idf(term) * tf * (self.k1 + 1.0) / (tf + norm[docs])
+        if mask is not None:
+            scores[~mask] = 0.0
+
+        k = max(1, k)
+        hit = np.flatnonzero(scores)
+        if hit.shape[0] > k:
+            hit = hit[np.argpartition(-scores[hit], k - 1)[:k]]
+        hit = hit[np.argsort(-scores[hit], kind="stable")]
+        return [(int(self.doc_ids[i]), float(scores[i])) for i in hit]
+
+    def document(self, row_index: int) -> Dict[str, Any]:
+        pos = self._position().get(int(row_index))
+        if pos is None:
+            return {}
+        return {"category": self.categories[pos], "preview": self.previews[pos]}
+
+    def column(self, name: str) -> np.ndarray:
+        """Per-document filter column, aligned with doc_ids (see filters.SearchFilter.mask)."""
+        if name == "category":
+            if not hasattr(self, "_cat_column"):
+                self._cat_column = np.array(self.categories, dtype=object)
+            return self._cat_column
+        if name == "years_experience":
+            return self.doc_years
+        raise KeyError(name)
+
+    def _position(self) -> Dict[int, int]:
+        if not hasattr(self, "_pos"):
+            self._pos = {int(d): i for i, d in enumerate(self.doc_ids)}
+        return self._pos
+
+    # ---- persistence ---------------------------------------------------
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        blob, blob_offsets = _pack_strings(self.previews)
+        tmp = os.path.join(path, "bm25.tmp.npz")
+        np.savez(
+            tmp,
+            offsets=self.offsets,
+            docs=self.docs,
+            tfs=self.tfs,
+            doc_ids=self.doc_ids,
+            doc_len=self.doc_len,
+            doc_years=self.doc_years,
+            preview_blob=blob,
+            preview_offsets=blob_offsets,
+        )
+        os.replace(tmp, os.path.join(path, "bm25.npz"))
+        with open(os.path.join(path, "bm25.json"), "w", encoding="utf-8") as f:
+            terms = sorted(self.vocab, key=self.vocab.get)
+            json.dump({"terms": terms, "categories": self.categories, "k1": self.k1, "b": self.b}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(os.path.join(path, "bm25.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with np.load(os.path.join(path, "bm25.npz")) as data:
+            arrays = {name: data[name] for name in data.files}
+        return cls(
+            vocab={t: i for i, t in enumerate(meta["terms"])},
+            offsets=arrays["offsets"],
+            docs=arrays["docs"],
+            tfs=arrays["tfs"],
+            doc_ids=arrays["doc_ids"],
+            doc_len=arrays["doc_len"],
+            categories=meta["categories"],
+            previews=_unpack_strings(arrays["preview_blob"], arrays["preview_offsets"]),
+            k1=meta.get("k1", 1.5),
+            b=meta.get("b", 0.75),
+            doc_years=arrays.get("doc_years"),  # absent in indexes built before filters
+        )
+
+    def to_builder(self) -> "BM25Builder":
+        builder = BM25Builder(k1=self.k1, b=self.b)
+        terms = sorted(self.vocab, key=self.vocab.get)
+        term_of_posting = np.repeat(np.arange(len(terms)), np.diff(self.offsets))
+        order = np.argsort(self.docs, kind="stable")
+        bounds = np.searchsorted(self.docs[order], np.arange(len(self) + 1))
+        for pos, row_index in enumerate(self.doc_ids):
+            sel = order[bounds[pos]:bounds[pos + 1]]
+            counts = {terms[t]: int(tf) for t, tf in zip(term_of_posting[sel], self.tfs[sel])}
+            builder._docs[int(row_index)] = (
+                counts, int(self.doc_len[pos]), self.categories[pos], self.previews[pos], float(self.doc_years[pos]),
+            )
+        return builder
+
+
+class BM25Builder:
+    """Mutable document set that compiles into a BM25Index."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[int, Tuple[Dict[str, int], int, str, str, float]] = {}
+
+    def __contains__(self, row_index: int) -> bool:
+        return int(row_index) in self._docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(
+        self, row_index: int, text: str, category: str = "", preview: Optional[str] = None, years: Optional[int] = None
+    ) -> None:
+        tokens = tokenize(text)
+        preview = text[:PREVIEW_CHARS] if preview is None else preview
+        self._docs[int(row_index)] = (
+            dict(Counter(tokens)), len(tokens), category, preview, np.nan if years is None else float(years),
+        )
+
+    def remove(self, row_index: int) -> None:
+        self._docs.pop(int(row_index), None)
+
+    def build(self) -> BM25Index:
+        row_ids = sorted(self._docs)
+        vocab: Dict[str, int] = {}
+        postings: Dict[int, List[Tuple[int, int]]] = {}
+        for pos, row_index in enumerate(row_ids):
+            for term, tf in self._docs[row_index][0].items():
+                tid = vocab.setdefault(term, len(vocab))
+                postings.setdefault(tid, []).append((pos, tf))
+
+        sizes = np.array([len(postings[t]) for t in range(len(vocab))], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        flat = [p for t in range(len(vocab)) for p in postings[t]]
+        docs = np.array([p[0] for p in flat], dtype=np.int32)
+        tfs = np.array([min(p[1], 65535) for p in flat], dtype=np.uint16)
+        return BM25Index(
+            vocab=vocab,
+            offsets=offsets,
+            docs=docs,
+            tfs=tfs,
+            doc_ids=np.array(row_ids, dtype=np.int64),
+            doc_len=np.array([self._docs[r][1] for r in row_ids], dtype=np.int32),
+            categories=[self._docs[r][2] for r in row_ids],
+            previews=[self._docs[r][3] for r in row_ids],
+            k1=self.k1,
+            b=self.b,
+            doc_years=np.array([self._docs[r][4] for r in row_ids], dtype=np.float32),
+        )
+
+
+def _pack_strings(items: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in items]
+    offsets = np.concatenate([[0], np.cumsum([len(e) for e in encoded])]).astype(np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    raw = blob.tobytes()
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+# ---- lazy, process-wide loading ------------------------------------------
+_LOADED: Dict[str, Tuple[float, BM25Index]] = {}
+_LOAD_LOCK = threading.Lock()
+
+
+def load_bm25_index(path: str) -> Optional[BM25Index]:
+    """Load (once) the index at `path`; reloads when ingestion rewrote it."""
+    npz = os.path.join(path, "bm25.npz")
+    if not os.path.exists(npz):
+        return None
+    mtime = os.path.getmtime(npz)
+    cached = _LOADED.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with _LOAD_LOCK:
+        cached = _LOADED.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        index = BM25Index.load(path)
+        _LOADED[path] = (mtime, index)
+        logger.info("Loaded BM25 index from %s (%d docs, %d terms)", path, len(index), len(index.vocab))
+        return index
@@ -1,17 +1,73 @@
 from __future__ import annotations
-from langchain_openai import ChatOpenAI
-from langchain_openai import OpenAIEmbeddings
+import hashlib
+import math
+import re
+from typing import TYPE_CHECKING, List
+from langchain_core.embeddings import Embeddings
 from agent_humancapital.config import SETTINGS
+from agent_humancapital.embedding_cache import CachedEmbeddings
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+_WORD = re.compile(r"\w+")
+
+class HashEmbeddings(Embeddings):
+    """Deterministic, offline feature-hashing embeddings (tests, benchmarks, local dev).
+
+    Texts that share words get similar vectors, which is enough to exercise the
+    retrieval path without calling OpenAI.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for word in _WORD.findall((text or "").lower()):
+            h = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
 
 def get_chat_model(temperature: float = 0.2) -> ChatOpenAI:
+    from langchain_openai import ChatOpenAI  # imported on first use: slow, and unused offline
+
+    SETTINGS.require("OPENAI_API_KEY")
     return ChatOpenAI(
         model=SETTINGS.LLM_MODEL,
         api_key=SETTINGS.OPENAI_API_KEY,
         temperature=temperature,
     )
 
-def get_embeddings() -> OpenAIEmbeddings:
-    return OpenAIEmbeddings(
-        model=SETTINGS.EMBEDDING_MODEL,
-        api_key=SETTINGS.OPENAI_API_KEY,
+def embedding_model_name() -> str:
+    if SETTINGS.EMBEDDING_PROVIDER == "hash":
+        return f"hash-{SETTINGS.EMBEDDING_DIM}"
+    return SETTINGS.EMBEDDING_MODEL
+
+def get_embeddings(cached: bool = True) -> Embeddings:
+    if SETTINGS.EMBEDDING_PROVIDER == "hash":
+        embeddings: Embeddings = HashEmbeddings(dim=SETTINGS.EMBEDDING_DIM)
+    else:
+        from langchain_openai import OpenAIEmbeddings
+
+        SETTINGS.require("OPENAI_API_KEY")
+        embeddings = OpenAIEmbeddings(
+            model=SETTINGS.EMBEDDING_MODEL,
+            api_key=SETTINGS.OPENAI_API_KEY,
+        )
+    if not cached:
+        return embeddings
+    return CachedEmbeddings(
+        embeddings,
+        model=embedding_model_name(),
+        memory_size=SETTINGS.EMBEDDING_CACHE_SIZE,
+        disk_path=SETTINGS.EMBEDDING_CACHE_PATH or None,
+        max_disk_rows=SETTINGS.EMBEDDING_CACHE_MAX_DISK_ROWS,
     )
@@ -0,0 +1,485 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from agent_humancapital.filters import FILTER_FIELDS
+
+_BLOCK_ROWS = 65536
+
+
+class LocalVectorStore(VectorStore):
+    """Single-node vector index stored in a directory.
+
+    Layout:
+      meta.json        dim + index settings
+      vectors.f32      row-major, L2-normalized float32 vectors (memory-mapped)
+      ids.txt          one point id per row
+      deleted.txt      ids removed via delete()
+      payloads.jsonl   one {"page_content", "metadata"} object per row
+      ivf.npz          optional IVF coarse quantizer (see build_ivf)
+      ivf_assign.i32   IVF list of every row, appended by add_vectors
+      col.<field>.*    filter columns (filters.FILTER_FIELDS), appended by add_vectors:
+                       numbers as float64 (NaN = unknown), keywords as int32 codes
+                       into col.<field>.json
+
+    Files are append-only; re-adding an id appends a new row and the newest row
+    wins. Scores are cosine similarity, the same as a Qdrant COSINE collection.
+    Searches take an optional `filter` (filters.SearchFilter); it is applied
+    before scoring, over the persisted filter columns (no payload is read), so
+    a filtered search still returns k hits.
+    """
+
+    def __init__(self, path: str, embedding: Embeddings, ann_min_docs: int = 50_000, nprobe: int = 8):
+        self.path = path
+        self._embedding = embedding
+        self.ann_min_docs = ann_min_docs
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # ---- storage -------------------------------------------------------
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self) -> None:
+        meta_path = self._file("meta.json")
+        self.dim: Optional[int] = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f).get("dim")
+
+        self._ids: List[str] = []
+        if os.path.exists(self._file("ids.txt")):
+            with open(self._file("ids.txt"), "r", encoding="utf-8") as f:
+                self._ids = f.read().splitlines()
+
+        # newest row wins for duplicated ids
+        self._row_of: Dict[str, int] = {}
+        for row, pid in enumerate(self._ids):
+            self._row_of[pid] = row
+        if os.path.exists(self._file("deleted.txt")):
+            with open(self._file("deleted.txt"), "r", encoding="utf-8") as f:
+                for line in f:
+                    pid, _, row = line.rstrip("\n").rpartition("\t")
+                    if self._row_of.get(pid) == int(row):
+                        del self._row_of[pid]
+        self._live = np.zeros(len(self._ids), dtype=bool)
+        if self._row_of:
+            self._live[list(self._row_of.values())] = True
+
+        self._offsets = self._payload_offsets()
+        self._vectors: Optional[np.memmap] = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._names: Dict[str, List[str]] = {}
+        self._ivf = self._load_ivf()
+
+    def _payload_offsets(self) -> np.ndarray:
+        path = self._file("payloads.jsonl")
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return np.zeros(1, dtype=np.int64)
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        ends = np.flatnonzero(raw == ord("\n")) + 1
+        return np.concatenate([[0], ends]).astype(np.int64)
+
+    def _matrix(self) -> np.ndarray:
+        if not self._ids or self.dim is None:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        if self._vectors is None or self._vectors.shape[0] != len(self._ids):
+            self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r",
+                                      shape=(len(self._ids), self.dim))
+        return self._vectors
+
+    def _payload(self, row: int) -> Dict[str, Any]:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        with open(self._file("payloads.jsonl"), "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+    def column(self, name: str) -> np.ndarray:
+        """Metadata field `name` for every row (numbers as float with NaN, others as str).
+
+        Filter fields come from their column files; any other field is read
+        from the payloads once.
+        """
+        with self._lock:
+            col = self._columns.get(name)
+            if col is None or col.shape[0] != len(self._ids):
+                if name in FILTER_FIELDS:
+                    col = self._filter_column(name)
+                else:
+                    col = _as_column([m.get("metadata", {}).get(name) for m in self._payloads(0)])
+                self._columns[name] = col
+            return col
+
+    def _payloads(self, start: int) -> Iterator[Dict[str, Any]]:
+        if start >= len(self._ids):
+            return
+        with open(self._file("payloads.jsonl"), "rb") as f:
+            f.seek(int(self._offsets[start]))
+            for _, line in zip(range(start, len(self._ids)), f):
+                yield json.loads(line)
+
+    # ---- filter columns ------------------------------------------------
+    def _column_file(self, name: str) -> Tuple[str, Any]:
+        if FILTER_FIELDS[name] in ("integer", "float"):
+            return self._file(f"col.{name}.f64"), np.float64
+        return self._file(f"col.{name}.i32"), np.int32
+
+    def _filter_column(self, name: str) -> np.ndarray:
+        path, dtype = self._column_file(name)
+        stored = np.fromfile(path, dtype=dtype) if os.path.exists(path) else np.empty(0, dtype=dtype)
+        if stored.shape[0] != len(self._ids):
+            # rows written before the column file existed: read their payloads once, then persist
+            stored = stored[:len(self._ids)]
+            tail = [m.get("metadata", {}).get(name) for m in self._payloads(stored.shape[0])]
+            stored = np.concatenate([stored, self._encode(name, tail)])
+            stored.tofile(path + ".tmp")
+            os.replace(path + ".tmp", path)
+        if dtype is np.float64:
+            return stored
+        return np.array(self._category_names(name), dtype=object)[stored]
+
+    def _encode(self, name: str, values: List[Any]) -> np.ndarray:
+        path, dtype = self._column_file(name)
+        if dtype is np.float64:
+            return _as_column(values, np.float64)
+        names = self._category_names(name)
+        known = len(names)
+        code = {n: i for i, n in enumerate(names)}
+        out = np.empty(len(values), dtype=np.int32)
+        for i, v in enumerate(values):
+            v = "" if v is None else str(v)
+            if v not in code:
+                code[v] = len(names)
+                names.append(v)
+            out[i] = code[v]
+        if len(names) != known:
+            with open(self._file(f"col.{name}.json"), "w", encoding="utf-8") as f:
+                json.dump(names, f, ensure_ascii=False)
+        return out
+
+    def _category_names(self, name: str) -> List[str]:
+        if name not in self._names:
+            self._names[name] = self._read_names(name)
+        return self._names[name]
+
+    def _read_names(self, name: str) -> List[str]:
+        path = self._file(f"col.{name}.json")
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _append_filter_columns(self, first: int, metadatas: List[Dict[str, Any]]) -> None:
+        for name in FILTER_FIELDS:
+            path, dtype = self._column_file(name)
+            rows = os.path.getsize(path) // np.dtype(dtype).itemsize if os.path.exists(path) else 0
+            if rows != first:
+                continue  # behind (rows from before the column existed): caught up on the next read
+            with open(path, "ab") as f:
+                f.write(self._encode(name, [m.get(name) for m in metadatas]).tobytes())
+
+    def _document(self, row: int) -> Document:
+        payload = self._payload(row)
+        return Document(id=self._ids[row], page_content=payload["page_content"], metadata=payload.get("metadata", {}))
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    # ---- VectorStore API -----------------------------------------------
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        vectors = self._embedding.embed_documents(texts)
+        return self.add_vectors(vectors, texts, metadatas, ids=ids)
+
+    def add_vectors(
+        self,
+        vectors: Sequence[Sequence[float]],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        *,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        if not texts:
+            return []
+        ids = [str(i) for i in ids] if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+        mat = _normalize(np.asarray(vectors, dtype=np.float32))
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(mat.shape[1])
+                with open(self._file("meta.json"), "w", encoding="utf-8") as f:
+                    json.dump({"dim": self.dim, "metric": "cosine"}, f)
+            if mat.shape[1] != self.dim:
+                raise ValueError(f"Vector dim {mat.shape[1]} does not match index dim {self.dim}")
+
+            with open(self._file("vectors.f32"), "ab") as f:
+                f.write(mat.tobytes())
+            lines = [
+                json.dumps({"page_content": t, "metadata": m}, ensure_ascii=False) + "\n"
+                for t, m in zip(texts, metadatas)
+            ]
+            with open(self._file("payloads.jsonl"), "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            with open(self._file("ids.txt"), "a", encoding="utf-8") as f:
+                f.writelines(f"{i}\n" for i in ids)
+
+            first = len(self._ids)
+            self._append_filter_columns(first, metadatas)
+            self._ids.extend(ids)
+            self._live = np.concatenate([self._live, np.ones(len(ids), dtype=bool)])
+            for n, pid in enumerate(ids):
+                old = self._row_of.get(pid)
+                if old is not None:
+                    self._live[old] = False
+                self._row_of[pid] = first + n
+            sizes = np.cumsum([len(line.encode("utf-8")) for line in lines])
+            self._offsets = np.concatenate([self._offsets, self._offsets[-1] + sizes])
+            self._vectors = None
+            for name, col in self._columns.items():
+                self._columns[name] = np.concatenate([col, _as_column([m.get(name) for m in metadatas], col.dtype)])
+            if self._ivf is not None:
+                new = self._nearest_lists(mat, 1)[:, 0].astype(np.int32)
+                self._ivf["assign"] = np.concatenate([self._ivf["assign"], new])
+                with open(self._file("ivf_assign.i32"), "ab") as f:
+                    f.write(new.tobytes())
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        with self._lock, open(self._file("deleted.txt"), "a", encoding="utf-8") as f:
+            for pid in ids or []:
+                row = self._row_of.pop(str(pid), None)
+                if row is not None:
+                    self._live[row] = False
+                    f.write(f"{pid}\t{row}\n")
+        return True
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        rows = [self._row_of.get(str(pid)) for pid in ids]
+        return [self._document(row) for row in rows if row is not None]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k=k, **kwargs)
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, offset: int = 0, filter: Any = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.search_batch_by_vectors([embedding], k=k, offset=offset, filter=filter)[0]
+
+    def search_batch_by_vectors(
+        self, embeddings: Sequence[Sequence[float]], k: int = 4, offset: int = 0, filter: Any = None
+    ) -> List[List[Tuple[Document, float]]]:
+        if not self._row_of:
+            return [[] for _ in embeddings]
+        want = k + offset
+        rows, scores = self._rank(embeddings, want, filter)
+        out = []
+        for qrows, qscores in zip(rows, scores):
+            hits = []
+            for row, score in list(zip(qrows, qscores))[offset:want]:
+                hits.append((self._document(int(row)), float(score)))
+            out.append(hits)
+        return out
+
+    def iter_search_by_vector(
+        self, embedding: Sequence[float], k: int, page_size: int, filter: Any = None
+    ) -> Iterator[List[Tuple[Document, float]]]:
+        """Top-k hits for one query in pages of `page_size`, best first.
+
+        The ranking is computed once (k row ids and scores); payloads are only
+        decoded for the page being consumed.
+        """
+        if not self._row_of or k <= 0:
+            return
+        rows, scores = self._rank([embedding], k, filter)
+        rows, scores = rows[0], scores[0]
+        for start in range(0, len(rows), page_size):
+            yield [
+                (self._document(int(row)), float(score))
+                for row, score in zip(rows[start:start + page_size], scores[start:start + page_size])
+            ]
+
+    def _rank(self, embeddings: Sequence[Sequence[float]], want: int, filter: Any) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        queries = _normalize(np.asarray(embeddings, dtype=np.float32))
+        if filter:
+            # score only the rows that pass the filter (exact, selective filters make it cheap)
+            return self._search_rows(queries, np.flatnonzero(self._live & filter.mask(self.column)), want)
+        if self._ivf is not None and len(self) >= self.ann_min_docs:
+            return self._search_ivf(queries, want)
+        return self._search_exact(queries, want)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        path: str = ".agent_data/local_index",
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(path, embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+    # ---- exact search --------------------------------------------------
+    def _search_exact(self, queries: np.ndarray, want: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        mat = self._matrix()
+        best_rows = [np.empty(0, dtype=np.int64) for _ in range(len(queries))]
+        best_scores = [np.empty(0, dtype=np.float32) for _ in range(len(queries))]
+        for start in range(0, mat.shape[0], _BLOCK_ROWS):
+            block = np.asarray(mat[start:start + _BLOCK_ROWS])
+            sims = block @ queries.T  # (rows, n_queries)
+            sims[~self._live[start:start + block.shape[0]]] = -np.inf
+            for qi in range(len(queries)):
+                rows, scores = _top_k(sims[:, qi], want)
+                best_rows[qi] = np.concatenate([best_rows[qi], rows + start])
+                best_scores[qi] = np.concatenate([best_scores[qi], scores])
+        return _finish(best_rows, best_scores, want)
+
+    def _search_rows(self, queries: np.ndarray, rows: np.ndarray, want: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        mat = self._matrix()
+        rows_out, scores_out = [], []
+        sims_all = [np.empty(0, dtype=np.float32)] * len(queries)
+        if rows.shape[0]:
+            sims_all = list((np.asarray(mat[rows]) @ queries.T).T)
+        for sims in sims_all:
+            top, scores = _top_k(sims, want)
+            rows_out.append(rows[top])
+            scores_out.append(scores)
+        return _finish(rows_out, scores_out, want)
+
+    # ---- IVF approximate search ---------------------------------------
+    def build_ivf(self, n_lists: Optional[int] = None, iters: int = 10, sample: int = 100_000, seed: int = 0) -> int:
+        """Train a k-means coarse quantizer and bucket every row by nearest centroid."""
+        mat = self._matrix()
+        if mat.shape[0] == 0:
+            return 0
+        n_lists = n_lists or max(1, int(np.sqrt(mat.shape[0])))
+        rng = np.random.default_rng(seed)
+        pick = rng.choice(mat.shape[0], size=min(sample, mat.shape[0]), replace=False)
+        train = np.asarray(mat[np.sort(pick)])
+        centroids = train[rng.choice(train.shape[0], size=min(n_lists, train.shape[0]), replace=False)].copy()
+        for _ in range(iters):
+            labels = np.argmax(train @ centroids.T, axis=1)
+            for c in range(centroids.shape[0]):
+                members = train[labels == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+
+        with self._lock:
+            self._ivf = {"centroids": centroids, "assign": np.empty(0, dtype=np.int32)}
+            assign = [self._nearest_lists(np.asarray(mat[s:s + _BLOCK_ROWS]), 1)[:, 0]
+                      for s in range(0, mat.shape[0], _BLOCK_ROWS)]
+            self._ivf["assign"] = np.concatenate(assign).astype(np.int32)
+            self.save_ivf()
+        return int(centroids.shape[0])
+
+    def save_ivf(self) -> None:
+        if self._ivf is None:
+            return
+        with self._lock:
+            tmp = self._file("ivf_assign.tmp")
+            self._ivf["assign"].astype(np.int32).tofile(tmp)
+            os.replace(tmp, self._file("ivf_assign.i32"))
+            np.savez(self._file("ivf.npz"), centroids=self._ivf["centroids"])
+
+    def _load_ivf(self) -> Optional[Dict[str, np.ndarray]]:
+        path = self._file("ivf.npz")
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            centroids = data["centroids"]
+            assign = data["assign"] if "assign" in data.files else np.empty(0, dtype=np.int32)
+        if os.path.exists(self._file("ivf_assign.i32")):
+            assign = np.fromfile(self._file("ivf_assign.i32"), dtype=np.int32)
+        self._ivf = {"centroids": centroids, "assign": assign[:len(self._ids)].astype(np.int32)}
+        # rows without an assignment (a writer that crashed between the two
+        # appends, or an index saved before assignments were appended) are
+        # bucketed now instead of dropping the index back to brute force
+        done = len(self._ivf["assign"])
+        if done < len(self._ids):
+            mat = self._matrix()
+            tail = [self._nearest_lists(np.asarray(mat[s:s + _BLOCK_ROWS]), 1)[:, 0]
+                    for s in range(done, mat.shape[0], _BLOCK_ROWS)]
+            self._ivf["assign"] = np.concatenate([self._ivf["assign"], *tail]).astype(np.int32)
+            self.save_ivf()
+        return self._ivf
+
+    def _nearest_lists(self, vectors: np.ndarray, n: int) -> np.ndarray:
+        sims = vectors @ self._ivf["centroids"].T
+        n = min(n, sims.shape[1])
+        return np.argpartition(-sims, n - 1, axis=1)[:, :n]
+
+    def _search_ivf(self, queries: np.ndarray, want: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        mat = self._matrix()
+        lists = self._nearest_lists(queries, self.nprobe)
+        rows_out, scores_out = [], []
+        for q, probe in zip(queries, lists):
+            rows = np.flatnonzero(np.isin(self._ivf["assign"], probe) & self._live)
+            sims = np.asarray(mat[rows]) @ q
+            top, scores = _top_k(sims, want)
+            rows_out.append(rows[top])
+            scores_out.append(scores)
+        return _finish(rows_out, scores_out, want)
+
+
+def _as_column(values: List[Any], dtype: Any = None) -> np.ndarray:
+    if dtype is None:
+        numeric = [v for v in values if v is not None]
+        dtype = np.float64 if numeric and all(isinstance(v, (int, float)) for v in numeric) else object
+    if dtype == np.float64:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array(["" if v is None else str(v) for v in values], dtype=object)
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (mat / norms).astype(np.float32)
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    if scores.shape[0] > k:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(scores.shape[0])
+    keep = np.isfinite(scores[idx])
+    return idx[keep], scores[idx][keep]
+
+
+def _finish(rows: List[np.ndarray], scores: List[np.ndarray], want: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    out_rows, out_scores = [], []
+    for r, s in zip(rows, scores):
+        order = np.argsort(-s, kind="stable")[:want]
+        out_rows.append(r[order])
+        out_scores.append(s[order])
+    return out_rows, out_scores
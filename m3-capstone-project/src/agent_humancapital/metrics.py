@@ -0,0 +1,189 @@
+from __future__ import annotations
+import bisect
+import functools
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from agent_humancapital.config import SETTINGS
+
+# Prometheus-style cumulative bucket bounds, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Latency histogram: cumulative buckets for export plus a ring buffer of
+    recent samples for p50/p95/p99."""
+
+    def __init__(self, reservoir: int = 2048):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._ring = np.zeros(reservoir, dtype=np.float64)
+        self._next = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self._ring[self._next % self._ring.shape[0]] = seconds
+        self._next += 1
+
+    def percentiles(self, qs=(50, 95, 99)) -> Dict[str, float]:
+        n = min(self._next, self._ring.shape[0])
+        if n == 0:
+            return {f"p{q}": 0.0 for q in qs}
+        values = np.percentile(self._ring[:n], qs)
+        return {f"p{q}": round(float(v) * 1000, 3) for q, v in zip(qs, values)}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hists: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None) -> None:
+        key: LabelKey = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._hists.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(seconds)
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """{metric: [{labels, count, sum_ms, p50, p95, p99}]} (milliseconds)."""
+        with self._lock:
+            return {
+                name: [
+                    {"labels": dict(key), "count": h.count, "sum_ms": round(h.sum * 1000, 3), **h.percentiles()}
+                    for key, h in series.items()
+                ]
+                for name, series in self._hists.items()
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._hists.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, h in series.items():
+                    cumulative = 0
+                    for bound, c in zip((*BUCKETS, float("inf")), h.counts):
+                        cumulative += c
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{_labels(key, le=le)} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(key)} {h.sum!r}")
+                    lines.append(f"{name}_count{_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists.clear()
+
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    items = [*key, *extra.items()]
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+METRICS = MetricsRegistry()
+
+
+class span:
+    """Time a block: `with span("hc_tool_seconds", tool="semantic_search") as s: ...`.
+
+    `s.ms` is always available (for tool_traces); the histogram is only
+    updated when METRICS_ENABLED is on.
+    """
+
+    __slots__ = ("name", "labels", "start", "ms")
+
+    def __init__(self, name: str, **labels: str):
+        self.name = name
+        self.labels = labels
+        self.ms = 0.0
+
+    def __enter__(self) -> "span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.ms = round(elapsed * 1000, 2)
+        if SETTINGS.METRICS_ENABLED:
+            METRICS.observe(self.name, elapsed, self.labels)
+
+
+def timed(name: str, **labels: str) -> Callable:
+    """Decorator form of `span`; a flag check is all it costs when disabled."""
+    def wrap(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            if not SETTINGS.METRICS_ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.observe(name, time.perf_counter() - start, labels)
+        return inner
+    return wrap
+
+
+class SamplingProfiler:
+    """Samples thread stacks every `interval` seconds from a helper thread.
+
+    By default every thread is sampled (supervisor workers run on a pool);
+    pass `thread_id` to watch one. Cheap enough to leave on for a fraction of
+    requests (see METRICS_PROFILE_RATE); `top()` returns the frames seen most.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me or (self.thread_id is not None and tid != self.thread_id):
+                    continue
+                seen = set()  # count each function once per sample (recursion)
+                while frame is not None:
+                    code = frame.f_code
+                    seen.add(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples.update(seen)
+
+    def top(self, n: int = 15) -> List[Tuple[str, int]]:
+        return self.samples.most_common(n)
+
+
+def should_profile() -> bool:
+    rate = SETTINGS.METRICS_PROFILE_RATE
+    return rate > 0 and random.random() < rate
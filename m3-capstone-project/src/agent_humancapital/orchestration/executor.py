@@ -0,0 +1,138 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A node receives the results of its dependencies (by name) and a cancel event
+# it may poll during long work.
+NodeFn = Callable[[Dict[str, Any], threading.Event], Any]
+
+
+@dataclass
+class WorkerNode:
+    name: str
+    fn: NodeFn
+    deps: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+
+
+@dataclass
+class NodeOutcome:
+    name: str
+    status: str  # ok | error | timeout | skipped
+    result: Any = None
+    error: Optional[str] = None
+    started: float = 0.0
+    duration_ms: float = 0.0
+
+    def trace(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"worker": self.name, "status": self.status, "duration_ms": self.duration_ms}
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+class DagExecutor:
+    """Runs worker nodes as soon as their dependencies finish.
+
+    Independent nodes run concurrently on a thread pool. A node that exceeds
+    its timeout is marked "timeout" and its cancel event is set; nodes that
+    depend on a failed/timed-out node are "skipped". Python threads cannot be
+    killed, so a timed-out node may keep running in the background until it
+    checks its cancel event, but its result is discarded.
+    """
+
+    def __init__(self, max_workers: int = 4, default_timeout: Optional[float] = None):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+
+    def run(self, nodes: List[WorkerNode]) -> Dict[str, NodeOutcome]:
+        return dict(self.iter_run(nodes))
+
+    def iter_run(self, nodes: List[WorkerNode]) -> Iterator[Tuple[str, NodeOutcome]]:
+        """Yield (name, outcome) pairs in completion order."""
+        by_name = {n.name: n for n in nodes}
+        for n in nodes:
+            missing = [d for d in n.deps if d not in by_name]
+            if missing:
+                raise ValueError(f"Node {n.name!r} depends on unknown nodes {missing}")
+
+        outcomes: Dict[str, NodeOutcome] = {}
+        running: Dict[Future, Tuple[WorkerNode, float, threading.Event]] = {}
+        pending = list(nodes)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="worker")
+        try:
+            while pending or running:
+                # Schedule everything whose dependencies are settled; skipping a
+                # node can settle others, so repeat until nothing changes.
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for node in list(pending):
+                        dep_states = [outcomes[d].status for d in node.deps if d in outcomes]
+                        if len(dep_states) < len(node.deps):
+                            continue
+                        pending.remove(node)
+                        progressed = True
+                        if any(s != "ok" for s in dep_states):
+                            outcomes[node.name] = NodeOutcome(node.name, "skipped", error="dependency failed")
+                            yield node.name, outcomes[node.name]
+                            continue
+                        inputs = {d: outcomes[d].result for d in node.deps}
+                        cancel = threading.Event()
+                        running[pool.submit(node.fn, inputs, cancel)] = (node, time.perf_counter(), cancel)
+
+                if not running:
+                    if pending:
+                        raise ValueError(f"Dependency cycle among {[n.name for n in pending]}")
+                    continue
+
+                done, _ = wait(list(running), timeout=self._next_deadline(running), return_when=FIRST_COMPLETED)
+                now = time.perf_counter()
+                for fut in done:
+                    node, started, _ = running.pop(fut)
+                    outcome = NodeOutcome(node.name, "ok", started=started, duration_ms=_ms(now - started))
+                    try:
+                        outcome.result = fut.result()
+                    except Exception as e:
+                        logger.exception("Worker %s failed", node.name)
+                        outcome.status, outcome.error = "error", f"{type(e).__name__}: {e}"
+                    outcomes[node.name] = outcome
+                    yield node.name, outcome
+
+                for fut, (node, started, cancel) in list(running.items()):
+                    limit = self._timeout(node)
+                    if limit is not None and now - started >= limit:
+                        running.pop(fut)
+                        cancel.set()
+                        fut.cancel()
+                        outcomes[node.name] = NodeOutcome(
+                            node.name, "timeout", error=f"exceeded {limit:.1f}s",
+                            started=started, duration_ms=_ms(now - started),
+                        )
+                        yield node.name, outcomes[node.name]
+        finally:
+            # Don't block on timed-out threads; they were told to stop.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _timeout(self, node: WorkerNode) -> Optional[float]:
+        return node.timeout if node.timeout is not None else self.default_timeout
+
+    def _next_deadline(self, running: Dict[Future, Tuple[WorkerNode, float, threading.Event]]) -> Optional[float]:
+        now = time.perf_counter()
+        remaining = [
+            started + self._timeout(node) - now
+            for node, started, _ in running.values()
+            if self._timeout(node) is not None
+        ]
+        return max(0.0, min(remaining)) if remaining else None
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
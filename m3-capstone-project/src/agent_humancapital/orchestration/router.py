@@ -1,40 +1,181 @@
 from __future__ import annotations
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from agent_humancapital.config import SETTINGS
 from agent_humancapital.orchestration.schemas import RoutedPlan, Intent
 
-def classify_intent(query: str) -> Intent:
-    q = query.lower()
+logger = logging.getLogger(__name__)
+
+# Keyword fast path, in priority order (the first hit is the primary intent).
+# Keywords match whole words/phrases, so "risk" inside a JD or "age" in
+# "manage" no longer pick a branch.
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "GOVERNANCE_CHECK": ["rbac", "akses", "permission", "permissions", "pii", "privacy", "redact", "redaction",
+                         "bias check", "compliance", "compliant", "governance"],
+    "INTERVIEW_PREP": ["interview", "interviews", "pertanyaan", "wawancara", "assessment", "rubric", "kompetensi"],
+    "SKILL_ANALYSIS": ["skill gap", "skill gaps", "gap skill", "kesenjangan", "extract skills", "skill", "skills",
+                       "kompetensi teknis", "trending", "skill trends"],
+    "RANK_AND_MATCH": ["rank", "ranking", "match", "matching", "jd", "job description", "cocok",
+                       "compare candidates", "scoring", "shortlist"],
+    "RETRIEVE_CANDIDATES": ["find", "search", "cari", "resume", "resumes", "candidate", "candidates",
+                            "kandidat", "talent"],
+}
+
+# Example requests per intent; their embedding centroids classify queries
+# that no keyword matches.
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    "RETRIEVE_CANDIDATES": [
+        "looking for a data analyst with tableau experience",
+        "who has worked as a backend engineer in fintech",
+        "show me people with accounting background",
+        "profiles of nurses with icu experience",
+    ],
+    "RANK_AND_MATCH": [
+        "which applicants fit this role best",
+        "order these profiles by fit for the senior engineer opening",
+        "best fit for the position described below",
+        "how well does each applicant suit the vacancy",
+    ],
+    "SKILL_ANALYSIS": [
+        "what technologies are popular among data scientists",
+        "what is missing from this applicant for the role",
+        "which tools do our engineers know",
+        "most common certifications in the hr category",
+    ],
+    "INTERVIEW_PREP": [
+        "prepare questions to ask a java developer",
+        "what should i ask the applicant tomorrow",
+        "evaluation criteria for a sales manager conversation",
+        "behavioral questions for a team lead",
+    ],
+    "GOVERNANCE_CHECK": [
+        "is this hiring decision fair and lawful",
+        "who is allowed to see personal data",
+        "check the answer for discriminatory language",
+        "data protection rules for applicant records",
+    ],
+    "GENERAL_QA": [
+        "hello what can you do",
+        "how does this assistant work",
+        "thank you",
+        "explain the features of this tool",
+    ],
+}
+
+INTENT_WORKERS: Dict[str, List[str]] = {
+    "RETRIEVE_CANDIDATES": ["retrieval"],
+    "RANK_AND_MATCH": ["retrieval", "ranking"],
+    "SKILL_ANALYSIS": ["retrieval", "skill"],
+    "INTERVIEW_PREP": ["retrieval", "interview"],
+    "GOVERNANCE_CHECK": ["governance"],
+    "GENERAL_QA": [],  # supervisor can answer directly
+}
+
+_WORKER_ORDER = ["retrieval", "ranking", "skill", "interview", "governance"]
+
+
+def _compile_keywords() -> re.Pattern:
+    groups = []
+    for i, words in enumerate(INTENT_KEYWORDS.values()):
+        alts = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+        groups.append(f"(?P<i{i}>(?<!\\w)(?:{alts})(?!\\w))")
+    return re.compile("|".join(groups))
+
+
+_KEYWORDS = _compile_keywords()
+_GROUP_INTENT = {f"i{i}": intent for i, intent in enumerate(INTENT_KEYWORDS)}
+
+
+def keyword_intents(query: str) -> List[Intent]:
+    """All intents whose keywords occur in the query, in priority order."""
+    hits = {_GROUP_INTENT[m.lastgroup] for m in _KEYWORDS.finditer(query.lower())}
+    return [i for i in INTENT_KEYWORDS if i in hits]  # type: ignore[misc]
+
 
-    if any(k in q for k in ["rbac", "akses", "permission", "pii", "privacy", "redact", "bias", "compliance", "risk"]):
-        return "GOVERNANCE_CHECK"
+class IntentCentroids:
+    """Nearest-centroid intent classifier over cached embeddings (no LLM call)."""
 
-    if any(k in q for k in ["interview", "questions", "pertanyaan", "assessment", "rubric", "kompetensi"]):
-        return "INTERVIEW_PREP"
+    def __init__(self, embeddings, examples: Dict[str, List[str]] = INTENT_EXAMPLES):
+        self.embeddings = embeddings
+        self.intents = list(examples)
+        texts = [t for ex in examples.values() for t in ex]
+        vecs = _unit(np.asarray(embeddings.embed_documents(texts), dtype=np.float32))
+        bounds = np.cumsum([0] + [len(ex) for ex in examples.values()])
+        self.centroids = _unit(np.stack([vecs[a:b].mean(axis=0) for a, b in zip(bounds[:-1], bounds[1:])]))
 
-    if any(k in q for k in ["skill gap", "gap skill", "kesenjangan", "extract skills", "skills", "kompetensi teknis"]):
-        return "SKILL_ANALYSIS"
+    def classify(self, query: str) -> Tuple[str, float]:
+        q = _unit(np.asarray([self.embeddings.embed_query(query)], dtype=np.float32))[0]
+        sims = self.centroids @ q
+        best = int(np.argmax(sims))
+        return self.intents[best], float(sims[best])
 
-    if any(k in q for k in ["rank", "ranking", "match", "jd", "job description", "cocok", "compare candidates", "scoring"]):
-        return "RANK_AND_MATCH"
 
-    if any(k in q for k in ["find", "search", "cari", "resume", "candidate", "kandidat", "talent"]):
-        return "RETRIEVE_CANDIDATES"
+def _unit(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.where(norms == 0, 1.0, norms)
+
+
+_CENTROIDS: Optional[IntentCentroids] = None
+_CENTROIDS_LOCK = threading.Lock()
+
+
+def _centroids() -> IntentCentroids:
+    global _CENTROIDS
+    if _CENTROIDS is None:
+        with _CENTROIDS_LOCK:
+            if _CENTROIDS is None:
+                from agent_humancapital.resources import get_registry
+
+                _CENTROIDS = IntentCentroids(get_registry().embeddings)
+    return _CENTROIDS
+
+
+def classify_intent(query: str) -> Intent:
+    return route(query).intent
 
-    return "GENERAL_QA"
 
 def route(query: str) -> RoutedPlan:
-    intent = classify_intent(query)
-
-    if intent == "RETRIEVE_CANDIDATES":
-        workers = ["retrieval"]
-    elif intent == "RANK_AND_MATCH":
-        workers = ["retrieval", "ranking"]
-    elif intent == "SKILL_ANALYSIS":
-        workers = ["retrieval", "skill"]
-    elif intent == "INTERVIEW_PREP":
-        workers = ["retrieval", "interview"]
-    elif intent == "GOVERNANCE_CHECK":
-        workers = ["governance"]
-    else:
-        workers = []  # supervisor can answer directly
-
-    return RoutedPlan(intent=intent, workers=workers, notes="rule-based routing")
+    # memoized per normalized query; callers get their own copy
+    try:
+        plan = _route(" ".join(query.lower().split()))
+    except Exception as e:
+        # not memoized (lru_cache doesn't keep exceptions): the next call retries
+        logger.warning("Semantic routing unavailable (%s); answering directly", e)
+        plan = _plan(["GENERAL_QA"], "semantic routing unavailable")
+    return plan.model_copy(deep=True)
+
+
+@lru_cache(maxsize=2048)
+def _route(q: str) -> RoutedPlan:
+    intents = keyword_intents(q)
+    if intents:
+        if len(intents) > 1 and "GOVERNANCE_CHECK" in intents:
+            # governance checks run on every answer anyway; don't let a
+            # passing mention of compliance block the actual request
+            intents.remove("GOVERNANCE_CHECK")
+        if "RETRIEVE_CANDIDATES" in intents and len(intents) > 1:
+            intents.remove("RETRIEVE_CANDIDATES")  # every other worker path retrieves first
+        return _plan(intents, "keyword routing")
+
+    if not SETTINGS.ROUTER_SEMANTIC:
+        return _plan(["GENERAL_QA"], "keyword routing (no match)")
+    intent, score = _centroids().classify(q)
+    if score < SETTINGS.ROUTER_MIN_SIMILARITY:
+        return _plan(["GENERAL_QA"], f"semantic routing: low confidence ({score:.2f})")
+    return _plan([intent], f"semantic routing ({score:.2f})")
+
+
+def _plan(intents: List[str], notes: str) -> RoutedPlan:
+    workers = {w for i in intents for w in INTENT_WORKERS[i]}
+    return RoutedPlan(
+        intent=intents[0],
+        intents=intents,
+        workers=[w for w in _WORKER_ORDER if w in workers],
+        notes=notes,
+    )
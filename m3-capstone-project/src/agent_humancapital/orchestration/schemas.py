@@ -20,11 +20,13 @@ class SupervisorInput(BaseModel):
     query: str
     history: str = ""
     user: UserContext
-    top_k: int = 5  # NEW: UI can control top-k results
+    top_k: int = Field(default=5, ge=1)  # UI can control top-k; above RETRIEVAL_PAGE_SIZE retrieval streams
+    history_tokens: Optional[int] = None  # known token count of `history` (skips re-encoding)
 
 
 class RoutedPlan(BaseModel):
-    intent: Intent
+    intent: Intent  # primary intent
+    intents: List[Intent] = []  # every intent the query asked for
     workers: List[str]
     notes: str = ""
 
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import atexit
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from agent_humancapital.config import SETTINGS, Settings
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.vectorstores import VectorStore
+    from qdrant_client import QdrantClient
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceRegistry:
+    """Process-wide owner of the Qdrant client, embeddings and vector store.
+
+    The vector store comes from the backend named by SETTINGS.VECTOR_BACKEND
+    (see vectorstore.BACKENDS); the Qdrant client is only created when used.
+
+    Everything is built lazily on first use and then reused, so the connection
+    (HTTP keep-alive or gRPC channel) and object setup are paid once per process.
+    The SDKs themselves are imported on first use too.
+    """
+
+    def __init__(self, settings: Settings = SETTINGS):
+        self.settings = settings
+        self._lock = threading.RLock()
+        self._client: Optional[QdrantClient] = None
+        self._embeddings: Optional[Embeddings] = None
+        self._vectorstore: Optional[VectorStore] = None
+
+    @property
+    def client(self) -> QdrantClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from qdrant_client import QdrantClient
+
+                    self.settings.require("QDRANT_URL", "QDRANT_API_KEY")
+                    self._client = QdrantClient(
+                        url=self.settings.QDRANT_URL,
+                        api_key=self.settings.QDRANT_API_KEY,
+                        prefer_grpc=self.settings.QDRANT_PREFER_GRPC,
+                        timeout=self.settings.QDRANT_TIMEOUT,
+                    )
+        return self._client
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    from agent_humancapital.llm import get_embeddings
+
+                    self._embeddings = get_embeddings()
+        return self._embeddings
+
+    @property
+    def vectorstore(self) -> VectorStore:
+        if self._vectorstore is None:
+            with self._lock:
+                if self._vectorstore is None:
+                    from agent_humancapital.vectorstore import create_vectorstore
+
+                    self._vectorstore = create_vectorstore(self)
+        return self._vectorstore
+
+    def warmup(self) -> Dict[str, Any]:
+        # Build everything up front and open the connection so the first user
+        # query does not pay for it.
+        _ = self.vectorstore
+        return self.health()
+
+    def health(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        backend = self.settings.VECTOR_BACKEND
+        out: Dict[str, Any] = {"backend": backend, "error": None}
+        try:
+            if backend == "qdrant":
+                exists = self.client.collection_exists(self.settings.QDRANT_COLLECTION_NAME)
+                out.update(
+                    status="ok" if exists else "missing_collection",
+                    collection=self.settings.QDRANT_COLLECTION_NAME,
+                    grpc=self.settings.QDRANT_PREFER_GRPC,
+                )
+            else:
+                store = self.vectorstore
+                out.update(status="ok", documents=len(store) if hasattr(store, "__len__") else None)
+        except Exception as e:  # connection / auth errors
+            out.update(status="error", error=str(e))
+        out["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                try:
+                    self._client.close()
+                except Exception:
+                    logger.exception("Failed to close Qdrant client")
+            if self._embeddings is not None and hasattr(self._embeddings, "close"):
+                self._embeddings.close()
+            self._client = None
+            self._embeddings = None
+            self._vectorstore = None
+
+
+_REGISTRY: Optional[ResourceRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ResourceRegistry:
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = ResourceRegistry()
+    return _REGISTRY
+
+
+def shutdown_registry() -> None:
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is not None:
+            _REGISTRY.close()
+            _REGISTRY = None
+
+
+atexit.register(shutdown_registry)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from agent_humancapital.config import SETTINGS
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+
+# (normalized query, role, top_k, index version)
+CacheKey = Tuple[str, str, int, str]
+
+
+class ResponseCache:
+    """TTL + LRU cache of full supervisor results.
+
+    Entries are keyed by normalized query, role (RBAC changes the answer),
+    top_k and the index version, so re-ingesting the collection invalidates
+    them without any explicit purge. With `similarity` > 0 and an embedder, a
+    miss falls back to the most similar cached query for the same
+    role/top_k/version if its cosine similarity reaches the threshold.
+    Results are deep-copied in and out so callers can't mutate cached state.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_s: float = 600.0,
+        similarity: float = 0.0,
+        embeddings: Optional[Embeddings] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.similarity = similarity
+        self.embeddings = embeddings
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any], Optional[np.ndarray]]]" = OrderedDict()
+        self.hits = self.near_hits = self.misses = 0
+
+    @staticmethod
+    def key(query: str, role: str, top_k: int, version: str) -> CacheKey:
+        from agent_humancapital.embedding_cache import normalize_text  # keeps langchain_core off the import path
+
+        return (normalize_text(query).lower(), (role or "guest").lower(), int(top_k), version)
+
+    def get(self, key: CacheKey) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Return (result or None, status) where status goes into tool traces."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_s:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1]), {"status": "hit"}
+            if entry is not None:
+                del self._entries[key]
+
+        if self._near_enabled():
+            found = self._nearest(key, now)
+            if found is not None:
+                near_key, score = found
+                with self._lock:
+                    entry = self._entries.get(near_key)
+                    if entry is not None:
+                        self._entries.move_to_end(near_key)
+                        self.near_hits += 1
+                        return copy.deepcopy(entry[1]), {"status": "near_hit", "similarity": round(score, 4), "matched_query": near_key[0]}
+
+        with self._lock:
+            self.misses += 1
+        return None, {"status": "miss"}
+
+    def put(self, key: CacheKey, result: Dict[str, Any]) -> None:
+        vec = self._embed(key[0]) if self._near_enabled() else None
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(result), vec)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "near_hits": self.near_hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _near_enabled(self) -> bool:
+        return self.similarity > 0 and self.embeddings is not None
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            v = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        except Exception:
+            return None
+        n = float(np.linalg.norm(v))
+        return v / n if n else v
+
+    def _nearest(self, key: CacheKey, now: float) -> Optional[Tuple[CacheKey, float]]:
+        with self._lock:
+            candidates: List[Tuple[CacheKey, np.ndarray]] = [
+                (k, e[2]) for k, e in self._entries.items()
+                if k[1:] == key[1:] and e[2] is not None and now - e[0] <= self.ttl_s
+            ]
+        if not candidates:
+            return None
+        q = self._embed(key[0])
+        if q is None:
+            return None
+        sims = np.stack([v for _, v in candidates]) @ q
+        best = int(np.argmax(sims))
+        if sims[best] < self.similarity:
+            return None
+        return candidates[best][0], float(sims[best])
+
+
+_CACHE: Optional[ResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache in front of supervisor_run; None when RESPONSE_CACHE_SIZE=0."""
+    global _CACHE
+    if SETTINGS.RESPONSE_CACHE_SIZE <= 0:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                embeddings = None
+                if SETTINGS.RESPONSE_CACHE_SIMILARITY > 0:
+                    from agent_humancapital.resources import get_registry
+
+                    embeddings = get_registry().embeddings
+                _CACHE = ResponseCache(
+                    max_entries=SETTINGS.RESPONSE_CACHE_SIZE,
+                    ttl_s=SETTINGS.RESPONSE_CACHE_TTL_S,
+                    similarity=SETTINGS.RESPONSE_CACHE_SIMILARITY,
+                    embeddings=embeddings,
+                )
+    return _CACHE
@@ -0,0 +1,222 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from agent_humancapital.filters import category_key
+
+logger = logging.getLogger(__name__)
+
+
+class SkillIndex:
+    """Corpus-wide candidate x skill bitset with per-category trend counts.
+
+    Row i is one candidate (doc_ids[i] = ingest doc_id); column j is
+    skills[j]. Bits are stored packed (np.packbits, 8 skills per byte) and
+    `counts[c, j]` holds how many candidates of category c have skill j, kept
+    up to date on every upsert so trend queries never scan the bitset.
+    """
+
+    def __init__(self, skills: List[str]):
+        self.skills = list(skills)
+        self.column = {s: j for j, s in enumerate(self.skills)}
+        self.categories: List[str] = []
+        self._category_code: Dict[str, int] = {}
+        self._n = 0
+        self._bits = np.zeros((0, self._row_bytes), dtype=np.uint8)
+        self._doc_ids = np.zeros(0, dtype=np.int64)
+        self._cats = np.zeros(0, dtype=np.int32)
+        self._pos: Dict[int, int] = {}
+        self.counts = np.zeros((0, len(self.skills)), dtype=np.int64)
+
+    @property
+    def _row_bytes(self) -> int:
+        return (len(self.skills) + 7) // 8
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, row_index: int) -> bool:
+        return int(row_index) in self._pos
+
+    # ---- updates ---------------------------------------------------------
+    def upsert(self, row_index: int, category: str, skills: Iterable[str]) -> None:
+        row = np.zeros(len(self.skills), dtype=bool)
+        cols = [self.column[s] for s in skills if s in self.column]
+        row[cols] = True
+        code = self._code(category)
+
+        pos = self._pos.get(int(row_index))
+        if pos is None:
+            pos = self._append(int(row_index))
+        else:
+            self._uncount(pos)
+        self._bits[pos] = np.packbits(row)
+        self._cats[pos] = code
+        self.counts[code] += row
+
+    def remove(self, row_index: int) -> None:
+        pos = self._pos.pop(int(row_index), None)
+        if pos is None:
+            return
+        self._uncount(pos)
+        self._bits[pos] = 0
+        self._doc_ids[pos] = -1
+
+    def _code(self, category: str) -> int:
+        category = category or "Unknown"
+        if category not in self._category_code:
+            self._category_code[category] = len(self.categories)
+            self.categories.append(category)
+            self.counts = np.vstack([self.counts, np.zeros((1, len(self.skills)), dtype=np.int64)])
+        return self._category_code[category]
+
+    def _append(self, row_index: int) -> int:
+        if self._n == self._bits.shape[0]:
+            grow = max(1024, self._n)
+            self._bits = np.vstack([self._bits, np.zeros((grow, self._row_bytes), dtype=np.uint8)])
+            self._doc_ids = np.concatenate([self._doc_ids, np.full(grow, -1, dtype=np.int64)])
+            self._cats = np.concatenate([self._cats, np.zeros(grow, dtype=np.int32)])
+        pos = self._n
+        self._n += 1
+        self._doc_ids[pos] = row_index
+        self._pos[row_index] = pos
+        return pos
+
+    def _uncount(self, pos: int) -> None:
+        self.counts[self._cats[pos]] -= self._unpack(pos)
+
+    def _unpack(self, pos: int) -> np.ndarray:
+        return np.unpackbits(self._bits[pos])[:len(self.skills)].astype(np.int64)
+
+    # ---- queries -----------------------------------------------------------
+    def skills_of(self, row_index: int) -> List[str]:
+        pos = self._pos.get(int(row_index))
+        if pos is None:
+            return []
+        return [self.skills[j] for j in np.flatnonzero(self._unpack(pos))]
+
+    def trends(self, category: Optional[str] = None, top: int = 20) -> Dict[str, Any]:
+        if category is None:
+            counts = self.counts.sum(axis=0)
+            total = len(self)
+        else:
+            code = self._find_category(category)
+            if code is None:
+                return {"category": category, "candidates": 0, "top_skills": []}
+            counts = self.counts[code]
+            total = int(np.count_nonzero((self._cats[:self._n] == code) & (self._doc_ids[:self._n] >= 0)))
+        order = np.argsort(-counts, kind="stable")[:top]
+        return {
+            "category": category,
+            "candidates": total,
+            "top_skills": [(self.skills[j], int(counts[j])) for j in order if counts[j] > 0],
+        }
+
+    def gap(self, jd_skills: List[str], category: Optional[str] = None, top_n: int = 10) -> Dict[str, Any]:
+        """Match every candidate against the JD skills at once."""
+        required = [s for s in dict.fromkeys(jd_skills) if s in self.column]
+        unknown = [s for s in dict.fromkeys(jd_skills) if s not in self.column]
+        live = self._doc_ids[:self._n] >= 0
+        if category is not None:
+            code = self._find_category(category)
+            live &= (self._cats[:self._n] == code) if code is not None else False
+        rows = np.flatnonzero(live)
+        if not required or rows.shape[0] == 0:
+            return {"required": required, "unknown": unknown, "candidates_considered": int(rows.shape[0]),
+                    "full_match": 0, "coverage_by_skill": {}, "top_candidates": []}
+
+        cols = np.array([self.column[s] for s in required])
+        # extract just the required bits: byte j//8, bit 7 - j%8 (packbits is big-endian)
+        have = (self._bits[rows][:, cols // 8] >> (7 - cols % 8)) & 1
+        matched = have.sum(axis=1)
+
+        k = min(top_n, rows.shape[0])
+        best = np.argpartition(-matched, k - 1)[:k] if k < rows.shape[0] else np.arange(rows.shape[0])
+        best = best[np.argsort(-matched[best], kind="stable")]
+        top = []
+        for i in best:
+            mask = have[i].astype(bool)
+            top.append({
+                "id": int(self._doc_ids[rows[i]]),
+                "category": self.categories[self._cats[rows[i]]],
+                "coverage": float(matched[i]) / len(required),
+                "matched": [s for s, m in zip(required, mask) if m],
+                "missing": [s for s, m in zip(required, mask) if not m],
+            })
+        return {
+            "required": required,
+            "unknown": unknown,
+            "candidates_considered": int(rows.shape[0]),
+            "full_match": int(np.count_nonzero(matched == len(required))),
+            "coverage_by_skill": {s: int(c) for s, c in zip(required, have.sum(axis=0))},
+            "top_candidates": top,
+        }
+
+    def category_in(self, text: str) -> Optional[str]:
+        """Return the longest known category named in `text`, if any (whole words only)."""
+        padded = f" {category_key(text or '')} "
+        hits = [c for c in self.categories if category_key(c) and f" {category_key(c)} " in padded]
+        return max(hits, key=len) if hits else None
+
+    def _find_category(self, category: str) -> Optional[int]:
+        if category in self._category_code:
+            return self._category_code[category]
+        lowered = category.lower()
+        for name, code in self._category_code.items():
+            if name.lower() == lowered:
+                return code
+        return None
+
+    # ---- persistence ---------------------------------------------------
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        live = np.flatnonzero(self._doc_ids[:self._n] >= 0)  # compact out removed rows
+        tmp = os.path.join(path, "skills.tmp.npz")
+        np.savez(tmp, bits=self._bits[live], doc_ids=self._doc_ids[live], cats=self._cats[live], counts=self.counts)
+        os.replace(tmp, os.path.join(path, "skills.npz"))
+        with open(os.path.join(path, "skills.json"), "w", encoding="utf-8") as f:
+            json.dump({"skills": self.skills, "categories": self.categories}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillIndex":
+        with open(os.path.join(path, "skills.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["skills"])
+        with np.load(os.path.join(path, "skills.npz")) as data:
+            index._bits = data["bits"]
+            index._doc_ids = data["doc_ids"]
+            index._cats = data["cats"]
+            index.counts = data["counts"]
+        index.categories = meta["categories"]
+        index._category_code = {c: i for i, c in enumerate(index.categories)}
+        index._n = int(index._doc_ids.shape[0])
+        index._pos = {int(d): i for i, d in enumerate(index._doc_ids)}
+        return index
+
+
+_LOADED: Dict[str, Tuple[float, SkillIndex]] = {}
+_LOAD_LOCK = threading.Lock()
+
+
+def load_skill_index(path: str) -> Optional[SkillIndex]:
+    """Load (once) the index at `path`; reloads when ingestion rewrote it."""
+    npz = os.path.join(path, "skills.npz")
+    if not os.path.exists(npz):
+        return None
+    mtime = os.path.getmtime(npz)
+    cached = _LOADED.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with _LOAD_LOCK:
+        cached = _LOADED.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        index = SkillIndex.load(path)
+        _LOADED[path] = (mtime, index)
+        logger.info("Loaded skill index from %s (%d candidates, %d skills)", path, len(index), len(index.skills))
+        return index
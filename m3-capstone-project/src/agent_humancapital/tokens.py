@@ -0,0 +1,104 @@
+from __future__ import annotations
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def get_encoder(model: str) -> Optional[Any]:
+    """tiktoken encoder for `model`, resolved once per process; None without tiktoken."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.info("tiktoken not installed; token counts are estimated")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # encodings are downloaded on first use; offline hosts fall back to estimates
+        logger.warning("tiktoken encoder for %s unavailable (%s); token counts are estimated", model, e)
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    if not text:
+        return 0
+    enc = get_encoder(model)
+    if enc is None:
+        # fallback: ~4 chars/token heuristic (rough)
+        return max(1, len(text) // 4)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+@dataclass
+class Message:
+    role: str
+    content: str
+    tokens: int  # counted once, when the message is added
+
+    def line(self) -> str:
+        return f"{self.role}: {self.content}"
+
+
+class TokenLedger:
+    """Per-session message log with token counts and a token-budgeted window.
+
+    Each message is encoded once in `add`. The history window is kept
+    incrementally: new messages are appended and the oldest dropped while the
+    window is over `budget` tokens or `max_messages` messages, so a turn costs
+    O(new message) instead of re-encoding the whole history.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini", budget: int = 2000, max_messages: int = 20):
+        self.model = model
+        self.budget = budget
+        self.max_messages = max_messages
+        self.message_count = 0
+        self._window: Deque[Message] = deque()
+        self._window_tokens = 0
+        self.totals: Dict[str, int] = {"input_tokens": 0, "output_tokens": 0}
+        self._lock = threading.Lock()
+
+    def add(self, role: str, content: str, tokens: Optional[int] = None) -> Message:
+        # pass `tokens` when the count is already known (e.g. from the supervisor's usage)
+        msg = Message(role, content, count_tokens(content, self.model) if tokens is None else tokens)
+        with self._lock:
+            self.message_count += 1
+            self._window.append(msg)
+            self._window_tokens += msg.tokens
+            while self._window and (
+                self._window_tokens > self.budget or len(self._window) > self.max_messages
+            ):
+                self._window_tokens -= self._window.popleft().tokens
+        return msg
+
+    def record(self, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        with self._lock:
+            self.totals["input_tokens"] += input_tokens
+            self.totals["output_tokens"] += output_tokens
+
+    @property
+    def history_tokens(self) -> int:
+        return self._window_tokens
+
+    def history(self) -> str:
+        with self._lock:
+            return "\n".join(m.line() for m in self._window)
+
+    def usage(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "model": self.model,
+                **self.totals,
+                "total_tokens": self.totals["input_tokens"] + self.totals["output_tokens"],
+                "history_tokens": self._window_tokens,
+                "history_messages": len(self._window),
+            }
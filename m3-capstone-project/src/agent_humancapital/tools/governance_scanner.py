@@ -0,0 +1,190 @@
+from __future__ import annotations
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "governance_rules.json")
+
+KINDS = ("pii", "bias", "risk")
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    kind: str  # pii | bias | risk
+    pattern: str
+    replacement: Optional[str] = None  # pii only
+    message: Optional[str] = None  # risk only
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Rule":
+        kind = d["kind"]
+        if kind not in KINDS:
+            raise ValueError(f"Unknown governance rule kind {kind!r} in rule {d.get('name')!r}")
+        if "terms" in d:
+            # whole-word terms: "age" must not fire inside "manage" or "language"
+            terms = sorted({t.lower() for t in d["terms"]}, key=len, reverse=True)
+            pattern = r"(?<!\w)(?:" + "|".join(re.escape(t) for t in terms) + r")(?!\w)"
+        else:
+            pattern = d["pattern"]
+        return cls(d["name"], kind, pattern, d.get("replacement", f"[REDACTED_{d['name'].upper()}]"), d.get("message"))
+
+
+@dataclass
+class Finding:
+    rule: str
+    kind: str
+    start: int
+    end: int
+    text: str
+    message: Optional[str] = None
+
+
+@dataclass
+class ScanResult:
+    text: str  # PII redacted
+    findings: List[Finding] = field(default_factory=list)
+
+    def of_kind(self, kind: str) -> List[Finding]:
+        return [f for f in self.findings if f.kind == kind]
+
+    @property
+    def bias(self) -> str:
+        hits = sorted({f.text.lower() for f in self.of_kind("bias")})
+        if hits:
+            return f"Bias warning: detected potentially sensitive terms {hits}."
+        return "OK"
+
+    @property
+    def risk(self) -> str:
+        hits = self.of_kind("risk")
+        if hits:
+            return hits[0].message or "Risk: detected."
+        return "OK"
+
+
+class GovernanceScanner:
+    """All PII, bias and risk rules compiled into one alternation.
+
+    One `finditer` over the text yields every match; PII matches are replaced
+    while the output is assembled, bias/risk matches become findings. Earlier
+    rules win where matches overlap (PII rules are listed first, so a redacted
+    email never also reports a bias term inside it).
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = {f"r{i}": r for i, r in enumerate(rules)}
+        self._regex = re.compile(
+            "|".join(f"(?P<{gid}>{r.pattern})" for gid, r in self.rules.items()) or r"(?!)",
+            re.IGNORECASE,
+        )
+
+    def _rule(self, m: re.Match) -> Rule:
+        # lastgroup is the outermost named group unless a rule uses named groups itself
+        rule = self.rules.get(m.lastgroup or "")
+        if rule is None:
+            gid = next(g for g, v in m.groupdict().items() if v is not None and g in self.rules)
+            rule = self.rules[gid]
+        return rule
+
+    def scan(self, text: str) -> ScanResult:
+        text = text or ""
+        return self._assemble(text, list(self._regex.finditer(text)), len(text))
+
+    def _assemble(self, text: str, matches: List[re.Match], upto: int, offset: int = 0) -> ScanResult:
+        # build the redacted text[:upto] and findings from already-found matches
+        parts: List[str] = []
+        findings: List[Finding] = []
+        last = 0
+        for m in matches:
+            if m.end() > upto:
+                break
+            rule = self._rule(m)
+            findings.append(Finding(rule.name, rule.kind, offset + m.start(), offset + m.end(), m.group(), rule.message))
+            if rule.kind == "pii":
+                parts.append(text[last:m.start()])
+                parts.append(rule.replacement or "[REDACTED]")
+                last = m.end()
+        parts.append(text[last:upto])
+        return ScanResult("".join(parts), findings)
+
+    def scan_batch(self, texts: Iterable[str]) -> List[ScanResult]:
+        return [self.scan(t) for t in texts]
+
+    def stream(self, hold: int = 256) -> "StreamScanner":
+        return StreamScanner(self, hold=hold)
+
+
+class StreamScanner:
+    """Incremental scanning for streamed output.
+
+    `feed` returns the redacted text that is safe to show now. The last `hold`
+    characters are kept back (and any match that crosses into them), so a PII
+    value split across chunks is still redacted. Output is only cut at
+    whitespace so word-boundary rules see whole words. Matches longer than
+    `hold` characters are not supported. `flush` emits the rest.
+    """
+
+    def __init__(self, scanner: GovernanceScanner, hold: int = 256):
+        self.scanner = scanner
+        self.hold = hold
+        self.findings: List[Finding] = []
+        self._buffer = ""
+        self._offset = 0  # position of _buffer[0] in the full input
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk or ""
+        cut = len(self._buffer) - self.hold
+        if cut <= 0:
+            return ""
+        matches = []
+        for m in self.scanner._regex.finditer(self._buffer):
+            if m.start() >= cut:
+                break
+            if m.end() > cut:
+                cut = m.start()  # don't split a match; wait for more text
+                break
+            matches.append(m)
+        # back up to whitespace; a match that allows spaces (e.g. a phone
+        # number) may then straddle the cut, so back up before it and retry
+        while True:
+            while cut > 0 and not self._buffer[cut - 1].isspace():
+                cut -= 1
+            split = [m.start() for m in matches if m.start() < cut < m.end()]
+            if not split:
+                break
+            cut = min(split)
+        return self._emit([m for m in matches if m.end() <= cut], cut)
+
+    def flush(self) -> str:
+        return self._emit(list(self.scanner._regex.finditer(self._buffer)), len(self._buffer))
+
+    @property
+    def bias(self) -> str:
+        return ScanResult("", self.findings).bias
+
+    @property
+    def risk(self) -> str:
+        return ScanResult("", self.findings).risk
+
+    def _emit(self, matches: List[re.Match], cut: int) -> str:
+        if cut <= 0:
+            return ""
+        res = self.scanner._assemble(self._buffer, matches, cut, offset=self._offset)
+        self.findings.extend(res.findings)
+        self._buffer = self._buffer[cut:]
+        self._offset += cut
+        return res.text
+
+
+def load_rules(path: str = DEFAULT_RULES_PATH) -> List[Rule]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [Rule.from_dict(r) for r in json.load(f).get("rules", [])]
+
+
+@lru_cache(maxsize=4)
+def load_scanner(path: str = DEFAULT_RULES_PATH) -> GovernanceScanner:
+    return GovernanceScanner(load_rules(path))
@@ -1,25 +1,24 @@
 from __future__ import annotations
-import re
-from typing import Tuple
+from typing import Any, Dict, Iterable, List, Tuple
+from agent_humancapital.config import SETTINGS
+from agent_humancapital.ingestion.redaction import open_pii_index, restore_pii
+from agent_humancapital.metrics import timed
+from agent_humancapital.tools.governance_scanner import (
+    DEFAULT_RULES_PATH,
+    GovernanceScanner,
+    ScanResult,
+    StreamScanner,
+    load_scanner,
+)
 
 ALLOWED_ACTIONS = {
     "guest": {"general_qa"},
     "manager": {"general_qa", "retrieve"},
     "hr": {"general_qa", "retrieve", "skill", "rank", "interview"},
     "recruiter": {"general_qa", "retrieve", "skill", "rank", "interview"},
-    "admin": {"general_qa", "retrieve", "skill", "rank", "interview", "governance"},
+    "admin": {"general_qa", "retrieve", "skill", "rank", "interview", "governance", "view_pii"},
 }
 
-PII_PATTERNS = [
-    (re.compile(r"\b[\w\.-]+@[\w\.-]+\.\w+\b"), "[REDACTED_EMAIL]"),
-    (re.compile(r"\b(\+?\d[\d\s\-\(\)]{8,}\d)\b"), "[REDACTED_PHONE]"),
-]
-
-BIAS_TRIGGERS = [
-    "young", "old", "age", "gender", "female", "male", "married", "single",
-    "religion", "race", "ethnicity", "pregnant", "disabled",
-]
-
 def rbac_enforcer(role: str, action: str) -> Tuple[bool, str]:
     role = (role or "guest").lower()
     action = action.lower()
@@ -29,22 +28,36 @@ def rbac_enforcer(role: str, action: str) -> Tuple[bool, str]:
         return False, f"Access denied for role='{role}' to action='{action}'."
     return True, "OK"
 
+def get_scanner() -> GovernanceScanner:
+    # PII, bias and risk rules from GOVERNANCE_RULES_PATH (or the bundled set)
+    return load_scanner(SETTINGS.GOVERNANCE_RULES_PATH or DEFAULT_RULES_PATH)
+
+@timed("hc_governance_seconds", tool="governance_scan")
+def governance_scan(text: str) -> ScanResult:
+    """Redact PII and collect bias/risk findings in a single pass."""
+    return get_scanner().scan(text)
+
+def governance_scan_batch(texts: Iterable[str]) -> List[ScanResult]:
+    return get_scanner().scan_batch(texts)
+
+def governance_stream(hold: int = 256) -> StreamScanner:
+    return get_scanner().stream(hold=hold)
+
 def pii_redactor(text: str) -> str:
-    out = text
-    for pattern, repl in PII_PATTERNS:
-        out = pattern.sub(repl, out)
-    return out
+    return governance_scan(text).text
 
 def bias_checker(text: str) -> str:
-    t = text.lower()
-    hits = [w for w in BIAS_TRIGGERS if w in t]
-    if hits:
-        return f"Bias warning: detected potentially sensitive terms {sorted(set(hits))}."
-    return "OK"
+    return governance_scan(text).bias
 
 def risk_detector(text: str) -> str:
-    # simple heuristic; extend later
-    t = text.lower()
-    if "guarantee" in t or "100%" in t:
-        return "Risk: overconfident claim detected."
-    return "OK"
+    return governance_scan(text).risk
+
+def reveal_pii(role: str, candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore the PII removed at ingest into a candidate's preview (view_pii roles only)."""
+    ok, msg = rbac_enforcer(role, "view_pii")
+    if not ok:
+        return {"ok": False, "msg": msg, "candidate": candidate}
+    index = open_pii_index(SETTINGS.INDEX_DIR)
+    spans = index.get(candidate.get("id")) if index is not None and candidate.get("id") is not None else []
+    preview = candidate.get("preview", "")
+    return {"ok": True, "msg": msg, "candidate": {**candidate, "preview": restore_pii(preview, spans, limit=len(preview))}}
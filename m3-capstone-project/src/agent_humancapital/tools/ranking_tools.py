@@ -1,37 +1,85 @@
 from __future__ import annotations
-from typing import Any, Dict, List
-import math
-
-def jd_matcher(jd_text: str, candidate_preview: str) -> Dict[str, Any]:
-    # MVP heuristic: token overlap
-    jd_tokens = set([t for t in _tokens(jd_text) if len(t) > 2])
-    cv_tokens = set([t for t in _tokens(candidate_preview) if len(t) > 2])
-
-    if not jd_tokens:
-        score = 0.0
-    else:
-        score = len(jd_tokens & cv_tokens) / max(1, len(jd_tokens))
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from agent_humancapital.candidates import Candidate, CandidateRecord, as_record
+from agent_humancapital.lexical_index import STOPWORDS
+
+# vector-store scores that are distances (smaller = better) rather than similarities
+_DISTANCE_METRICS = ("euclid", "euclidean", "manhattan", "distance")
+# term -> weight (e.g. BM25 idf learned from the corpus); None = uniform weights
+TermWeights = Optional[Callable[[str], float]]
+
+def jd_matcher(jd_text: str, candidate_preview: str, term_weights: TermWeights = None) -> Dict[str, Any]:
+    terms = jd_terms(jd_text)
+    matrix = _term_matrix([candidate_preview], terms)
+    score = _match_scores(matrix, _weights(terms, term_weights))[0]
     return {
         "score": float(score),
-        "matched_terms": sorted(list(jd_tokens & cv_tokens))[:30],
+        "matched_terms": _matched(matrix[0], terms),
     }
 
-def ranking_candidates(candidates: List[Dict[str, Any]], jd_text: str) -> Dict[str, Any]:
-    ranked = []
-    for c in candidates:
-        match = jd_matcher(jd_text, c.get("preview", ""))
-        combined = _combine_scores(c.get("score", 0.0), match["score"])
-        ranked.append({
-            **c,
-            "jd_match_score": match["score"],
-            "combined_score": combined,
-            "matched_terms": match["matched_terms"],
-        })
-
-    ranked.sort(key=lambda x: x["combined_score"], reverse=True)
+def ranking_candidates(
+    candidates: List[Candidate],
+    jd_text: str,
+    term_weights: TermWeights = None,
+    metric: str = "cosine",
+    top_n: Optional[int] = None,
+    texts: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Score every candidate against the JD in one pass.
+
+    The JD is tokenized and weighted once; candidates become rows of a
+    candidates x JD-terms matrix, so the match score is a single weighted
+    row sum. With top_n only the best N are selected (partial sort).
+    `texts` (e.g. full resumes) are matched instead of the previews.
+    """
+    if not candidates:
+        return {"ranked": []}
+
+    terms = jd_terms(jd_text)
+    matrix, jd_scores, combined = _score(candidates, texts, terms, _weights(terms, term_weights), metric)
+    ranked = [_ranked(candidates[i], matrix[i], jd_scores[i], combined[i], terms) for i in _top_order(combined, top_n)]
     return {"ranked": ranked}
 
-def explain_score(candidate: Dict[str, Any]) -> str:
+def ranking_candidates_stream(
+    batches: Iterable[List[Candidate]],
+    jd_text: str,
+    term_weights: TermWeights = None,
+    metric: str = "cosine",
+    top_n: int = 50,
+    texts: Optional[Callable[[List[Candidate]], List[str]]] = None,
+) -> Dict[str, Any]:
+    """ranking_candidates over a stream of candidate batches (e.g. retrieval pages).
+
+    Each batch is scored as it arrives and only a bounded min-heap of the
+    best `top_n` is kept, so memory does not grow with the number of
+    candidates. Scores are per candidate, so the result equals ranking the
+    concatenated batches (ties keep arrival order). `texts(batch)` supplies
+    the texts to match, e.g. full resumes.
+    """
+    terms = jd_terms(jd_text)
+    weights = _weights(terms, term_weights)
+    heap: List[Tuple[float, int, CandidateRecord]] = []
+    seen = 0
+    for batch in batches:
+        if not batch:
+            continue
+        matrix, jd_scores, combined = _score(batch, texts(batch) if texts else None, terms, weights, metric)
+        for i in _top_order(combined, top_n):
+            key = (float(combined[i]), -(seen + int(i)))  # earlier arrival wins ties
+            if len(heap) >= top_n and key <= heap[0][:2]:
+                break  # the rest of this batch scores lower still
+            entry = (*key, _ranked(batch[i], matrix[i], jd_scores[i], combined[i], terms))
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+        seen += len(batch)
+    ranked = [record for _, _, record in sorted(heap, key=lambda e: e[:2], reverse=True)]
+    return {"ranked": ranked, "considered": seen}
+
+def explain_score(candidate: Candidate) -> str:
     return (
         f"Candidate {candidate.get('id')} | "
         f"semantic={candidate.get('score'):.3f}, "
@@ -40,12 +88,80 @@ def explain_score(candidate: Dict[str, Any]) -> str:
         f"Matched terms: {candidate.get('matched_terms', [])}"
     )
 
+def jd_terms(jd_text: str) -> List[str]:
+    # stopwords are not in the BM25 vocabulary, so they would get the weight of a rare term
+    return sorted(set(t for t in _tokens(jd_text) if len(t) > 2 and t not in STOPWORDS))
+
+def normalize_semantic(scores: np.ndarray, metric: str = "cosine") -> np.ndarray:
+    """Map vector-store scores to [0, 1], bigger = better.
+
+    cosine/dot scores are similarities already (clip negatives); euclid and
+    manhattan scores are distances, so they are inverted.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if metric in _DISTANCE_METRICS:
+        return 1.0 / (1.0 + np.maximum(scores, 0.0))
+    return np.clip(scores, 0.0, 1.0)
+
+def denormalize_semantic(similarities: np.ndarray, metric: str = "cosine") -> np.ndarray:
+    """Inverse of normalize_semantic: [0, 1] similarities back to the metric's raw score scale."""
+    sims = np.clip(np.asarray(similarities, dtype=np.float64), 0.0, 1.0)
+    if metric in _DISTANCE_METRICS:
+        return 1.0 / np.maximum(sims, 1e-9) - 1.0
+    return sims
+
+def _score(
+    candidates: List[Candidate], texts: Optional[List[str]], terms: List[str], weights: np.ndarray, metric: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # (term matrix, JD match scores, combined scores) for one batch
+    matrix = _term_matrix(texts if texts is not None else [c.get("preview", "") for c in candidates], terms)
+    jd_scores = _match_scores(matrix, weights)
+    semantic = np.array([float(c.get("score", 0.0) or 0.0) for c in candidates])
+    return matrix, jd_scores, _combine_scores(semantic, jd_scores, metric)
+
+def _combine_scores(semantic: np.ndarray, jd_match: np.ndarray, metric: str = "cosine") -> np.ndarray:
+    # the one place the ranking formula lives: 60% similarity, 40% JD term match
+    return 0.6 * normalize_semantic(semantic, metric) + 0.4 * np.asarray(jd_match, dtype=np.float64)
+
+def _ranked(candidate: Candidate, row: np.ndarray, jd_score: float, combined: float, terms: List[str]) -> CandidateRecord:
+    return as_record(candidate).with_(
+        jd_match_score=float(jd_score),
+        combined_score=float(combined),
+        matched_terms=_matched(row, terms),
+    )
+
 def _tokens(s: str) -> List[str]:
     return [t.strip(".,:;()[]{}<>\"'").lower() for t in (s or "").split()]
 
-def _combine_scores(semantic: float, jd_match: float) -> float:
-    # normalize typical distance-ish values; keep simple
-    sem = float(semantic)
-    jm = float(jd_match)
-    # if semantic score is distance-like (smaller better) you may invert; here assume bigger better
-    return 0.6 * sem + 0.4 * jm
+def _term_matrix(texts: List[str], terms: List[str]) -> np.ndarray:
+    # candidates x terms presence matrix; each text is tokenized once
+    column = {t: j for j, t in enumerate(terms)}
+    matrix = np.zeros((len(texts), len(terms)), dtype=bool)
+    for i, text in enumerate(texts):
+        cols = [column[t] for t in set(_tokens(text)) if t in column]
+        matrix[i, cols] = True
+    return matrix
+
+def _weights(terms: List[str], term_weights: TermWeights) -> np.ndarray:
+    if term_weights is None:
+        return np.ones(len(terms))
+    w = np.array([float(term_weights(t)) for t in terms])
+    # terms unseen in the corpus get the max weight (rare = informative)
+    if len(w):
+        w[w <= 0] = w.max() if w.max() > 0 else 1.0
+    return w
+
+def _match_scores(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    total = weights.sum()
+    if total <= 0:
+        return np.zeros(matrix.shape[0])
+    return (matrix @ weights) / total
+
+def _matched(row: np.ndarray, terms: List[str]) -> List[str]:
+    return [terms[j] for j in np.flatnonzero(row)][:30]
+
+def _top_order(scores: np.ndarray, top_n: Optional[int]) -> np.ndarray:
+    if top_n is not None and 0 < top_n < scores.shape[0]:
+        idx = np.argpartition(-scores, top_n - 1)[:top_n]
+        return idx[np.argsort(-scores[idx], kind="stable")]
+    return np.argsort(-scores, kind="stable")
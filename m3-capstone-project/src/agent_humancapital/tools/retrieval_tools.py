@@ -1,32 +1,184 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
-from agent_humancapital.vectorstore import get_vectorstore
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from agent_humancapital.candidates import Candidate, CandidateRecord, as_record
+from agent_humancapital.vectorstore import get_vectorstore, iter_search_pages, native_filter, search_batch_by_vectors
+from agent_humancapital.filters import SearchFilter, parse_filters
+from agent_humancapital.docstore import DocStore, load_doc_store
+from agent_humancapital.lexical_index import load_bm25_index
 from agent_humancapital.config import SETTINGS
+from agent_humancapital.metrics import span, timed
+from agent_humancapital.tools.governance_tools import governance_scan
+from agent_humancapital.tools.ranking_tools import denormalize_semantic, normalize_semantic
 
-def semantic_search(query: str, k: int | None = None) -> Dict[str, Any]:
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+@timed("hc_tool_seconds", tool="semantic_search")
+def semantic_search(query: str, k: int | None = None, filters: Optional[SearchFilter] = None) -> Dict[str, Any]:
+    vs = get_vectorstore()
+    k = k or SETTINGS.TOP_K_DEFAULT
+
+    # filters are pushed down to the backend: k hits that all match, no over-fetching
+    native = native_filter(vs, filters)
+    hits = vs.similarity_search_with_score(query, k=k, **({"filter": native} if native is not None else {}))
+    return {"query": query, "k": k, "filters": filters.to_dict() if filters else {}, "results": _to_results(hits)}
+
+@timed("hc_tool_seconds", tool="semantic_search_batch")
+def semantic_search_batch(queries: List[str], k: int | None = None, filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
+    """semantic_search for many queries: one batched embedding call + one batched search."""
     vs = get_vectorstore()
     k = k or SETTINGS.TOP_K_DEFAULT
+    if not queries:
+        return []
 
-    hits = vs.similarity_search_with_score(query, k=k)
-    results: List[Dict[str, Any]] = []
+    vectors = vs.embeddings.embed_documents(list(queries))
+    hits = search_batch_by_vectors(vs, vectors, k=k, filters=filters)
+    applied = filters.to_dict() if filters else {}
+    return [{"query": q, "k": k, "filters": applied, "results": _to_results(h)} for q, h in zip(queries, hits)]
+
+def iter_semantic_search(
+    query: str, k: int, page_size: int | None = None, filters: Optional[SearchFilter] = None
+) -> Iterator[List[CandidateRecord]]:
+    """semantic_search for a large k: candidates in pages of `page_size`, best first.
+
+    The query is embedded once and each page is only fetched when the
+    consumer asks for it, so k can run into the thousands.
+    """
+    vs = get_vectorstore()
+    page_size = page_size or SETTINGS.RETRIEVAL_PAGE_SIZE
+    pages = iter_search_pages(vs, vs.embeddings.embed_query(query), k, page_size, filters)
+    while True:
+        with span("hc_tool_seconds", tool="semantic_search_page"):
+            hits = next(pages, None)
+        if hits is None:
+            return
+        yield _to_results(hits)
+
+def _to_results(hits: List[Tuple[Document, float]]) -> List[CandidateRecord]:
+    results: List[CandidateRecord] = []
     for doc, score in hits:
-        results.append({
-            "id": doc.metadata.get("row_index"),
-            "category": doc.metadata.get("category"),
-            "score": float(score),
-            "preview": doc.page_content[:400],
-            "metadata": doc.metadata,
-        })
+        results.append(CandidateRecord(
+            id=_doc_id(doc),
+            category=doc.metadata.get("category"),
+            score=float(score),
+            preview=_preview(doc),
+            point_id=_point_id(doc),
+        ))
+    return results
+
+def _doc_id(doc: Document) -> Any:
+    # points ingested before doc ids existed only carry their row_index
+    return doc.metadata.get("doc_id", doc.metadata.get("row_index"))
 
-    return {"query": query, "k": k, "results": results}
+def _preview(doc: Document) -> str:
+    if doc.metadata.get("pii_redacted"):
+        # redacted once at ingest; nothing to do per request
+        return doc.metadata.get("preview") or doc.page_content[:400]
+    # legacy points ingested before redaction: redact before the text spreads
+    return governance_scan(doc.page_content[:512]).text[:400]
 
-def keyword_search(query: str, resumes: List[Dict[str, Any]], k: int | None = None) -> Dict[str, Any]:
+def _point_id(doc: Document) -> Optional[str]:
+    pid = doc.id or doc.metadata.get("_id")  # langchain-qdrant also keeps it in metadata
+    return str(pid) if pid is not None else None
+
+def get_doc_store() -> Optional[DocStore]:
+    return load_doc_store(os.path.join(SETTINGS.INDEX_DIR, "docs"))
+
+def known_categories() -> List[str]:
+    """Category names seen at ingest (for parse_filters); empty before the first ingest."""
+    store = get_doc_store()
+    if store is not None:
+        return store.categories
+    from agent_humancapital.tools.skill_tools import get_skill_index
+
+    index = get_skill_index()
+    return index.categories if index is not None else []
+
+def query_filters(query: str) -> SearchFilter:
+    return parse_filters(query, known_categories())
+
+def candidate_texts(candidates: List[Candidate], limit: Optional[int] = None) -> Dict[Any, str]:
+    """Full (redacted) texts by candidate id.
+
+    Read from the ingest-time DocStore when present (memory-mapped, no network);
+    candidates it doesn't know are fetched from the vector store by point id.
+    Missing texts are simply absent, so callers fall back to the preview.
+    """
+    out: Dict[Any, str] = {}
+    store = get_doc_store()
+    missing: Dict[str, Any] = {}
+    for c in candidates:
+        cid = c.get("id")
+        text = store.text(cid, limit) if store is not None and cid is not None else None
+        if text is not None:
+            out[cid] = text
+        elif c.get("point_id") is not None:
+            missing[c["point_id"]] = cid
+    if missing:
+        try:
+            docs = get_vectorstore().get_by_ids(list(missing))
+        except NotImplementedError:
+            docs = []
+        for doc in docs:
+            text = doc.page_content if doc.metadata.get("pii_redacted") else governance_scan(doc.page_content).text
+            out[missing[str(_point_id(doc))]] = text[:limit] if limit is not None else text
+    return out
+
+@timed("hc_tool_seconds", tool="keyword_search")
+def keyword_search(
+    query: str, resumes: Optional[List[Candidate]] = None, k: int | None = None, filters: Optional[SearchFilter] = None
+) -> Dict[str, Any]:
     k = k or SETTINGS.TOP_K_DEFAULT
-    q = query.lower()
-    filtered = [r for r in resumes if q in (r.get("preview", "").lower())]
-    return {"query": query, "k": k, "results": filtered[:k], "mode": "keyword_filter_on_preview"}
+    index = load_bm25_index(os.path.join(SETTINGS.INDEX_DIR, "bm25"))
+    if index is None:
+        # No BM25 index built yet: fall back to filtering the given (already filtered) resumes
+        q = query.lower()
+        filtered = [r for r in resumes or [] if q in r.get("preview", "").lower()]
+        return {"query": query, "k": k, "results": filtered[:k], "mode": "keyword_filter_on_preview"}
+
+    hits = index.search(query, k=k, mask=filters.mask(index.column) if filters else None)
+    # Hits found only by BM25 have no similarity score. They get their BM25
+    # score relative to the best hit, scaled to the best semantic similarity
+    # (so the top lexical hit sits level with the top semantic one), in the
+    # backend's score scale; hits the semantic search found keep theirs in RRF.
+    metric = SETTINGS.VECTOR_DISTANCE
+    semantic = normalize_semantic([r.get("score", 0.0) or 0.0 for r in resumes or []], metric)
+    top = float(semantic.max()) if len(semantic) else 1.0
+    best = max((s for _, s in hits), default=0.0)
+    scores = denormalize_semantic([top * s / best if best > 0 else 0.0 for _, s in hits], metric)
+    results: List[CandidateRecord] = []
+    for (row_index, bm25), score in zip(hits, scores):
+        doc = index.document(row_index)
+        results.append(CandidateRecord(
+            id=row_index,
+            category=doc.get("category"),
+            score=float(score),
+            bm25_score=bm25,
+            preview=doc.get("preview", ""),
+        ))
+    return {"query": query, "k": k, "results": results, "mode": "bm25"}
+
+def reciprocal_rank_fusion(result_lists: List[List[Candidate]], k: int | None = None, c: int | None = None) -> Dict[str, Any]:
+    """Merge ranked result lists by sum(1 / (c + rank)), keyed by candidate id.
+
+    The first occurrence of a candidate provides its fields, so pass the
+    semantic list first to keep its similarity score and preview.
+    """
+    c = c or SETTINGS.RRF_K
+    fused: Dict[Any, CandidateRecord] = {}
+    for results in result_lists:
+        for rank, r in enumerate(results, 1):
+            entry = fused.get(r.get("id"))
+            if entry is None:
+                entry = fused[r.get("id")] = as_record(r).with_(rrf_score=0.0)
+            entry.rrf_score += 1.0 / (c + rank)
+            if r.get("bm25_score") is not None:
+                entry.bm25_score = r["bm25_score"]
+    merged = sorted(fused.values(), key=lambda x: x.rrf_score, reverse=True)
+    return {"results": merged[:k] if k else merged, "mode": "rrf", "c": c}
 
-def metadata_filter(resumes: List[Dict[str, Any]], category: Optional[str] = None) -> Dict[str, Any]:
+def metadata_filter(resumes: List[Candidate], category: Optional[str] = None) -> Dict[str, Any]:
     if not category:
         return {"results": resumes, "filter": "none"}
 
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skills.json")
+
+# Word-ish tokens that keep skill punctuation: c++, c#, node.js, .net, ci/cd
+_TOKEN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*")
+
+_END = ""  # trie key marking "a skill ends here"
+
+
+def skill_tokens(text: str) -> List[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+class SkillTaxonomy:
+    """Skill names + aliases compiled into a token trie.
+
+    Matching walks the text's tokens once and takes the longest skill phrase
+    starting at each position (leftmost-longest, like Aho-Corasick with
+    whole-token patterns). Because patterns are whole tokens, "ml" never
+    matches inside "html" and "node" never matches "nodes". Cost depends on
+    text length and the longest phrase, not on the number of skills.
+    """
+
+    def __init__(self, skills: Dict[str, Iterable[str]]):
+        self._trie: Dict[str, dict] = {}
+        self._alias: Dict[str, str] = {}
+        self.max_phrase = 1
+        for canonical, aliases in skills.items():
+            canonical = canonical.lower().strip()
+            for name in [canonical, *aliases]:
+                self._insert(name.lower().strip(), canonical)
+        self.skills: List[str] = sorted({c.lower().strip() for c in skills})
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("skills", data))
+
+    def _insert(self, phrase: str, canonical: str) -> None:
+        tokens = skill_tokens(phrase)
+        if not tokens:
+            return
+        node = self._trie
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node[_END] = canonical
+        self._alias[" ".join(tokens)] = canonical
+        self.max_phrase = max(self.max_phrase, len(tokens))
+
+    def canonical(self, name: str) -> Optional[str]:
+        return self._alias.get(" ".join(skill_tokens(name)))
+
+    def extract(self, text: str) -> List[str]:
+        tokens = skill_tokens(text)
+        found = set()
+        i = 0
+        while i < len(tokens):
+            node, j, match, match_end = self._trie, i, None, i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    match, match_end = node[_END], j
+            if match is not None:
+                found.add(match)
+                i = match_end
+            else:
+                i += 1
+        return sorted(found)
+
+    def extract_batch(self, texts: Iterable[str]) -> List[List[str]]:
+        return [self.extract(t) for t in texts]
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+@lru_cache(maxsize=4)
+def load_taxonomy(path: str = DEFAULT_TAXONOMY_PATH) -> SkillTaxonomy:
+    return SkillTaxonomy.from_file(path)
@@ -1,31 +1,56 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+import os
+from typing import Any, Dict, List, Optional
+from agent_humancapital.candidates import Candidate
+from agent_humancapital.config import SETTINGS
+from agent_humancapital.skill_index import SkillIndex, load_skill_index
+from agent_humancapital.tools.skill_taxonomy import DEFAULT_TAXONOMY_PATH, SkillTaxonomy, load_taxonomy
 
-COMMON_SKILLS = [
-    "python", "sql", "excel", "power bi", "tableau", "spark", "pandas",
-    "ml", "machine learning", "nlp", "aws", "azure", "gcp", "docker",
-    "kubernetes", "java", "javascript", "react", "node", "postgres",
-]
+def get_taxonomy() -> SkillTaxonomy:
+    return load_taxonomy(SETTINGS.SKILL_TAXONOMY_PATH or DEFAULT_TAXONOMY_PATH)
 
 def extract_skills(text: str) -> Dict[str, Any]:
-    t = (text or "").lower()
-    found = [s for s in COMMON_SKILLS if s in t]
-    return {"skills": sorted(set(found))}
+    return {"skills": get_taxonomy().extract(text)}
+
+def extract_skills_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    return [{"skills": s} for s in get_taxonomy().extract_batch(texts)]
+
+def normalize_skills(skills: List[str]) -> List[str]:
+    # map aliases to canonical names ("k8s" -> "kubernetes"); unknown skills pass through
+    taxonomy = get_taxonomy()
+    return [taxonomy.canonical(s) or s.lower().strip() for s in skills]
 
 def skill_gap_analysis(jd_skills: List[str], candidate_skills: List[str]) -> Dict[str, Any]:
-    jd = set([s.lower() for s in jd_skills])
-    cv = set([s.lower() for s in candidate_skills])
+    jd = set(normalize_skills(jd_skills))
+    cv = set(normalize_skills(candidate_skills))
     return {
         "missing": sorted(list(jd - cv)),
         "matched": sorted(list(jd & cv)),
         "extra": sorted(list(cv - jd)),
     }
 
-def skill_trend_aggregator(candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
-    counts: Dict[str, int] = {}
+def skill_trend_aggregator(candidates: List[Candidate], counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Top skills across candidates; pass `counts` to accumulate over several batches."""
+    counts = {} if counts is None else counts
     for c in candidates:
         skills = c.get("skills", [])
         for s in skills:
             counts[s] = counts.get(s, 0) + 1
     top = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:20]
     return {"top_skills": top}
+
+def get_skill_index() -> Optional[SkillIndex]:
+    return load_skill_index(os.path.join(SETTINGS.INDEX_DIR, "skills"))
+
+def corpus_skill_trends(category: Optional[str] = None, top: int = 20) -> Dict[str, Any]:
+    # corpus-wide counts materialized at ingest, not just the retrieved top-k
+    index = get_skill_index()
+    if index is None:
+        return {"category": category, "top_skills": [], "mode": "unavailable"}
+    return {**index.trends(category=category, top=top), "mode": "skill_index"}
+
+def corpus_skill_gap(jd_skills: List[str], category: Optional[str] = None, top_n: int = 10) -> Dict[str, Any]:
+    index = get_skill_index()
+    if index is None:
+        return {"required": normalize_skills(jd_skills), "top_candidates": [], "mode": "unavailable"}
+    return {**index.gap(normalize_skills(jd_skills), category=category, top_n=top_n), "mode": "skill_index"}
@@ -1,15 +1,160 @@
 from __future__ import annotations
-from qdrant_client import QdrantClient
-from langchain_qdrant import QdrantVectorStore
-from agent_humancapital.config import SETTINGS
-from agent_humancapital.llm import get_embeddings
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from agent_humancapital.filters import SearchFilter
 
-def get_qdrant_client() -> QdrantClient:
-    return QdrantClient(url=SETTINGS.QDRANT_URL, api_key=SETTINGS.QDRANT_API_KEY)
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from langchain_core.vectorstores import VectorStore
+    from qdrant_client import QdrantClient
+    from agent_humancapital.resources import ResourceRegistry
+
+# Backend SDKs (langchain_qdrant, qdrant_client, the local index) are imported
+# by the backend factories, so importing this module stays cheap.
+
+# A backend turns the shared registry (settings, client, embeddings) into a
+# LangChain VectorStore. Every backend must return cosine-similarity scores and
+# documents carrying the ingest metadata (row_index, category, ...).
+VectorBackend = Callable[["ResourceRegistry"], "VectorStore"]
+
+def _qdrant_backend(registry: "ResourceRegistry") -> VectorStore:
+    from langchain_qdrant import QdrantVectorStore
 
-def get_vectorstore() -> QdrantVectorStore:
     return QdrantVectorStore(
-        client=get_qdrant_client(),
-        collection_name=SETTINGS.QDRANT_COLLECTION_NAME,
-        embedding=get_embeddings(),
+        client=registry.client,
+        collection_name=registry.settings.QDRANT_COLLECTION_NAME,
+        embedding=registry.embeddings,
     )
+
+def _local_backend(registry: "ResourceRegistry") -> VectorStore:
+    from agent_humancapital.local_index import LocalVectorStore
+
+    return LocalVectorStore(
+        registry.settings.LOCAL_INDEX_DIR,
+        registry.embeddings,
+        ann_min_docs=registry.settings.LOCAL_ANN_MIN_DOCS,
+        nprobe=registry.settings.LOCAL_ANN_NPROBE,
+    )
+
+BACKENDS: Dict[str, VectorBackend] = {
+    "qdrant": _qdrant_backend,
+    "local": _local_backend,
+}
+
+def register_backend(name: str, factory: VectorBackend) -> None:
+    BACKENDS[name] = factory
+
+def create_vectorstore(registry: "ResourceRegistry") -> VectorStore:
+    backend = registry.settings.VECTOR_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown VECTOR_BACKEND={backend!r}; expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend](registry)
+
+def _is_qdrant(vs: VectorStore) -> bool:
+    # a Qdrant store can only exist once langchain_qdrant was imported
+    module = sys.modules.get("langchain_qdrant")
+    return module is not None and isinstance(vs, module.QdrantVectorStore)
+
+def native_filter(vs: VectorStore, filters: Optional[SearchFilter]) -> Any:
+    """The backend's own form of a SearchFilter (None when there is nothing to filter)."""
+    if not filters:
+        return None
+    if _is_qdrant(vs):
+        return filters.to_qdrant(prefix=f"{vs.metadata_payload_key}.")
+    return filters
+
+def search_batch_by_vectors(
+    vs: VectorStore, vectors: Sequence[Sequence[float]], k: int, filters: Optional[SearchFilter] = None
+) -> List[List[Tuple[Document, float]]]:
+    """Run several vector searches in one round-trip where the backend allows it.
+
+    `filters` are applied server-side (Qdrant filter / local row mask), so
+    each search still returns up to k matching hits.
+    """
+    if not vectors:
+        return []
+    native = native_filter(vs, filters)
+    if _is_qdrant(vs):
+        from langchain_core.documents import Document
+        from qdrant_client import models
+
+        responses = vs.client.query_batch_points(
+            collection_name=vs.collection_name,
+            requests=[models.QueryRequest(query=list(v), limit=k, filter=native, with_payload=True) for v in vectors],
+        )
+        return [
+            [
+                (
+                    Document(
+                        id=str(p.id),  # retrieval_tools._point_id reads it back
+                        page_content=(p.payload or {}).get(vs.content_payload_key, ""),
+                        metadata=(p.payload or {}).get(vs.metadata_payload_key) or {},
+                    ),
+                    float(p.score),
+                )
+                for p in resp.points
+            ]
+            for resp in responses
+        ]
+    kwargs = {"filter": native} if native is not None else {}
+    if hasattr(vs, "search_batch_by_vectors"):
+        return vs.search_batch_by_vectors(vectors, k=k, **kwargs)
+    return [vs.similarity_search_with_score_by_vector(list(v), k=k, **kwargs) for v in vectors]
+
+def iter_search_pages(
+    vs: VectorStore, vector: Sequence[float], k: int, page_size: int, filters: Optional[SearchFilter] = None
+) -> Iterator[List[Tuple[Document, float]]]:
+    """Up to k hits for one query vector, yielded in pages of `page_size` (best first).
+
+    Pages are fetched lazily: Qdrant is paged with offset/limit, the local
+    store ranks once and decodes payloads page by page.
+    """
+    native = native_filter(vs, filters)
+    kwargs = {"filter": native} if native is not None else {}
+    if hasattr(vs, "iter_search_by_vector"):
+        yield from vs.iter_search_by_vector(vector, k=k, page_size=page_size, **kwargs)
+        return
+    for offset in range(0, k, page_size):
+        limit = min(page_size, k - offset)
+        hits = vs.similarity_search_with_score_by_vector(list(vector), k=limit, offset=offset, **kwargs)
+        if hits:
+            yield hits
+        if len(hits) < limit:
+            return
+
+def upsert_vectors(
+    vs: VectorStore,
+    vectors: Sequence[Sequence[float]],
+    texts: Sequence[str],
+    metadatas: Sequence[Dict[str, Any]],
+    ids: Sequence[str],
+) -> None:
+    """Store precomputed vectors; `texts` is the payload text, not necessarily what was embedded."""
+    if _is_qdrant(vs):
+        from qdrant_client import models
+
+        vs.client.upsert(
+            collection_name=vs.collection_name,
+            points=[
+                models.PointStruct(
+                    id=pid,
+                    vector={vs.vector_name: list(v)} if vs.vector_name else list(v),
+                    payload={vs.content_payload_key: t, vs.metadata_payload_key: m},
+                )
+                for pid, v, t, m in zip(ids, vectors, texts, metadatas)
+            ],
+        )
+        return
+    if hasattr(vs, "add_vectors"):
+        vs.add_vectors(vectors, texts, metadatas, ids=ids)
+        return
+    raise NotImplementedError(f"{type(vs).__name__} cannot store precomputed vectors")
+
+def get_qdrant_client() -> QdrantClient:
+    # Shared, process-wide client (see resources.ResourceRegistry)
+    from agent_humancapital.resources import get_registry
+    return get_registry().client
+
+def get_vectorstore() -> VectorStore:
+    from agent_humancapital.resources import get_registry
+    return get_registry().vectorstore
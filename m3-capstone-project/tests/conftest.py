@@ -0,0 +1,7 @@
+import os
+
+# Settings are resolved on first use and credentials are only checked by the
+# services that need them, so tests run without OpenAI or Qdrant keys.
+os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+os.environ.setdefault("EMBEDDING_PROVIDER", "hash")
+os.environ.setdefault("RESPONSE_CACHE_SIZE", "0")  # tests opt in to the response cache explicitly
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import threading
+from dataclasses import replace
+
+from agent_humancapital import api
+from agent_humancapital.config import SETTINGS
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.closed = False
+
+    def warmup(self):
+        return self.health()
+
+    def health(self):
+        return {"backend": "local", "status": "ok", "error": None, "latency_ms": 0.1}
+
+    def close(self):
+        self.closed = True
+
+
+def _app(**settings):
+    return api.ApiApp(replace(SETTINGS, **settings), registry=FakeRegistry())
+
+
+async def _call(app, method, path, body=None, query_string=b"", headers=()):
+    sent = []
+    data = json.dumps(body).encode() if body is not None else b""
+
+    async def receive():
+        return {"type": "http.request", "body": data, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query_string, "headers": list(headers)}
+    await app(scope, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_query_batch_and_errors(monkeypatch):
+    monkeypatch.setattr(api, "supervisor_run", lambda p: {"answer": p.query, "top_k": p.top_k})
+    monkeypatch.setattr(api, "supervisor_run_batch", lambda ps: [{"answer": p.query} for p in ps])
+    app = _app()
+
+    async def scenario():
+        user = {"role": "hr"}
+        status, _, body = await _call(app, "POST", "/v1/query", {"query": "find python", "user": user, "top_k": 7})
+        assert status == 200 and json.loads(body) == {"answer": "find python", "top_k": 7}
+        status, _, body = await _call(app, "POST", "/v1/batch", {"requests": [{"query": "a", "user": user}, {"query": "b", "user": user}]})
+        assert json.loads(body) == {"results": [{"answer": "a"}, {"answer": "b"}]}
+        assert (await _call(app, "POST", "/v1/query", {"user": user}))[0] == 422
+        assert (await _call(app, "POST", "/v1/query", {"query": "x", "user": user, "top_k": 0}))[0] == 422
+        assert (await _call(app, "GET", "/v1/query"))[0] == 405
+        assert (await _call(app, "GET", "/nope"))[0] == 404
+
+    asyncio.run(scenario())
+
+
+def test_role_comes_from_the_api_key(monkeypatch):
+    monkeypatch.setattr(api, "supervisor_run", lambda p: {"role": p.user.role, "user_id": p.user.user_id})
+    monkeypatch.setattr(api, "supervisor_run_batch", lambda ps: [{"role": p.user.role} for p in ps])
+    app = _app(API_KEYS="s3cret:hr, root-key:admin", API_ANONYMOUS_ROLE="guest")
+    claim = {"query": "q", "user": {"user_id": "u1", "role": "admin"}}
+
+    async def scenario():
+        status, _, body = await _call(app, "POST", "/v1/query", claim)
+        assert status == 200 and json.loads(body) == {"role": "guest", "user_id": "u1"}
+        auth = [(b"authorization", b"Bearer s3cret")]
+        _, _, body = await _call(app, "POST", "/v1/query", {"query": "q"}, headers=auth)
+        assert json.loads(body)["role"] == "hr"
+        _, _, body = await _call(app, "POST", "/v1/batch", {"requests": [claim]}, headers=auth)
+        assert json.loads(body) == {"results": [{"role": "hr"}]}
+        status, headers, _ = await _call(app, "POST", "/v1/query", claim, headers=[(b"authorization", b"Bearer nope")])
+        assert status == 401 and headers[b"www-authenticate"] == b"Bearer"
+
+    asyncio.run(scenario())
+
+
+def test_stream_returns_ndjson_events(monkeypatch):
+    def fake_stream(payload):
+        yield {"type": "chunk", "worker": "retrieval", "content": "partial"}
+        yield {"type": "result", "result": {"answer": payload.query}}
+
+    monkeypatch.setattr(api, "supervisor_stream", fake_stream)
+    status, headers, body = asyncio.run(_call(_app(), "POST", "/v1/query", {"query": "q", "user": {}, "stream": True}))
+    events = [json.loads(line) for line in body.splitlines()]
+    assert status == 200 and headers[b"content-type"] == b"application/x-ndjson"
+    assert [e["type"] for e in events] == ["chunk", "result"] and events[1]["result"]["answer"] == "q"
+
+
+def test_backpressure_and_graceful_shutdown(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(api, "supervisor_run", lambda p: release.wait(5) and {"answer": "done"})
+    app = _app(API_MAX_CONCURRENCY=1, API_MAX_QUEUE=0)
+    body = {"query": "q", "user": {}}
+
+    async def scenario():
+        first = asyncio.create_task(_call(app, "POST", "/v1/query", body))
+        while app.inflight == 0:
+            await asyncio.sleep(0.01)
+        status, headers, _ = await _call(app, "POST", "/v1/query", body)
+        assert status == 503 and headers[b"retry-after"] == b"1"
+
+        stopping = asyncio.create_task(app.shutdown())
+        await asyncio.sleep(0.05)
+        assert (await _call(app, "GET", "/health"))[0] == 503  # draining
+        assert not stopping.done()  # waits for the request in flight
+        release.set()
+        status, _, out = await first
+        await stopping
+        assert status == 200 and json.loads(out) == {"answer": "done"}
+        assert app.registry.closed
+
+    asyncio.run(scenario())
+
+
+def test_health_and_metrics_endpoints():
+    app = _app()
+
+    async def scenario():
+        status, _, body = await _call(app, "GET", "/health")
+        health = json.loads(body)
+        assert status == 200 and health["inflight"] == 0 and health["max_concurrency"] == SETTINGS.API_MAX_CONCURRENCY
+        status, headers, body = await _call(app, "GET", "/metrics")
+        assert status == 200 and headers[b"content-type"].startswith(b"text/plain")
+        _, _, body = await _call(app, "GET", "/metrics", query_string=b"format=json")
+        assert isinstance(json.loads(body), dict)
+
+    asyncio.run(scenario())
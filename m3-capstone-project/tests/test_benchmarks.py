@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks import import_budget, synthetic  # noqa: E402
+from benchmarks import run as bench  # noqa: E402
+
+
+def test_synthetic_corpus_is_deterministic():
+    a = list(synthetic.generate(20, seed=3))
+    assert a == list(synthetic.generate(20, seed=3))
+    assert {r["category"] for r in a} <= set(synthetic.CATEGORIES)
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    base = {"results": {"search": {"ops_per_s": 100.0, "p95_ms": 10.0}, "gone": {"ops_per_s": 1.0}}}
+    assert bench.compare({"search": {"ops_per_s": 90.0, "p95_ms": 11.0}}, base, 0.2, 0.5) == []
+    problems = bench.compare({"search": {"ops_per_s": 50.0, "p95_ms": 20.0}}, base, 0.2, 0.5)
+    assert len(problems) == 2
+
+
+def test_measure_without_items():
+    assert bench.measure(lambda item: item, [])["ops"] == 0
+
+
+def test_benchmark_runs_offline(tmp_path):
+    out = tmp_path / "bench.json"
+    env = {k: v for k, v in os.environ.items() if k not in ("OPENAI_API_KEY", "QDRANT_URL", "QDRANT_API_KEY")}
+    env["PYTHONPATH"] = str(ROOT / "src")
+    proc = subprocess.run(
+        [sys.executable, str(ROOT / "benchmarks" / "run.py"), "--docs", "200", "--queries", "8", "--dim", "64",
+         "--out", str(out)],
+        capture_output=True, text=True, env=env, timeout=240,
+    )
+    assert proc.returncode == 0, proc.stderr
+    report = json.loads(out.read_text())
+    assert report["results"]["ingest"]["ops"] == 200
+    assert {"semantic_search", "ranking_candidates", "extract_skills", "governance_scan", "supervisor_run"} <= set(report["results"])
+
+
+def test_pure_tools_import_without_sdks_or_credentials(monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", str(ROOT / "src"))
+    for module in ("agent_humancapital.orchestration.router", "agent_humancapital.tools.governance_tools"):
+        report = import_budget.measure(module)
+        assert report["heavy"] == [] and report["total_ms"] > 0
@@ -0,0 +1,64 @@
+import os
+
+from agent_humancapital.docstore import DocStore, load_doc_store, split_sections
+from agent_humancapital.ingestion.pipeline import IngestManifest, IngestionPipeline, IngestRecord
+from agent_humancapital.ingestion.sinks import DocStoreSink
+from agent_humancapital.llm import HashEmbeddings
+from agent_humancapital.local_index import LocalVectorStore
+
+RESUME = "DATA ANALYST   Summary   Analyst with 5 years of SQL.   Skills   Python, SQL, Tableau   Education   BSc Statistics"
+
+
+def test_texts_sections_and_updates(tmp_path):
+    sink = DocStoreSink(str(tmp_path))
+    sink.add([IngestRecord(7, RESUME, "Data Science", "t"), IngestRecord(8, "Ünïcode résumé " * 50, "HR", "t")])
+    store = sink.store
+    assert store.text(7) == RESUME and store.category(8) == "HR"
+    assert store.text(8, limit=7) == "Ünïcode"
+    assert store.section(7, "skills") == "Python, SQL, Tableau"
+    assert split_sections(RESUME)["header"] == "DATA ANALYST"
+
+    sink.add([IngestRecord(7, "replaced", "Data Science", "t")])
+    store.remove(8)
+    sink.close()  # mostly dead bytes now, so the blob is compacted
+    loaded = load_doc_store(str(tmp_path / "docs"))
+    assert loaded.text(7) == "replaced" and 8 not in loaded and loaded.text(9) is None
+    assert loaded.dead_bytes() == 0
+
+
+def test_slim_payload_keeps_text_in_doc_store(tmp_path):
+    store = LocalVectorStore(str(tmp_path / "vectors"), HashEmbeddings(dim=32))
+    pipe = IngestionPipeline(
+        store, IngestManifest(str(tmp_path / "manifest.sqlite")),
+        sinks=[DocStoreSink(str(tmp_path / "index"))], payload_text=False,
+    )
+    long_text = RESUME + " Kubernetes" * 100
+    assert pipe.run([IngestRecord(0, long_text, "IT", "t")]).upserted == 1
+
+    doc, _ = store.similarity_search_with_score("kubernetes", k=1)[0]
+    assert doc.page_content == long_text[:400] and "preview" not in doc.metadata
+    assert DocStore.load(str(tmp_path / "index" / "docs")).text(0) == long_text
+
+
+def test_compaction_keeps_blob_for_readers_loaded_before_it(tmp_path):
+    path = str(tmp_path / "docs")
+    writer = DocStore(path)
+    writer.put([(1, "first version", "HR")])
+    writer.save()
+    reader = DocStore.load(path)  # loaded, blob not mapped yet
+
+    writer.put([(1, "second version", "HR")])
+    writer.save()  # compacts into a new blob
+    assert reader.text(1) == "first version"
+    assert DocStore.load(path).text(1) == "second version"
+
+    writer.put([(1, "third version", "HR")])
+    writer.save()  # the blob before the previous one is gone now
+    assert len([n for n in os.listdir(path) if n.endswith(".bin")]) == 2
+
+
+def test_keep_refreshes_stale_text(tmp_path):
+    sink = DocStoreSink(str(tmp_path))
+    sink.add([IngestRecord(1, "old text", "HR", "t")])
+    sink.keep([IngestRecord(1, "new text", "HR", "t"), IngestRecord(2, "missing", "HR", "t")])
+    assert sink.store.text(1) == "new text" and sink.store.text(2) == "missing"
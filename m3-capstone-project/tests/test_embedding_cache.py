@@ -0,0 +1,63 @@
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from agent_humancapital.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_memory_tier_dedupes_and_normalizes():
+    inner = CountingEmbeddings()
+    emb = CachedEmbeddings(inner, model="m", memory_size=8)
+    first = emb.embed_documents(["data analyst", "data  analyst\n", "python"])
+    assert first[0] == first[1]
+    assert inner.calls == [["data analyst", "python"]]
+    assert emb.embed_query("python") == first[2]
+    assert len(inner.calls) == 1
+    assert emb.stats()["memory_hits"] == 1
+
+
+def test_disk_tier_survives_restart_and_model_change(tmp_path):
+    path = str(tmp_path / "emb.sqlite")
+    inner = CountingEmbeddings()
+    CachedEmbeddings(inner, model="m1", disk_path=path).embed_query("sql")
+
+    again = CachedEmbeddings(inner, model="m1", disk_path=path)
+    assert again.embed_query("sql") == [3.0, 1.0]
+    assert len(inner.calls) == 1
+    assert again.stats()["disk_hits"] == 1
+
+    other = CachedEmbeddings(inner, model="m2", disk_path=path)
+    assert other.stats()["disk_size"] == 0
+    other.embed_query("sql")
+    assert len(inner.calls) == 2
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path, monkeypatch):
+    from agent_humancapital import embedding_cache
+
+    clock = iter(range(1000))
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(clock)))
+    inner = CountingEmbeddings()
+    # no memory tier, so every read goes to disk
+    emb = CachedEmbeddings(inner, model="m", memory_size=0, disk_path=str(tmp_path / "emb.sqlite"), max_disk_rows=2)
+    emb.embed_query("hot")
+    emb.embed_query("cold")
+    emb.embed_query("hot")  # disk hit refreshes last_used
+    emb.embed_query("new")  # evicts "cold", the least recently used
+    calls = len(inner.calls)
+    emb.embed_query("hot")
+    assert len(inner.calls) == calls
+    emb.embed_query("cold")
+    assert len(inner.calls) == calls + 1
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from agent_humancapital.orchestration.executor import DagExecutor, WorkerNode
+
+
+def test_independent_nodes_run_concurrently():
+    def slow(name):
+        def fn(deps, cancel):
+            time.sleep(0.2)
+            return name
+        return fn
+
+    nodes = [
+        WorkerNode("a", lambda deps, cancel: 1),
+        WorkerNode("b", slow("b"), deps=["a"]),
+        WorkerNode("c", slow("c"), deps=["a"]),
+        WorkerNode("d", lambda deps, cancel: sorted(deps.values()), deps=["b", "c"]),
+    ]
+    started = time.perf_counter()
+    out = DagExecutor(max_workers=4).run(nodes)
+    assert time.perf_counter() - started < 0.35
+    assert out["d"].result == ["b", "c"]
+    assert all(o.status == "ok" for o in out.values())
+
+
+def test_timeout_and_failure_skip_dependents():
+    def hang(deps, cancel):
+        cancel.wait(2)
+        return "late"
+
+    def boom(deps, cancel):
+        raise RuntimeError("nope")
+
+    nodes = [
+        WorkerNode("slow", hang, timeout=0.05),
+        WorkerNode("after_slow", lambda deps, cancel: 1, deps=["slow"]),
+        WorkerNode("bad", boom),
+        WorkerNode("after_bad", lambda deps, cancel: 1, deps=["bad"]),
+        WorkerNode("after_after", lambda deps, cancel: 1, deps=["after_bad"]),
+    ]
+    out = DagExecutor().run(nodes)
+    assert out["slow"].status == "timeout"
+    assert out["bad"].status == "error" and "nope" in out["bad"].error
+    assert {out[n].status for n in ("after_slow", "after_bad", "after_after")} == {"skipped"}
+
+
+def test_cycle_is_rejected():
+    nodes = [WorkerNode("a", lambda d, c: 1, deps=["b"]), WorkerNode("b", lambda d, c: 1, deps=["a"])]
+    with pytest.raises(ValueError):
+        DagExecutor().run(nodes)
@@ -0,0 +1,95 @@
+import numpy as np
+
+from agent_humancapital.filters import SearchFilter, parse_filters, years_experience
+from agent_humancapital.lexical_index import BM25Builder
+from agent_humancapital.llm import HashEmbeddings
+from agent_humancapital.local_index import LocalVectorStore
+
+CATEGORIES = ["HR", "INFORMATION-TECHNOLOGY", "FINANCE"]
+
+
+def test_parse_filters():
+    f = parse_filters("category: information technology, 5+ years, kubernetes", CATEGORIES)
+    assert f == SearchFilter(category="INFORMATION-TECHNOLOGY", min_years=5)
+    assert parse_filters("category: hr, under 3 years", CATEGORIES).to_dict() == {"category": "HR", "max_years": 3}
+    assert parse_filters("more than 4 years of payroll").min_years == 5
+    assert not parse_filters("find python developers", CATEGORIES)
+    # only the explicit marker filters; unknown names are dropped, not passed through
+    assert not parse_filters("interview questions for a finance data analyst", CATEGORIES)
+    assert not parse_filters("find hr people in information technology", CATEGORIES)
+    assert not parse_filters("category: astronauts", CATEGORIES)
+    assert not parse_filters("category: hrx managers", CATEGORIES)  # whole words only
+    assert years_experience("3 years at X, then 12+ years at Y; born 1985") == 12
+
+
+def test_parse_filters_category_followed_by_more_words():
+    assert parse_filters("category: HR find python devs", CATEGORIES).category == "HR"
+    f = parse_filters("category: information technology with 5+ years", CATEGORIES)
+    assert f == SearchFilter(category="INFORMATION-TECHNOLOGY", min_years=5)
+    assert parse_filters("kategori=finance analysts", CATEGORIES).category == "FINANCE"
+    # the longest known name wins
+    assert parse_filters("category: data science lead", ["DATA", "DATA-SCIENCE"]).category == "DATA-SCIENCE"
+
+
+def test_category_matching_ignores_case():
+    flt = SearchFilter(category="INFORMATION-TECHNOLOGY")
+    assert flt.matches({"category": "information-technology"}) and flt.matches({"category": "Information Technology"})
+    assert not flt.matches({"category": "HR"})
+    cats = np.array(["HR", "information-technology", "", "Information-Technology"], dtype=object)
+    assert flt.mask(lambda name: cats).tolist() == [False, True, False, True]
+    assert "INFORMATION-TECHNOLOGY" in flt.to_qdrant().must[0].match.any
+
+
+def test_qdrant_filter_conditions():
+    flt = SearchFilter(category="HR", min_years=2).to_qdrant()
+    keys = [c.key for c in flt.must]
+    assert keys == ["metadata.category", "metadata.years_experience"]
+    assert flt.must[1].range.gte == 2 and flt.must[1].range.lte is None
+
+
+def test_local_filtered_search_returns_full_k(tmp_path):
+    store = LocalVectorStore(str(tmp_path), HashEmbeddings(dim=32))
+    texts = [f"python engineer {i}" for i in range(40)]
+    metas = [{"row_index": i, "category": "HR" if i % 10 == 0 else "IT", **({"years_experience": i} if i % 2 == 0 else {})}
+             for i in range(40)]
+    store.add_texts(texts, metas)
+
+    hits = store.similarity_search_with_score("python engineer", k=3, filter=SearchFilter(category="hr"))
+    assert len(hits) == 3 and {d.metadata["category"] for d, _ in hits} == {"HR"}
+    hits = store.similarity_search_with_score("python engineer", k=50, filter=SearchFilter(category="HR", min_years=15))
+    assert sorted(d.metadata["row_index"] for d, _ in hits) == [20, 30]
+
+    store.add_texts(["python hr lead"], [{"row_index": 40, "category": "HR", "years_experience": 20}])
+    hits = store.similarity_search_with_score("python", k=50, filter=SearchFilter(min_years=20))
+    assert sorted(d.metadata["row_index"] for d, _ in hits) == [20, 22, 24, 26, 28, 30, 32, 34, 36, 38, 40]
+
+
+def test_bm25_mask(tmp_path):
+    b = BM25Builder()
+    b.add(0, "python sql", "IT", years=2)
+    b.add(1, "python payroll", "HR", years=8)
+    b.add(2, "python", "HR")
+    index = b.build()
+    flt = SearchFilter(category="HR", min_years=5)
+    assert [r for r, _ in index.search("python", k=5, mask=flt.mask(index.column))] == [1]
+    index.save(str(tmp_path))
+    loaded = type(index).load(str(tmp_path))
+    assert [r for r, _ in loaded.search("python", k=5, mask=flt.mask(loaded.column))] == [1]
+
+
+def test_local_filter_columns_are_persisted(tmp_path):
+    store = LocalVectorStore(str(tmp_path), HashEmbeddings(dim=32))
+    store.add_texts(["python a", "python b"], [{"row_index": 0, "category": "HR", "years_experience": 3}, {"row_index": 1}])
+    store.add_texts(["python c"], [{"row_index": 2, "category": "IT", "years_experience": 9}])
+
+    reopened = LocalVectorStore(str(tmp_path), HashEmbeddings(dim=32))
+    reopened._payloads = None  # filter columns must not need the payloads
+    assert reopened.column("category").tolist() == ["HR", "", "IT"]
+    assert SearchFilter(category="it", min_years=5).mask(reopened.column).tolist() == [False, False, True]
+
+    # stores written before the column files existed are caught up from the payloads once
+    for name in ("col.category.i32", "col.category.json", "col.years_experience.f64"):
+        (tmp_path / name).unlink()
+    legacy = LocalVectorStore(str(tmp_path), HashEmbeddings(dim=32))
+    assert np.isnan(legacy.column("years_experience")[1]) and legacy.column("category").tolist() == ["HR", "", "IT"]
+    assert (tmp_path / "col.category.i32").exists()
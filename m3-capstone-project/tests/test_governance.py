@@ -0,0 +1,45 @@
+from agent_humancapital.tools.governance_scanner import GovernanceScanner, Rule
+from agent_humancapital.tools.governance_tools import (
+    bias_checker,
+    governance_scan,
+    governance_scan_batch,
+    governance_stream,
+    risk_detector,
+)
+
+
+def test_single_pass_findings_use_word_boundaries():
+    res = governance_scan("Managed language teams; mail jo@corp.io. We guarantee a young, married hire.")
+    assert "jo@corp.io" not in res.text and "[REDACTED_EMAIL]" in res.text
+    assert res.bias == "Bias warning: detected potentially sensitive terms ['married', 'young']."
+    assert res.risk == "Risk: overconfident claim detected."
+    assert bias_checker("manage the language stack") == "OK"
+    assert risk_detector("100% uptime") != "OK"
+
+
+def test_batch_and_custom_rules():
+    assert [r.bias for r in governance_scan_batch(["old school", "bold move"])][1] == "OK"
+    scanner = GovernanceScanner([
+        Rule.from_dict({"name": "nik", "kind": "pii", "pattern": r"\b\d{16}\b"}),
+        Rule.from_dict({"name": "salary", "kind": "risk", "terms": ["salary"], "message": "Risk: salary talk."}),
+    ])
+    res = scanner.scan("NIK 3174012345678901, Salary talk")
+    assert res.text == "NIK [REDACTED_NIK], Salary talk"
+    assert res.risk == "Risk: salary talk."
+
+
+def test_stream_redacts_values_split_across_chunks():
+    text = "Reach the candidate at someone.long@example.com or +62 812-3456-7890 to manage onboarding for a male engineer."
+    stream = governance_stream(hold=32)
+    out = "".join(stream.feed(text[i:i + 7]) for i in range(0, len(text), 7)) + stream.flush()
+    assert out == governance_scan(text).text
+    assert stream.bias == "Bias warning: detected potentially sensitive terms ['male']."
+    assert [f.start for f in stream.findings] == [f.start for f in governance_scan(text).findings]
+
+
+def test_stream_does_not_cut_inside_a_phone_number_with_spaces():
+    stream = governance_stream(hold=5)
+    out = stream.feed("call 555 123 4567,abcdefghij")
+    assert "555" not in out
+    out += stream.flush()
+    assert out == governance_scan("call 555 123 4567,abcdefghij").text and "[REDACTED_PHONE]" in out
@@ -0,0 +1,178 @@
+from typing import List
+
+from agent_humancapital.ingestion.pipeline import IngestManifest, IngestionPipeline, IngestRecord
+from agent_humancapital.llm import HashEmbeddings
+from agent_humancapital.local_index import LocalVectorStore
+
+
+class CountingEmbeddings(HashEmbeddings):
+    def __init__(self):
+        super().__init__(dim=32)
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def _records(texts):
+    return [IngestRecord(row_index=i, text=t, category="IT", source="test.xlsx") for i, t in enumerate(texts)]
+
+
+def _pipeline(tmp_path, emb, **kwargs):
+    store = LocalVectorStore(str(tmp_path / "vectors"), emb)
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite"))
+    return store, IngestionPipeline(store, manifest, batch_size=2, workers=2, **kwargs)
+
+
+def test_rerun_is_idempotent_and_incremental(tmp_path):
+    emb = CountingEmbeddings()
+    texts = ["python sql", "java spring", "", "aws terraform", "excel reporting"]
+    store, pipe = _pipeline(tmp_path, emb)
+
+    stats = pipe.run(_records(texts))
+    assert stats.upserted == 4 and stats.skipped_empty == 1
+    assert len(store) == 4
+
+    texts[1] = "java spring kafka"
+    stats = pipe.run(_records(texts))
+    assert stats.unchanged == 3 and stats.upserted == 1 and stats.deleted == 1
+    assert emb.embedded[-1] == "java spring kafka"
+    assert len(store) == 4
+
+
+def test_failed_batch_is_retried_on_next_run(tmp_path):
+    emb = CountingEmbeddings()
+    store, pipe = _pipeline(tmp_path, emb)
+    original = store.add_texts
+    calls = {"n": 0}
+
+    def flaky(texts, metadatas=None, **kw):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("boom")
+        return original(texts, metadatas, **kw)
+
+    store.add_texts = flaky
+    stats = pipe.run(_records(["a b", "c d", "e f", "g h"]))
+    assert stats.failed_batches == 1 and stats.upserted == 2
+
+    store.add_texts = original
+    stats = pipe.run(_records(["a b", "c d", "e f", "g h"]))
+    assert stats.upserted == 2 and stats.unchanged == 2
+    assert len(store) == 4
+
+
+def test_bm25_sink_catches_up_on_unchanged_rows(tmp_path):
+    from agent_humancapital.ingestion.sinks import BM25Sink
+    from agent_humancapital.lexical_index import BM25Index
+
+    texts = ["python sql", "kubernetes terraform", "payroll onboarding"]
+    _, pipe = _pipeline(tmp_path, CountingEmbeddings())
+    pipe.run(_records(texts))
+
+    # Index added after the vector store was already populated
+    pipe.sinks = [BM25Sink(str(tmp_path / "index"))]
+    stats = pipe.run(_records(texts))
+    assert stats.unchanged == 3
+    index = BM25Index.load(str(tmp_path / "index" / "bm25"))
+    assert index.search("terraform", k=1)[0][0] == 1
+
+
+def test_sinks_refresh_rows_changed_after_their_last_save(tmp_path):
+    from agent_humancapital.ingestion.sinks import BM25Sink, SkillIndexSink
+    from agent_humancapital.lexical_index import BM25Index
+    from agent_humancapital.skill_index import SkillIndex
+
+    index_dir = str(tmp_path / "index")
+    sinks = [BM25Sink(index_dir), SkillIndexSink(index_dir)]
+    for sink in sinks:
+        sink.add(_records(["python sql", "payroll onboarding"]))
+        sink.close()
+
+    # the vector store and manifest took the edit, the sinks were never saved
+    edited = _records(["python sql", "kubernetes terraform"])
+    sinks = [BM25Sink(index_dir), SkillIndexSink(index_dir)]
+    for sink in sinks:
+        sink.keep(edited)
+        sink.close()
+    bm25 = BM25Index.load(str(tmp_path / "index" / "bm25"))
+    assert bm25.search("kubernetes", k=1)[0][0] == 1 and not bm25.search("payroll", k=1)
+    skills = SkillIndex.load(str(tmp_path / "index" / "skills"))
+    assert "kubernetes" in skills.skills_of(1) and "payroll" not in skills.skills_of(1)
+
+    # nothing changed: keep does not rewrite
+    sinks = [BM25Sink(index_dir), SkillIndexSink(index_dir)]
+    for sink in sinks:
+        sink.keep(edited)
+    assert not any(sink._dirty for sink in sinks)
+
+
+def test_redaction_happens_once_at_ingest(tmp_path):
+    import functools
+    from agent_humancapital.ingestion.redaction import open_pii_index, redact_record, restore_pii
+    from agent_humancapital.ingestion.sinks import PIISpanSink
+    from agent_humancapital.tools.governance_tools import get_scanner
+
+    raw = "Data analyst, mail ana@example.com or +62 812-3456-7890. Python, SQL."
+    store = LocalVectorStore(str(tmp_path / "vectors"), HashEmbeddings(dim=32))
+    pipe = IngestionPipeline(
+        store, IngestManifest(str(tmp_path / "manifest.sqlite")),
+        sinks=[PIISpanSink(str(tmp_path / "index"))],
+        redactor=functools.partial(redact_record, scanner=get_scanner()),
+    )
+    assert pipe.run(_records([raw])).upserted == 1
+
+    doc, _ = store.similarity_search_with_score("data analyst", k=1)[0]
+    assert "ana@example.com" not in doc.page_content and "812" not in doc.metadata["preview"]
+    assert doc.metadata["pii_redacted"] is True
+
+    spans = open_pii_index(str(tmp_path / "index")).get(0)
+    assert [s[0] for s in spans] == ["email", "phone"]
+    assert restore_pii(doc.page_content, spans) == raw
+
+
+def test_sources_do_not_collide_in_sinks(tmp_path):
+    from agent_humancapital.docstore import DocStore
+    from agent_humancapital.ingestion.sinks import BM25Sink, DocStoreSink, SkillIndexSink
+    from agent_humancapital.lexical_index import BM25Index
+
+    store, pipe = _pipeline(tmp_path, CountingEmbeddings())
+    index_dir = str(tmp_path / "index")
+    pipe.sinks = [BM25Sink(index_dir), DocStoreSink(index_dir), SkillIndexSink(index_dir)]
+    pipe.run(_records(["python sql", "payroll onboarding"]))
+    second = [IngestRecord(row_index=i, text=t, category="HR", source="other.csv")
+              for i, t in enumerate(["kubernetes terraform", "tableau dashboards"])]
+    pipe.sinks = [BM25Sink(index_dir), DocStoreSink(index_dir), SkillIndexSink(index_dir)]
+    pipe.run(second)
+
+    docs = DocStore.load(str(tmp_path / "index" / "docs"))
+    assert len(docs) == 4
+    assert docs.text(0) == "python sql"  # the first source keeps row_index as its id
+    other = pipe.manifest.doc_id("other.csv", 0)
+    assert other != 0 and docs.text(other) == "kubernetes terraform"
+    assert BM25Index.load(str(tmp_path / "index" / "bm25")).search("terraform", k=1)[0][0] == other
+    hits = store.similarity_search_with_score("kubernetes terraform", k=4)
+    assert len({d.metadata["doc_id"] for d, _ in hits}) == 4
+
+
+def test_legacy_qdrant_points_are_migrated():
+    from qdrant_client import QdrantClient, models
+
+    from agent_humancapital.ingestion.pipeline import delete_legacy_points, ensure_qdrant_collection
+
+    client = QdrantClient(":memory:")
+    assert ensure_qdrant_collection(client, "resumes", 4)
+    client.upsert("resumes", [
+        # baseline ingest: random uuid4 id, no content hash in the payload
+        models.PointStruct(id="8a1f6c1e-0000-4000-8000-000000000001", vector=[1, 0, 0, 0], payload={"metadata": {"row_index": 0}}),
+        models.PointStruct(id="8a1f6c1e-0000-4000-8000-000000000002", vector=[1, 0, 0, 0],
+                           payload={"metadata": {"row_index": 0, "content_hash": "ab12"}}),
+    ])
+    assert delete_legacy_points(client, "resumes") == 1
+    assert delete_legacy_points(client, "resumes") == 0
+    assert client.count("resumes").count == 1
+
+    assert not ensure_qdrant_collection(client, "resumes", 4)
+    assert ensure_qdrant_collection(client, "resumes", 4, recreate=True)  # --full
+    assert client.count("resumes").count == 0
@@ -0,0 +1,63 @@
+from agent_humancapital.lexical_index import BM25Builder, BM25Index, tokenize
+from agent_humancapital.tools.retrieval_tools import reciprocal_rank_fusion
+
+
+def _index():
+    b = BM25Builder()
+    b.add(0, "Python SQL data analyst, Tableau dashboards", "DATA")
+    b.add(1, "DevOps engineer: Kubernetes, Terraform, AWS and Kubernetes operators", "IT")
+    b.add(2, "HR generalist, payroll and onboarding", "HR")
+    b.add(3, "Backend engineer Java, some Terraform", "IT")
+    return b.build()
+
+
+def test_tokenize_keeps_skill_symbols():
+    assert tokenize("C++ and C# with the Node") == ["c++", "c#", "node"]
+
+
+def test_bm25_ranks_exact_skills(tmp_path):
+    index = _index()
+    hits = index.search("kubernetes terraform", k=3)
+    assert [h[0] for h in hits] == [1, 3]
+    assert index.document(1)["category"] == "IT"
+
+    index.save(str(tmp_path))
+    loaded = BM25Index.load(str(tmp_path))
+    assert loaded.search("kubernetes terraform", k=3) == hits
+
+    builder = loaded.to_builder()
+    builder.remove(1)
+    assert [h[0] for h in builder.build().search("terraform", k=3)] == [3]
+
+
+def test_rrf_prefers_candidates_in_both_lists():
+    semantic = [{"id": 1, "score": 0.9}, {"id": 2, "score": 0.8}, {"id": 3, "score": 0.7}]
+    keyword = [{"id": 3, "score": 0.0, "bm25_score": 4.2}, {"id": 4, "score": 0.0, "bm25_score": 1.0}]
+    fused = reciprocal_rank_fusion([semantic, keyword])["results"]
+    assert fused[0]["id"] == 3
+    assert fused[0]["score"] == 0.7 and fused[0]["bm25_score"] == 4.2
+    assert {r["id"] for r in fused} == {1, 2, 3, 4}
+
+
+def test_keyword_only_hits_get_a_comparable_score(monkeypatch):
+    from dataclasses import replace
+
+    from agent_humancapital.config import SETTINGS
+    from agent_humancapital.tools import retrieval_tools
+    from agent_humancapital.tools.ranking_tools import normalize_semantic
+
+    monkeypatch.setattr(retrieval_tools, "load_bm25_index", lambda path: _index())
+    semantic = [{"id": 0, "score": 0.8}, {"id": 2, "score": 0.4}]
+    hits = retrieval_tools.keyword_search("kubernetes terraform", semantic, k=3)["results"]
+    # the best lexical hit sits level with the best semantic hit, not at 0.0
+    assert [h["id"] for h in hits] == [1, 3]
+    assert hits[0]["score"] == 0.8 and 0.0 < hits[1]["score"] < 0.8
+    fused = reciprocal_rank_fusion([semantic, hits])["results"]
+    assert {r["id"]: r["score"] for r in fused} == {0: 0.8, 1: 0.8, 2: 0.4, 3: hits[1]["score"]}
+
+    # distance backends: the score is a distance the ranking inverts back
+    monkeypatch.setattr(retrieval_tools, "SETTINGS", replace(SETTINGS, VECTOR_DISTANCE="euclid"))
+    semantic = [{"id": 0, "score": 0.25}]
+    hits = retrieval_tools.keyword_search("kubernetes terraform", semantic, k=3)["results"]
+    assert abs(hits[0]["score"] - 0.25) < 1e-9
+    assert normalize_semantic([hits[1]["score"]], "euclid")[0] < normalize_semantic([0.25], "euclid")[0]
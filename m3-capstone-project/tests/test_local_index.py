@@ -0,0 +1,123 @@
+from dataclasses import replace
+
+from agent_humancapital import resources
+from agent_humancapital.config import SETTINGS
+from agent_humancapital.llm import HashEmbeddings
+from agent_humancapital.local_index import LocalVectorStore
+from agent_humancapital.tools.retrieval_tools import semantic_search
+
+DOCS = [
+    ("python sql data analyst dashboards", "DATA-ANALYST"),
+    ("java spring backend engineer microservices", "ENGINEERING"),
+    ("recruiting onboarding payroll hr generalist", "HR"),
+    ("kubernetes terraform aws devops engineer", "ENGINEERING"),
+]
+
+
+def _store(path, **kwargs):
+    store = LocalVectorStore(str(path), HashEmbeddings(dim=64), **kwargs)
+    store.add_texts(
+        [t for t, _ in DOCS],
+        [{"row_index": i, "category": c} for i, (_, c) in enumerate(DOCS)],
+        ids=[str(i) for i in range(len(DOCS))],
+    )
+    return store
+
+
+def test_exact_search_and_reopen(tmp_path):
+    _store(tmp_path)
+    store = LocalVectorStore(str(tmp_path), HashEmbeddings(dim=64))
+    hits = store.similarity_search_with_score("devops kubernetes aws", k=2)
+    assert hits[0][0].metadata["row_index"] == 3
+    assert hits[0][1] >= hits[1][1]
+    assert len(store) == 4
+
+
+def test_upsert_same_id_replaces_row(tmp_path):
+    store = _store(tmp_path)
+    store.add_texts(["nurse icu patient care"], [{"row_index": 0, "category": "HEALTHCARE"}], ids=["0"])
+    assert len(store) == 4
+    hits = store.similarity_search_with_score("nurse icu patient care", k=4)
+    categories = [d.metadata["category"] for d, _ in hits]
+    assert categories.count("DATA-ANALYST") == 0
+    assert hits[0][0].metadata["category"] == "HEALTHCARE"
+
+
+def test_ivf_search_matches_exact_on_small_corpus(tmp_path):
+    store = _store(tmp_path, ann_min_docs=1, nprobe=2)
+    store.build_ivf(n_lists=2)
+    hits = store.similarity_search_with_score("python sql data analyst dashboards", k=1)
+    assert hits[0][0].metadata["row_index"] == 0
+
+
+def test_semantic_search_shape_on_local_backend(tmp_path, monkeypatch):
+    _store(tmp_path)
+    settings = replace(SETTINGS, VECTOR_BACKEND="local", LOCAL_INDEX_DIR=str(tmp_path))
+    registry = resources.ResourceRegistry(settings)
+    registry._embeddings = HashEmbeddings(dim=64)
+    monkeypatch.setattr(resources, "_REGISTRY", registry)
+
+    out = semantic_search("java backend", k=2)
+    first = out["results"][0]
+    # compact record: no payload metadata, full text only on demand
+    assert set(first) == {"id", "category", "score", "preview", "point_id"}
+    assert first["id"] == 1
+    assert first.text().startswith(first["preview"][:20])
+    assert registry.health()["documents"] == 4
+
+
+def test_semantic_search_batch_matches_single_queries(tmp_path, monkeypatch):
+    from agent_humancapital.tools.retrieval_tools import semantic_search_batch
+
+    _store(tmp_path)
+    settings = replace(SETTINGS, VECTOR_BACKEND="local", LOCAL_INDEX_DIR=str(tmp_path))
+    registry = resources.ResourceRegistry(settings)
+    registry._embeddings = HashEmbeddings(dim=64)
+    monkeypatch.setattr(resources, "_REGISTRY", registry)
+
+    queries = ["java backend", "payroll onboarding"]
+    batch = semantic_search_batch(queries, k=2)
+    assert [b["results"] for b in batch] == [semantic_search(q, k=2)["results"] for q in queries]
+
+
+def test_qdrant_batch_hits_keep_point_ids():
+    from types import SimpleNamespace
+
+    from langchain_qdrant import QdrantVectorStore
+    from qdrant_client import models
+
+    from agent_humancapital.tools.retrieval_tools import _to_results
+    from agent_humancapital.vectorstore import search_batch_by_vectors
+
+    point = models.ScoredPoint(
+        id="7f3c2a1e-0000-4000-8000-000000000001", version=0, score=0.9,
+        payload={"page_content": "java backend", "metadata": {"doc_id": 1, "category": "IT"}},
+    )
+    client = SimpleNamespace(query_batch_points=lambda collection_name, requests: [SimpleNamespace(points=[point])] * len(requests))
+    vs = QdrantVectorStore(
+        client=client, collection_name="resumes", embedding=HashEmbeddings(dim=8),
+        validate_embeddings=False, validate_collection_config=False,
+    )
+    hits = search_batch_by_vectors(vs, [[0.0] * 8, [1.0] * 8], k=1)
+    # candidate_texts falls back to the point id when there is no DocStore
+    assert [r.point_id for h in hits for r in _to_results(h)] == [str(point.id)] * 2
+
+
+def test_paged_search_matches_single_search(tmp_path):
+    store = _store(tmp_path)
+    vector = store.embeddings.embed_query("engineer aws")
+    pages = list(store.iter_search_by_vector(vector, k=3, page_size=2))
+    assert [len(p) for p in pages] == [2, 1]
+    single = store.similarity_search_with_score_by_vector(vector, k=3)
+    assert [d.id for p in pages for d, _ in p] == [d.id for d, _ in single]
+
+
+def test_ivf_survives_incremental_adds_and_reopen(tmp_path):
+    store = _store(tmp_path, ann_min_docs=1, nprobe=2)
+    store.build_ivf(n_lists=2)
+    store.add_texts(["nurse icu patient care"], [{"row_index": 4, "category": "HEALTHCARE"}], ids=["4"])
+
+    reopened = LocalVectorStore(str(tmp_path), HashEmbeddings(dim=64), ann_min_docs=1, nprobe=2)
+    assert reopened._ivf is not None and reopened._ivf["assign"].tolist() == store._ivf["assign"].tolist()
+    hits = reopened.similarity_search_with_score("nurse icu patient care", k=1)
+    assert hits[0][0].metadata["row_index"] == 4
@@ -0,0 +1,43 @@
+import time
+
+from agent_humancapital.metrics import METRICS, MetricsRegistry, SamplingProfiler, span, timed
+
+
+def test_histogram_percentiles_and_prometheus_export():
+    reg = MetricsRegistry()
+    for ms in range(1, 101):
+        reg.observe("hc_tool_seconds", ms / 1000, {"tool": "semantic_search"})
+    (series,) = reg.snapshot()["hc_tool_seconds"]
+    assert series["count"] == 100 and 49 <= series["p50"] <= 51 and series["p99"] >= 98
+
+    text = reg.prometheus()
+    assert "# TYPE hc_tool_seconds histogram" in text
+    assert 'hc_tool_seconds_bucket{tool="semantic_search",le="0.01"} 10' in text
+    assert 'hc_tool_seconds_bucket{tool="semantic_search",le="+Inf"} 100' in text
+    assert 'hc_tool_seconds_count{tool="semantic_search"} 100' in text
+
+
+def test_span_and_timed_record_into_global_registry():
+    METRICS.reset()
+
+    @timed("hc_test_seconds", fn="double")
+    def double(x):
+        return 2 * x
+
+    assert double(2) == 4
+    with span("hc_test_seconds", fn="block") as s:
+        time.sleep(0.002)
+    assert s.ms >= 2
+    counts = {tuple(r["labels"].items()): r["count"] for r in METRICS.snapshot()["hc_test_seconds"]}
+    assert counts == {(("fn", "double"),): 1, (("fn", "block"),): 1}
+
+
+def test_sampling_profiler_sees_busy_function():
+    def busy_loop_for_profiler():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    with SamplingProfiler(interval=0.002) as prof:
+        busy_loop_for_profiler()
+    assert any("busy_loop_for_profiler" in name for name, _ in prof.top(50))
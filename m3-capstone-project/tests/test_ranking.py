@@ -0,0 +1,54 @@
+from agent_humancapital.lexical_index import BM25Builder
+from agent_humancapital.tools.ranking_tools import jd_matcher, jd_terms, normalize_semantic, ranking_candidates, ranking_candidates_stream
+
+CANDS = [
+    {"id": 1, "score": 0.80, "preview": "Java developer, Spring"},
+    {"id": 2, "score": 0.70, "preview": "Python, SQL and AWS (data engineer)"},
+    {"id": 3, "score": 0.75, "preview": "python developer"},
+]
+
+
+def test_ranking_matches_overlap_score():
+    ranked = ranking_candidates(CANDS, "python sql aws")["ranked"]
+    assert [c["id"] for c in ranked] == [2, 3, 1]
+    assert ranked[0]["jd_match_score"] == 1.0
+    assert ranked[0]["matched_terms"] == ["aws", "python", "sql"]
+    assert jd_matcher("python sql aws", "python developer")["score"] == ranked[1]["jd_match_score"]
+
+
+def test_top_n_and_weights():
+    # a rare term ("aws") outweighs common ones
+    weights = {"python": 0.1, "sql": 0.1, "aws": 5.0}.get
+    ranked = ranking_candidates(CANDS, "python sql aws", term_weights=weights, top_n=2)["ranked"]
+    assert len(ranked) == 2 and ranked[0]["id"] == 2
+
+
+def test_stopwords_are_not_weighted_as_rare_terms():
+    b = BM25Builder()
+    b.add(0, "python developer", "IT")
+    b.add(1, "java developer", "IT")
+    assert jd_terms("Python developer with the SQL skills and more") == ["developer", "more", "python", "skills", "sql"]
+    # "with"/"the"/"and" would otherwise take the max weight and dilute the match
+    ranked = ranking_candidates(CANDS, "python with the and for", term_weights=b.build().idf)["ranked"]
+    assert ranked[0]["matched_terms"] == ["python"] and ranked[0]["jd_match_score"] == 1.0
+
+
+def test_distance_scores_are_inverted():
+    sims = normalize_semantic([0.0, 1.0], metric="euclid")
+    assert sims[0] > sims[1]
+    assert list(normalize_semantic([-0.2, 1.3])) == [0.0, 1.0]
+
+
+def test_ranked_records_keep_dict_access():
+    ranked = ranking_candidates([{**CANDS[0], "metadata": {"big": "payload"}}], "java")["ranked"]
+    rec = ranked[0]
+    assert rec.get("metadata") is None and "bm25_score" not in rec
+    assert dict(rec)["combined_score"] == rec.combined_score
+
+
+def test_stream_ranking_keeps_bounded_top_n():
+    batches = [CANDS[:1], [], CANDS[1:]]
+    out = ranking_candidates_stream(iter(batches), "python sql aws", top_n=2)
+    expected = ranking_candidates(CANDS, "python sql aws", top_n=2)["ranked"]
+    assert out["considered"] == 3
+    assert [c.to_dict() for c in out["ranked"]] == [c.to_dict() for c in expected]
@@ -0,0 +1,72 @@
+from dataclasses import replace
+
+import pytest
+
+from agent_humancapital.config import SETTINGS
+from agent_humancapital.resources import ResourceRegistry, get_registry, shutdown_registry
+
+QDRANT = {"VECTOR_BACKEND": "qdrant", "QDRANT_URL": "http://localhost:6333", "QDRANT_API_KEY": "test-key"}
+
+
+class FakeQdrantClient:
+    """Stands in for qdrant_client.QdrantClient; `collection` is True / False or an exception to raise."""
+
+    collection = True
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+        FakeQdrantClient.instances.append(self)
+
+    def collection_exists(self, name):
+        if isinstance(self.collection, Exception):
+            raise self.collection
+        return self.collection
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_qdrant(monkeypatch):
+    import qdrant_client
+
+    FakeQdrantClient.instances = []
+    monkeypatch.setattr(qdrant_client, "QdrantClient", FakeQdrantClient)
+    return FakeQdrantClient
+
+
+def test_registry_reuses_objects(fake_qdrant):
+    reg = ResourceRegistry(replace(SETTINGS, **QDRANT))
+    client = reg.client
+    assert reg.client is client and len(fake_qdrant.instances) == 1
+    assert client.kwargs["url"] == "http://localhost:6333" and client.kwargs["api_key"] == "test-key"
+    assert reg.embeddings is reg.embeddings
+    reg.close()
+    assert client.closed
+    assert reg.client is not client and len(fake_qdrant.instances) == 2
+
+
+def test_health_reports_errors_without_raising(fake_qdrant, monkeypatch):
+    reg = ResourceRegistry(replace(SETTINGS, **QDRANT, QDRANT_COLLECTION_NAME="resumes"))
+    assert reg.health()["status"] == "ok"
+    monkeypatch.setattr(fake_qdrant, "collection", False)
+    assert reg.health()["status"] == "missing_collection"
+    monkeypatch.setattr(fake_qdrant, "collection", ConnectionError("connection refused"))
+    health = reg.health()
+    assert health["status"] == "error" and health["error"] == "connection refused"
+    assert health["latency_ms"] >= 0
+    reg.close()
+
+
+def test_get_registry_singleton():
+    assert get_registry() is get_registry()
+    shutdown_registry()
+
+
+def test_credentials_are_checked_when_the_client_is_built():
+    reg = ResourceRegistry(replace(SETTINGS, QDRANT_URL=""))
+    assert reg.embeddings is not None  # hash embeddings need no credentials
+    with pytest.raises(ValueError, match="QDRANT_URL"):
+        reg.client
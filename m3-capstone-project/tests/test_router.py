@@ -1,4 +1,4 @@
-from agent_humancapital.orchestration.router import route
+from agent_humancapital.orchestration.router import INTENT_EXAMPLES, route
 
 def test_route_retrieval():
     p = route("find candidates data analyst")
@@ -7,3 +7,41 @@ def test_route_retrieval():
 def test_route_interview():
     p = route("generate interview questions for candidate")
     assert "interview" in p.workers
+
+def test_multi_intent_plan():
+    p = route("rank candidates for this JD and show skill gaps")
+    assert p.intent == "SKILL_ANALYSIS" and p.intents == ["SKILL_ANALYSIS", "RANK_AND_MATCH"]
+    assert p.workers == ["retrieval", "ranking", "skill"]
+
+def test_keywords_match_whole_words():
+    # "risk" in a JD no longer routes to governance; "matchmaking" is not "match"
+    assert route("find candidates for a credit risk analyst").workers == ["retrieval"]
+    assert route("rbac policy for recruiters").intent == "GOVERNANCE_CHECK"
+
+def test_semantic_fallback_and_memoization():
+    # unseen wording: not one of INTENT_EXAMPLES and no routing keyword
+    q = "things to ask a java applicant during the conversation"
+    assert q not in {t for ex in INTENT_EXAMPLES.values() for t in ex}
+    p = route(q)
+    assert p.intent == "INTERVIEW_PREP" and p.notes.startswith("semantic routing (")
+    again = route("Things to ask a Java applicant  during the conversation")
+    assert again == p and again is not p
+    assert route("zzz qqq").intent == "GENERAL_QA"
+
+def test_semantic_failure_is_not_memoized(monkeypatch):
+    from agent_humancapital.orchestration import router
+
+    calls = []
+
+    class Flaky:
+        def classify(self, q):
+            calls.append(q)
+            if len(calls) == 1:
+                raise ConnectionError("embeddings down")
+            return "INTERVIEW_PREP", 0.9
+
+    monkeypatch.setattr(router, "_centroids", lambda: Flaky())
+    q = "what would you ask a flaky applicant"
+    assert route(q).notes == "semantic routing unavailable"
+    assert route(q).intent == "INTERVIEW_PREP" and len(calls) == 2
+    assert route(q).intent == "INTERVIEW_PREP" and len(calls) == 2
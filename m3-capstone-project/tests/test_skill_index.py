@@ -0,0 +1,59 @@
+from agent_humancapital.ingestion.pipeline import IngestRecord
+from agent_humancapital.ingestion.sinks import SkillIndexSink
+from agent_humancapital.skill_index import SkillIndex, load_skill_index
+from agent_humancapital.tools.skill_taxonomy import SkillTaxonomy
+
+TAXONOMY = SkillTaxonomy({"python": [], "sql": [], "kubernetes": ["k8s"], "tableau": [], "payroll": []})
+
+
+def test_trends_and_gaps_are_incremental(tmp_path):
+    sink = SkillIndexSink(str(tmp_path), taxonomy=TAXONOMY)
+    sink.add([
+        IngestRecord(0, "Python, SQL and Tableau", "Data Science", "t"),
+        IngestRecord(1, "python and k8s", "IT", "t"),
+        IngestRecord(2, "SQL reporting", "Data Science", "t"),
+    ])
+    index = sink.index
+    assert index.trends("data science")["top_skills"] == [("sql", 2), ("python", 1), ("tableau", 1)]
+    assert index.category_in("what skills trend in data science resumes?") == "Data Science"
+
+    # re-ingesting a row replaces its old skills in the counts
+    sink.add([IngestRecord(2, "payroll only", "Data Science", "t")])
+    assert dict(index.trends("Data Science")["top_skills"]) == {"python": 1, "sql": 1, "tableau": 1, "payroll": 1}
+
+    gap = index.gap(["python", "sql", "rust"], top_n=2)
+    assert gap["unknown"] == ["rust"] and gap["full_match"] == 1
+    assert gap["coverage_by_skill"] == {"python": 2, "sql": 1}
+    assert gap["top_candidates"][0] == {
+        "id": 0, "category": "Data Science", "coverage": 1.0, "matched": ["python", "sql"], "missing": [],
+    }
+
+    sink.close()
+    loaded = load_skill_index(str(tmp_path / "skills"))
+    assert loaded.trends() == index.trends()
+    assert loaded.skills_of(1) == ["kubernetes", "python"]
+    loaded.remove(1)
+    assert dict(loaded.trends()["top_skills"]).get("kubernetes") is None
+
+
+def test_taxonomy_change_rebuilds(tmp_path):
+    sink = SkillIndexSink(str(tmp_path), taxonomy=TAXONOMY)
+    sink.add([IngestRecord(0, "python", "IT", "t")])
+    sink.close()
+
+    changed = SkillTaxonomy({"python": [], "go": []})
+    sink = SkillIndexSink(str(tmp_path), taxonomy=changed)
+    assert len(sink.index) == 0
+    sink.keep([IngestRecord(0, "python and go", "IT", "t")])
+    assert sink.index.skills_of(0) == ["go", "python"]
+    assert isinstance(sink.index, SkillIndex)
+
+
+def test_category_in_matches_whole_words():
+    index = SkillIndex(["python"])
+    for i, cat in enumerate(["HR", "ARTS", "INFORMATION-TECHNOLOGY"]):
+        index.upsert(i, cat, [])
+    assert index.category_in("show the three most common skills") is None
+    assert index.category_in("skill trends for data analysts with charts") is None
+    assert index.category_in("skill trends in hr") == "HR"
+    assert index.category_in("gaps for information-technology resumes") == "INFORMATION-TECHNOLOGY"
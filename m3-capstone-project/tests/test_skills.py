@@ -0,0 +1,32 @@
+from agent_humancapital.tools.skill_taxonomy import SkillTaxonomy
+from agent_humancapital.tools.skill_tools import extract_skills, skill_gap_analysis
+
+
+def test_word_boundaries_and_aliases():
+    text = "Built HTML pages; managed nodes with K8s. Skills: Node.js, C++, Power BI, machine learning"
+    skills = extract_skills(text)["skills"]
+    assert "machine learning" in skills and "kubernetes" in skills
+    assert {"html", "node.js", "c++", "power bi"} <= set(skills)
+    assert extract_skills("managed several nodes, HTML emails")["skills"] == ["html"]
+
+
+def test_longest_phrase_wins():
+    tax = SkillTaxonomy({"spark": [], "apache spark streaming": [], "sql": [], "sql server": ["mssql"]})
+    assert tax.extract("Apache Spark streaming jobs on SQL Server") == ["apache spark streaming", "sql server"]
+    assert tax.extract_batch(["spark", "mssql"]) == [["spark"], ["sql server"]]
+
+
+def test_gap_analysis_uses_canonical_names():
+    gap = skill_gap_analysis(["K8s", "Python", "Rust"], ["kubernetes", "python"])
+    assert gap["matched"] == ["kubernetes", "python"]
+    assert gap["missing"] == ["rust"]
+
+
+def test_skill_worker_gaps_cover_the_top_ten(monkeypatch):
+    from agent_humancapital.agents import workers
+
+    monkeypatch.setattr(workers, "get_skill_index", lambda: None)
+    monkeypatch.setattr(workers, "candidate_texts", lambda candidates: {})
+    candidates = [{"id": i, "preview": "python and sql"} for i in range(15)]
+    out = workers.run_skill_worker(candidates, jd_skills=["python", "kubernetes"])
+    assert len(out["candidates"]) == 15 and [g["id"] for g in out["gaps"]] == list(range(10))
@@ -0,0 +1,45 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from agent_humancapital.ingestion.sources import excel_to_columnar, iter_records
+
+
+def _frame():
+    return pd.DataFrame({
+        "ID": [10, 11, 12],
+        "Resume_str": ["python sql", None, "java"],
+        "Category": ["IT", "HR", "IT"],
+        "Resume_html": ["<p/>", "<p/>", "<p/>"],
+    })
+
+
+def test_csv_and_jsonl_stream_same_records(tmp_path):
+    df = _frame()
+    csv = tmp_path / "d.csv"
+    df.to_csv(csv, index=False)
+    jsonl = tmp_path / "d.jsonl"
+    jsonl.write_text("\n".join(json.dumps(r) for r in df.to_dict("records")))
+
+    from_csv = [(r.row_index, r.text, r.category) for r in iter_records(str(csv), batch_size=2)]
+    from_jsonl = [(r.row_index, r.text, r.category) for r in iter_records(str(jsonl), batch_size=2)]
+    assert from_csv == from_jsonl == [(0, "python sql", "IT"), (1, "", "HR"), (2, "java", "IT")]
+
+
+def test_excel_is_converted_once(tmp_path):
+    pytest.importorskip("openpyxl")
+    xlsx = tmp_path / "d.xlsx"
+    _frame().to_excel(xlsx, index=False)
+    cache = str(tmp_path / "cache")
+
+    first = excel_to_columnar(str(xlsx), cache)
+    mtime = os.stat(first).st_mtime_ns
+    os.utime(xlsx)  # touched but unchanged content -> cache kept
+    assert excel_to_columnar(str(xlsx), cache) == first
+    assert os.stat(first).st_mtime_ns == mtime
+
+    records = list(iter_records(str(xlsx), cache_dir=cache))
+    assert [r.text for r in records] == ["python sql", "", "java"]
+    assert records[0].source == "d.xlsx"
@@ -0,0 +1,189 @@
+from agent_humancapital.agents import supervisor
+from agent_humancapital.orchestration.schemas import SupervisorInput, UserContext
+
+CANDIDATES = [
+    {"id": 1, "category": "IT", "score": 0.5, "preview": "java spring backend", "metadata": {}},
+    {"id": 2, "category": "IT", "score": 0.4, "preview": "python sql aws docker", "metadata": {}},
+]
+
+
+def test_rank_flow_with_timings(monkeypatch):
+    monkeypatch.setattr(
+        supervisor, "run_retrieval_worker",
+        lambda query, k, semantic=None, stream=True: {"candidates": [dict(c) for c in CANDIDATES], "debug": {}},
+    )
+    out = supervisor.supervisor_run(SupervisorInput(
+        query="rank candidates for python aws docker",
+        user=UserContext(role="hr"),
+    ))
+    workers = {t["worker"]: t for t in out["tool_traces"] if "worker" in t}
+    assert set(workers) == {"retrieval", "ranking"}
+    assert all(t["status"] == "ok" and "duration_ms" in t for t in workers.values())
+    # candidate 2 matches the JD terms and is ranked first
+    assert out["answer"].index("ID=2 | combined") < out["answer"].index("ID=1 | combined")
+
+
+def test_rbac_blocks_before_workers(monkeypatch):
+    monkeypatch.setattr(supervisor, "run_retrieval_worker", lambda query, k, semantic=None, stream=True: 1 / 0)
+    out = supervisor.supervisor_run(SupervisorInput(query="find candidates", user=UserContext(role="guest")))
+    assert "Access denied" in out["answer"]
+
+
+def test_batch_dedupes_queries_and_keeps_rbac(monkeypatch):
+    searched = []
+
+    def fake_batch(queries, k=None):
+        searched.append(list(queries))
+        return [{"query": q, "k": k, "results": [dict(c) for c in CANDIDATES]} for q in queries]
+
+    def fake_retrieval(query, k, semantic=None, stream=True):
+        assert semantic is not None
+        return {"candidates": semantic["results"], "debug": {}}
+
+    monkeypatch.setattr(supervisor, "semantic_search_batch", fake_batch)
+    monkeypatch.setattr(supervisor, "run_retrieval_worker", fake_retrieval)
+    payloads = [
+        SupervisorInput(query="find data analyst", user=UserContext(role="hr")),
+        SupervisorInput(query="Find  Data Analyst", user=UserContext(role="hr")),
+        SupervisorInput(query="find data analyst", user=UserContext(role="guest")),
+        SupervisorInput(query="find java developer", user=UserContext(role="recruiter")),
+    ]
+    out = supervisor.supervisor_run_batch(payloads)
+
+    assert searched == [["find data analyst", "find java developer"]]
+    assert len(out) == 4
+    assert out[0]["answer"] == out[1]["answer"] and out[0] is not out[1]
+    assert "Access denied" in out[2]["answer"]
+    assert "ID=1" in out[3]["answer"]
+    # same result shape as supervisor_run, usage counted per payload
+    assert all("usage" in o and o["tool_traces"][-1]["tool"] == "token_usage" for o in out)
+    single = {"answer": out[0]["answer"], "tool_traces": []}
+    supervisor._add_usage(payloads[0], single)
+    assert out[0]["usage"] == single["usage"]
+
+
+def test_response_cache_hits_and_version_invalidation(monkeypatch, tmp_path):
+    from agent_humancapital.ingestion.pipeline import bump_index_version, read_index_version
+    from agent_humancapital.llm import HashEmbeddings
+    from agent_humancapital.response_cache import ResponseCache
+
+    calls = []
+
+    def fake_retrieval(query, k, semantic=None, stream=True):
+        calls.append(query)
+        return {"candidates": [dict(c) for c in CANDIDATES], "debug": {}}
+
+    cache = ResponseCache(max_entries=8, similarity=0.9, embeddings=HashEmbeddings(dim=64))
+    monkeypatch.setattr(supervisor, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(supervisor, "run_retrieval_worker", fake_retrieval)
+    monkeypatch.setattr(supervisor, "read_index_version", lambda _: read_index_version(str(tmp_path)))
+
+    def ask(q, role="hr"):
+        out = supervisor.supervisor_run(SupervisorInput(query=q, user=UserContext(role=role)))
+        status = next(t["output"]["status"] for t in out["tool_traces"] if t.get("tool") == "response_cache")
+        return out, status
+
+    first, s1 = ask("find data analyst candidates")
+    again, s2 = ask("Find  data analyst candidates")
+    assert (s1, s2) == ("miss", "hit") and again["answer"] == first["answer"]
+    assert ask("find candidates data analyst")[1] == "near_hit"  # same words, different order
+    assert ask("find data analyst candidates", role="guest")[1] == "miss"
+    assert len(calls) == 1
+
+    bump_index_version(str(tmp_path))
+    assert ask("find data analyst candidates")[1] == "miss"
+    assert len(calls) == 2
+
+
+def test_stream_yields_redacted_chunks_before_result(monkeypatch):
+    leaky = [{**CANDIDATES[1], "preview": "python sql aws docker, mail me at dev@corp.io"}]
+    monkeypatch.setattr(
+        supervisor, "run_retrieval_worker",
+        lambda query, k, semantic=None, stream=True: {"candidates": [dict(c) for c in leaky], "debug": {}},
+    )
+    events = list(supervisor.supervisor_stream(SupervisorInput(
+        query="rank candidates for python aws docker", user=UserContext(role="hr"),
+    )))
+    chunks = [e for e in events if e["type"] == "chunk"]
+    assert [c["worker"] for c in chunks] == ["intent", "retrieval", "ranking"]
+    assert all("dev@corp.io" not in c["content"] for c in chunks)
+    assert events[-1]["type"] == "result" and "[REDACTED_EMAIL]" in events[-1]["result"]["answer"]
+
+
+def test_usage_is_reported():
+    out = supervisor.supervisor_run(SupervisorInput(query="hello there", history="x", history_tokens=7, user=UserContext()))
+    usage = out["usage"]
+    assert usage["input_tokens"] >= 7 + 1 and usage["total_tokens"] == usage["input_tokens"] + usage["output_tokens"]
+    assert out["tool_traces"][-1]["tool"] == "token_usage"
+
+
+def test_trace_verbosity_references_candidates_by_id(monkeypatch):
+    from dataclasses import replace
+    from agent_humancapital.config import SETTINGS
+
+    monkeypatch.setattr(
+        supervisor, "run_retrieval_worker",
+        lambda query, k, semantic=None, stream=True: {"candidates": [dict(c) for c in CANDIDATES], "debug": {}},
+    )
+    payload = SupervisorInput(query="rank candidates for python aws docker", user=UserContext(role="hr"))
+
+    def ranking_trace(level):
+        monkeypatch.setattr(supervisor, "SETTINGS", replace(SETTINGS, TRACE_VERBOSITY=level))
+        out = supervisor.supervisor_run(payload)
+        return next(t for t in out["tool_traces"] if t.get("worker") == "ranking")
+
+    assert ranking_trace("summary")["output"] == {"ranked_ids": [2, 1]}
+    assert "output" not in ranking_trace("off")
+    full = ranking_trace("full")["output"]
+    assert [c["id"] for c in full["ranked"]] == [2, 1] and "metadata" not in full["ranked"][0]
+
+
+def test_top_k_is_honored_and_large_k_streams(monkeypatch):
+    from agent_humancapital.candidates import CandidateRecord, CandidateStream
+
+    seen = []
+
+    def fake_retrieval(query, k, semantic=None, stream=True):
+        assert stream  # ranking reads the stream
+        seen.append(k)
+        pages = [
+            [CandidateRecord(id=i, score=0.5, preview="python aws docker" if i == 137 else "java") for i in range(s, s + 100)]
+            for s in range(0, k, 100)
+        ]
+        return {"candidates": pages[0], "stream": CandidateStream(iter(pages)), "debug": {"k": k}}
+
+    monkeypatch.setattr(supervisor, "run_retrieval_worker", fake_retrieval)
+    out = supervisor.supervisor_run(SupervisorInput(
+        query="rank candidates for python aws docker", user=UserContext(role="hr"), top_k=300,
+    ))
+    assert seen == [300]
+    ranking = next(t for t in out["tool_traces"] if t.get("worker") == "ranking")
+    assert ranking["output"]["considered"] == 300
+    assert ranking["output"]["ranked_ids"][0] == 137
+    assert "... and 80 more" in out["answer"]
+
+
+def test_large_k_without_consumers_pages_through_all_candidates(monkeypatch):
+    from agent_humancapital.agents import workers
+    from agent_humancapital.candidates import CandidateRecord
+
+    fetched = []
+
+    def fake_pages(query, k, filters=None):
+        for s in range(0, k, 100):
+            fetched.append(s)
+            yield [CandidateRecord(id=i, score=0.5, preview="java") for i in range(s, s + 100)]
+
+    monkeypatch.setattr(workers, "iter_semantic_search", fake_pages)
+    monkeypatch.setattr(workers, "keyword_search", lambda query, resumes, k, filters: {"results": [], "mode": "keyword_filter_on_preview"})
+    out = workers.run_retrieval_worker("find java developers", k=300, stream=False)
+    assert "stream" not in out and fetched == [0, 100, 200]
+    assert [c["id"] for c in out["candidates"]] == list(range(300))
+
+    flags = []
+    monkeypatch.setattr(
+        supervisor, "run_retrieval_worker",
+        lambda query, k, semantic=None, stream=True: flags.append(stream) or {"candidates": [dict(c) for c in CANDIDATES], "debug": {}},
+    )
+    out = supervisor.supervisor_run(SupervisorInput(query="find java developers", user=UserContext(role="hr"), top_k=300))
+    assert flags == [False] and "first page shown" not in out["answer"]
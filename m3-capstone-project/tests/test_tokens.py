@@ -0,0 +1,21 @@
+from agent_humancapital.tokens import TokenLedger, count_tokens, get_encoder
+
+
+def test_encoder_is_resolved_once():
+    assert get_encoder("gpt-4o-mini") is get_encoder("gpt-4o-mini")
+    assert count_tokens("") == 0 and count_tokens("hello world") > 0
+
+
+def test_history_window_respects_token_budget():
+    ledger = TokenLedger(budget=10, max_messages=3)
+    ledger.add("user", "one", tokens=4)
+    ledger.add("assistant", "two", tokens=4)
+    assert ledger.history() == "user: one\nassistant: two" and ledger.history_tokens == 8
+
+    ledger.add("user", "three", tokens=4)  # over budget: oldest message drops
+    assert ledger.history() == "assistant: two\nuser: three" and ledger.history_tokens == 8
+
+    ledger.record(input_tokens=12, output_tokens=5)
+    usage = ledger.usage()
+    assert usage["total_tokens"] == 17 and usage["history_messages"] == 2
+    assert ledger.message_count == 3
@@ -11,3 +11,8 @@ def test_rbac():
     assert ok is False
     ok2, _ = rbac_enforcer("hr", "retrieve")
     assert ok2 is True
+
+def test_reveal_pii_requires_view_pii_role():
+    from agent_humancapital.tools.governance_tools import reveal_pii
+    out = reveal_pii("hr", {"id": 1, "preview": "[REDACTED_EMAIL]"})
+    assert out["ok"] is False and out["candidate"]["preview"] == "[REDACTED_EMAIL]"